@@ -0,0 +1,111 @@
+"""Benchmark the Excel reader backends on raw and mapping workbooks.
+
+Opens each workbook and parses every sheet with ``header=None``, once per engine that
+can read its format: openpyxl (xlsx) or xlrd (xls), and calamine when
+``python-calamine`` is installed. Without arguments, a synthetic block-style raw export
+and a Salesforce-sized mapping workbook are generated first.
+
+    python benchmarks/bench_excel_engines.py
+    python benchmarks/bench_excel_engines.py raw/振泰0731.xls mapping.xlsx --repeat 5
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from t2ws.workbook import Workbook, calamine_available, sniff_engine  # noqa: E402
+
+
+def make_raw(rows: int, seed: int = 0) -> bytes:
+    """Printed-report layout: product header, detail rows, 小計 per block."""
+    rng = np.random.default_rng(seed)
+    out = []
+    block = 0
+    while len(out) < rows:
+        out.append([f"貨品編號:P{block:05d} 貨品名稱:商品 {block} 700ml", None, None, None, None, None])
+        for _ in range(int(rng.integers(5, 60))):
+            out.append([f"C{int(rng.integers(0, 3000)):05d}", f"客戶{int(rng.integers(0, 3000))}",
+                        "114/07/31", f"S{int(rng.integers(0, 10**6)):07d}", "銷貨單", int(rng.integers(1, 48))])
+        out.append(["小計", None, None, None, None, None])
+        block += 1
+    buf = io.BytesIO()
+    pd.DataFrame(out[:rows]).to_excel(buf, header=False, index=False)
+    return buf.getvalue()
+
+
+def make_mapping(rows: int, seed: int = 1) -> bytes:
+    rng = np.random.default_rng(seed)
+    groups = [f"300{i:05d}" for i in rng.integers(10000, 40000, 40)]
+    customer = pd.DataFrame({
+        "ASI_CRM_Offtake_Customer_No__c": [f"C{i:05d}" for i in rng.integers(0, 20000, rows)],
+        "ASI_CRM_Mapping_Cust_No__c": rng.choice(groups, rows),
+        "ASI_CRM_JDE_Cust_No_Formula__c": [f"{i}" for i in rng.integers(10**7, 10**8, rows)],
+    })
+    sku = pd.DataFrame({
+        "ASI_CRM_Offtake_Product__c": [f"P{i:05d}" for i in rng.integers(0, 20000, rows)],
+        "ASI_CRM_Mapping_Cust_Code__c": rng.choice(groups, rows),
+        "ASI_CRM_SKU_Code__c": [f"SKU{i}" for i in rng.integers(10**5, 10**6, rows)],
+    })
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf) as writer:
+        customer.to_excel(writer, sheet_name="Customer Mapping", index=False)
+        sku.to_excel(writer, sheet_name="SKU Mapping", index=False)
+    return buf.getvalue()
+
+
+def read_all(data: bytes, engine: str) -> int:
+    with Workbook(data, engine=engine) as xls:
+        return sum(len(frame) for _, frame in xls.sheets(header=None))
+
+
+def best_of(data: bytes, engine: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read_all(data, engine)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="workbooks to read (default: generated raw + mapping)")
+    parser.add_argument("--rows", type=int, default=50_000, help="rows of the generated raw export")
+    parser.add_argument("--mapping-rows", type=int, default=20_000, help="rows per generated mapping sheet")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.files:
+        workbooks = []
+        for path in args.files:
+            with open(path, "rb") as f:
+                workbooks.append((os.path.basename(path), f.read()))
+    else:
+        workbooks = [
+            (f"raw ({args.rows:,} rows)", make_raw(args.rows)),
+            (f"mapping (2 x {args.mapping_rows:,} rows)", make_mapping(args.mapping_rows)),
+        ]
+    if not calamine_available():
+        print("python-calamine is not installed; only the default engines are timed")
+
+    for name, data in workbooks:
+        engines = [sniff_engine(data) or "openpyxl"]
+        if calamine_available():
+            engines.append("calamine")
+        rows = read_all(data, engines[0])
+        print(f"{name}: {len(data) / 2**20:.1f} MiB, {rows:,} rows")
+        baseline = None
+        for engine in engines:
+            seconds = best_of(data, engine, args.repeat)
+            baseline = baseline or seconds
+            print(f"  {engine:<9} {seconds * 1000:9.1f} ms  ({baseline / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
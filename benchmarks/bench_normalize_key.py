@@ -0,0 +1,78 @@
+"""Micro-benchmark for t2ws.keys.normalize_key.
+
+Compares the factorized implementation with the original seven-pass ``.str`` chain on
+a large, low-cardinality column (the shape of raw customer/product code columns) and
+checks both produce identical output.
+
+    python benchmarks/bench_normalize_key.py --rows 1000000 --distinct 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from t2ws.keys import KEY_DTYPE, normalize_key  # noqa: E402
+
+
+def normalize_key_chained(series: pd.Series) -> pd.Series:
+    s = pd.Series(series, copy=False).astype("string[python]").fillna("")
+    return (
+        s.str.replace("\u00A0", "", regex=False)
+         .str.replace("\u2007", "", regex=False)
+         .str.replace("\u202F", "", regex=False)
+         .str.replace("\u3000", "", regex=False)
+         .str.strip()
+         .str.replace(r"\.0+$", "", regex=True)
+         .str.upper()
+    )
+
+
+def make_column(rows: int, distinct: int, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    pool = []
+    for i in range(distinct):
+        code = f"c{i:05d}"
+        if i % 7 == 0:
+            code = f" {code}\u3000"
+        elif i % 11 == 0:
+            code = f"{30010000 + i}.0"
+        elif i % 13 == 0:
+            code = f"\u00A0{code.upper()}\u202F"
+        pool.append(code)
+    values = np.array(pool + [None], dtype=object)
+    return pd.Series(values[rng.integers(0, len(values), rows)])
+
+
+def best_of(func, series: pd.Series, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(series)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    series = make_column(args.rows, args.distinct)
+    pd.testing.assert_series_equal(normalize_key(series), normalize_key_chained(series).astype(KEY_DTYPE))
+
+    chained = best_of(normalize_key_chained, series, args.repeat)
+    factorized = best_of(normalize_key, series, args.repeat)
+    print(f"rows={args.rows:,} distinct={args.distinct:,}")
+    print(f"chained .str passes : {chained * 1000:9.1f} ms")
+    print(f"factorized          : {factorized * 1000:9.1f} ms  ({chained / factorized:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark every distributor transformation end to end and per stage.
+
+For each distributor and size, a raw export in that branch's layout and the matching
+mapping workbook are generated with :mod:`synth` (optionally cached in ``--data``).
+The branch then runs headless (see :mod:`t2ws.headless`) inside a
+:class:`t2ws.timing.Profile`, and the fastest of ``--repeat`` runs is kept. The mapping
+is loaded once beforehand, as in a long-running app or batch worker, so its parse is
+not charged to the first distributor. Every kept run is appended to ``--out`` as one
+JSON line (the :meth:`Profile.record` fields plus ``rows``, ``raw_bytes`` and
+``runs``), so results from different commits or machines can be compared.
+
+    python benchmarks/bench_transformers.py --rows 1000 10000 100000
+    python benchmarks/bench_transformers.py 30010199 30030088 --rows 1000000 --repeat 1 --data /tmp/t2ws-synth
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synth import LAYOUTS, make_mapping, make_raw  # noqa: E402
+from t2ws.headless import TransformResult, run_transform  # noqa: E402
+from t2ws.mapping import get_mapping_index  # noqa: E402
+from t2ws.results import clear_results  # noqa: E402
+from t2ws.timing import Profile, append_jsonl  # noqa: E402
+from t2ws.transformers import TRANSFORMERS  # noqa: E402
+
+# printed columns: stages summed per group; the rest of the run is "other"
+_COLUMNS = {
+    "read": ("open workbook", "read sheet"),
+    "parse": ("parse blocks",),
+    "mapping": ("mapping load", "mapping tables", "mapping lookup", "normalize keys"),
+    "export": ("export",),
+}
+
+
+def workbook(data_dir: str | None, name: str, build) -> bytes:
+    """``build()``, or the copy cached as ``data_dir/name``."""
+    if data_dir is None:
+        return build()
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(build())
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def best_run(code: str, raw: bytes, mapping: bytes, source: str, repeat: int,
+             memory: bool = False) -> tuple[Profile, list[float], TransformResult | None]:
+    """Run ``code`` ``repeat`` times; the fastest run's profile and result, and every run's seconds."""
+    best, runs = None, []
+    for _ in range(repeat):
+        clear_results()  # month-filter branches would otherwise reuse the first run's frame
+        profile, result = Profile(f"{code} {TRANSFORMERS[code]}", source=source, memory=memory), None
+        try:
+            with profile:
+                result = run_transform(code, raw, mapping)
+            if not result.downloads:
+                profile.error = "no output"
+        except Exception:
+            pass  # Profile.__exit__ recorded the exception type
+        runs.append(round(profile.seconds, 4))
+        if best is None or profile.seconds < best[0].seconds:
+            best = (profile, result)
+    return best[0], runs, best[1]
+
+
+def stage_columns(profile: Profile) -> dict[str, float]:
+    """Seconds per printed column, each stage counted without the stages nested in it."""
+    own = [timing.seconds for timing in profile.stages]
+    for i, timing in enumerate(profile.stages):
+        for inner in profile.stages[i + 1:]:
+            if inner.depth <= timing.depth:
+                break
+            if inner.depth == timing.depth + 1:
+                own[i] -= inner.seconds
+    totals = dict.fromkeys(_COLUMNS, 0.0)
+    for timing, seconds in zip(profile.stages, own):
+        for column, names in _COLUMNS.items():
+            if timing.stage in names:
+                totals[column] += seconds
+    totals["other"] = profile.seconds - sum(totals.values())
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("codes", nargs="*", help="distributor codes (default: all)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000], help="detail lines per raw export")
+    parser.add_argument("--customers", type=int, default=200, help="customer codes per distributor")
+    parser.add_argument("--products", type=int, default=50, help="product codes per distributor")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--memory", action="store_true", help="also record peak memory per stage (slower)")
+    parser.add_argument("--data", help="directory caching the generated workbooks between runs")
+    parser.add_argument("--out", default="bench_transformers.jsonl", help="JSON Lines results log (appended)")
+    args = parser.parse_args()
+
+    codes = args.codes or list(TRANSFORMERS)
+    unknown = [code for code in codes if code not in LAYOUTS]
+    if unknown:
+        parser.error(f"no synthetic layout for {', '.join(unknown)}")
+
+    catalog = f"{args.customers}x{args.products}"
+    mapping = workbook(args.data, f"mapping_{catalog}.xlsx", lambda: make_mapping(customers=args.customers, products=args.products))
+    get_mapping_index(mapping)
+
+    print(f"{'code':<9}{'rows':>10}{'total ms':>11}{'rows/s':>10}" + "".join(f"{c:>9}" for c in (*_COLUMNS, "other")))
+    for rows in args.rows:
+        for code in codes:
+            start = time.perf_counter()
+            raw = workbook(args.data, f"{code}_{rows}_{catalog}_{args.seed}.xlsx",
+                           lambda: make_raw(code, rows, args.seed, args.customers, args.products))
+            generated = time.perf_counter() - start
+            if generated > 5:
+                print(f"  (generated {code} x {rows:,} in {generated:.0f} s)")
+
+            profile, runs, _ = best_run(code, raw, mapping, f"synthetic {rows:,} rows", args.repeat, args.memory)
+            record = profile.record()
+            record.update(rows=rows, raw_bytes=len(raw), runs=runs)
+            append_jsonl(args.out, record)
+
+            line = f"{code:<9}{rows:>10,}{profile.seconds * 1000:>11.1f}{rows / profile.seconds:>10,.0f}"
+            line += "".join(f"{seconds * 1000:>9.1f}" for seconds in stage_columns(profile).values())
+            print(line + (f"  ! {profile.error}" if profile.error else ""))
+    print(f"results appended to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
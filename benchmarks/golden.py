@@ -0,0 +1,208 @@
+"""Golden-output regression check for the distributor transformations.
+
+``record`` runs every branch on its fixture and stores the exported rows in
+``golden/<fixture>.jsonl``: one JSON line per sheet row, cell types included, so ``5``,
+``5.0`` and ``"5"`` differ. A branch that stops or fails is stored as its error. The
+best-of-``--repeat`` run time goes into ``golden/manifest.json``. ``check`` reruns the
+same fixtures, compares the rows byte for byte with the stored lines, and prints the
+first differing rows and the time against the recorded run. It exits non-zero on any
+difference, so a parser rewrite can land only if its output is unchanged.
+
+Fixtures are the seeded synthetic workbooks of :mod:`synth`, which are identical on
+every machine. ``--fixtures DIR --mapping FILE`` records real raw files instead; their
+names start with the distributor code, as in the CLI's ``auto`` mode
+(``30010085_0531.xlsx``). The fixture settings are kept in the manifest, so ``check``
+always rebuilds what was recorded. Recorded times are machine-specific; use
+``check --update-timings`` to take a clean run on your machine as the baseline.
+
+    python benchmarks/golden.py record
+    python benchmarks/golden.py check
+    python benchmarks/golden.py check 30020016 30030088 --repeat 5 --log golden.jsonl
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import sys
+
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_transformers import best_run  # noqa: E402
+from synth import LAYOUTS, make_mapping, make_raw  # noqa: E402
+from t2ws.batch import code_from_name  # noqa: E402
+from t2ws.headless import TransformResult  # noqa: E402
+from t2ws.mapping import get_mapping_index, read_source_bytes  # noqa: E402
+from t2ws.timing import Profile, append_jsonl  # noqa: E402
+from t2ws.transformers import TRANSFORMERS  # noqa: E402
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+MANIFEST = "manifest.json"
+
+_SHOWN_DIFFS = 3
+
+
+def outcome_lines(profile: Profile, result: TransformResult | None) -> list[str]:
+    """The exported workbooks as JSON lines (a header per file and sheet, then its rows), or the error."""
+    if result is None or not result.downloads:
+        return [json.dumps({"error": profile.error})]
+    lines = []
+    for file_name, data in result.downloads:
+        wb = openpyxl.load_workbook(io.BytesIO(data), read_only=True)
+        try:
+            for ws in wb.worksheets:
+                lines.append(json.dumps({"file": file_name, "sheet": ws.title}, ensure_ascii=False))
+                lines += [json.dumps(list(row), ensure_ascii=False, default=str) for row in ws.iter_rows(values_only=True)]
+        finally:
+            wb.close()
+    return lines
+
+
+def load_fixtures(settings: dict, codes) -> tuple[list[tuple[str, str, bytes]], bytes]:
+    """``(name, code, raw bytes)`` per fixture, and the mapping workbook."""
+    if "dir" in settings:
+        fixtures = []
+        for path in sorted(glob.glob(os.path.join(settings["dir"], "*.xls*"))):
+            code = code_from_name(path)
+            if code in TRANSFORMERS and (not codes or code in codes):
+                fixtures.append((os.path.splitext(os.path.basename(path))[0], code, read_source_bytes(path)))
+        return fixtures, read_source_bytes(settings["mapping"])
+    size = {"customers": settings["customers"], "products": settings["products"]}
+    fixtures = [(code, code, make_raw(code, settings["rows"], settings["seed"], **size))
+                for code in codes or LAYOUTS]
+    return fixtures, make_mapping(**size)
+
+
+def describe(settings: dict) -> str:
+    if "dir" in settings:
+        return f"fixtures from {settings['dir']}"
+    return f"synthetic {settings['rows']:,} rows, seed {settings['seed']}"
+
+
+def read_manifest(golden_dir: str) -> dict:
+    path = os.path.join(golden_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(golden_dir: str, manifest: dict) -> None:
+    with open(os.path.join(golden_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+
+
+def golden_path(golden_dir: str, name: str) -> str:
+    return os.path.join(golden_dir, f"{name}.jsonl")
+
+
+def record(args) -> int:
+    if args.fixtures:
+        if not args.mapping:
+            sys.exit("--fixtures needs --mapping")
+        settings = {"dir": args.fixtures, "mapping": args.mapping}
+    else:
+        settings = {"rows": args.rows, "customers": args.customers, "products": args.products, "seed": args.seed}
+    os.makedirs(args.golden, exist_ok=True)
+    manifest = read_manifest(args.golden)
+    runs = manifest.get("runs", {}) if args.codes and manifest.get("fixtures") == settings else {}
+
+    fixtures, mapping = load_fixtures(settings, args.codes)
+    get_mapping_index(mapping)
+    for name, code, raw in fixtures:
+        profile, _, result = best_run(code, raw, mapping, describe(settings), args.repeat)
+        lines = outcome_lines(profile, result)
+        with open(golden_path(args.golden, name), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        runs[name] = {"code": code, "seconds": round(profile.seconds, 4), "lines": len(lines)}
+        print(f"{name:<24}{len(lines):>8} lines{profile.seconds * 1000:>10.1f} ms" + (f"  ! {profile.error}" if profile.error else ""))
+    write_manifest(args.golden, {"fixtures": settings, "runs": runs})
+    print(f"recorded {len(fixtures)} golden outputs in {args.golden}")
+    return 0
+
+
+def first_diffs(golden: list[str], lines: list[str]) -> list[str]:
+    out = []
+    for i in range(max(len(golden), len(lines))):
+        old = golden[i] if i < len(golden) else "<missing>"
+        new = lines[i] if i < len(lines) else "<missing>"
+        if old != new:
+            out.append(f"    line {i + 1}:\n      golden: {old}\n      now:    {new}")
+            if len(out) == _SHOWN_DIFFS:
+                break
+    return out
+
+
+def check(args) -> int:
+    manifest = read_manifest(args.golden)
+    if not manifest:
+        sys.exit(f"no golden outputs in {args.golden}; run `record` first")
+    settings, runs = manifest["fixtures"], manifest["runs"]
+    codes = args.codes or sorted({run["code"] for run in runs.values()})
+
+    fixtures, mapping = load_fixtures(settings, codes)
+    get_mapping_index(mapping)
+    failed, current = 0, {}
+    for name, code, raw in fixtures:
+        profile, _, result = best_run(code, raw, mapping, describe(settings), args.repeat)
+        lines = outcome_lines(profile, result)
+        path = golden_path(args.golden, name)
+        if not os.path.exists(path):
+            status, diffs = "new", []
+        else:
+            with open(path, encoding="utf-8") as f:
+                golden = f.read().splitlines()
+            diffs = first_diffs(golden, lines)
+            status = "DIFF" if diffs else "ok"
+            failed += bool(diffs)
+
+        baseline = runs.get(name, {}).get("seconds")
+        timing = f"{profile.seconds * 1000:>10.1f} ms"
+        if baseline:
+            timing += f"  (was {baseline * 1000:.1f} ms, {(profile.seconds / baseline - 1) * 100:+.0f}%)"
+        print(f"{name:<24}{status:<6}{timing}")
+        for diff in diffs:
+            print(diff)
+        if name in runs:
+            current[name] = round(profile.seconds, 4)
+        if args.log:
+            entry = profile.record()
+            entry.update(golden=status, baseline_seconds=baseline)
+            append_jsonl(args.log, entry)
+
+    print(f"{len(fixtures) - failed}/{len(fixtures)} match the golden outputs")
+    if args.update_timings and not failed:
+        for name, seconds in current.items():
+            runs[name]["seconds"] = seconds
+        write_manifest(args.golden, manifest)
+        print(f"baseline timings updated in {os.path.join(args.golden, MANIFEST)}")
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["record", "check"])
+    parser.add_argument("codes", nargs="*", help="distributor codes (default: all)")
+    parser.add_argument("--golden", default=GOLDEN_DIR, help="directory of the golden outputs")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per fixture; the fastest is timed")
+    parser.add_argument("--rows", type=int, default=200, help="record: detail lines per synthetic fixture")
+    parser.add_argument("--customers", type=int, default=50, help="record: customer codes per distributor")
+    parser.add_argument("--products", type=int, default=10, help="record: product codes per distributor")
+    parser.add_argument("--seed", type=int, default=0, help="record: synthetic data seed")
+    parser.add_argument("--fixtures", help="record: directory of real raw files instead of synthetic ones")
+    parser.add_argument("--mapping", help="record: mapping workbook for --fixtures")
+    parser.add_argument("--log", metavar="JSONL", help="check: append each run's timings and result to this log")
+    parser.add_argument("--update-timings", action="store_true", help="check: keep this run's times as the baseline if all match")
+    args = parser.parse_args(argv)
+    unknown = [code for code in args.codes if code not in TRANSFORMERS]
+    if unknown:
+        parser.error(f"unknown distributor code(s): {', '.join(unknown)}")
+    return record(args) if args.command == "record" else check(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,503 @@
+"""Synthetic raw exports and a matching mapping workbook for every distributor layout.
+
+Each of the 36 branches reads its own printed-report or flat-table layout (貨品編號
+blocks, 起訖品號 grids, 客戶簡稱 groups, 振泰's daily sheets, 玄星's ``\\d{5}`` monthly
+sheets, ...). :data:`LAYOUTS` has one generator per distributor that lays out ``rows``
+detail lines the way that branch expects, drawn from a per-distributor
+:class:`Catalog` of customer and product codes. :func:`make_mapping` writes the
+Salesforce mapping for the same catalogs, so every generated line maps.
+
+    python benchmarks/synth.py 30010199 --rows 100000 --out raw.xlsx
+    python benchmarks/synth.py mapping --out mapping.xlsx
+"""
+import argparse
+import io
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from t2ws.mapping import (  # noqa: E402
+    CUST_GROUP, CUST_JDE, CUST_OFFTAKE, CUSTOMER_SHEET, SKU_CODE, SKU_GROUP, SKU_OFFTAKE, SKU_SHEET,
+)
+from t2ws.transformers import TRANSFORMERS  # noqa: E402
+
+# branches whose parsers only accept numeric customer / product codes
+_DIGIT_CUSTOMERS = {"30010061"}
+_DIGIT_PRODUCTS = {"30010225", "30030076"}
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Customer and product codes of one distributor, shared by its raw file and mapping."""
+    code: str
+    customers: tuple[str, ...]
+    products: tuple[str, ...]
+
+    def customer_name(self, i: int) -> str:
+        return f"客戶{i}"
+
+    def product_name(self, i: int) -> str:
+        return f"品項{i} 700ml"
+
+
+def catalog(code: str, customers: int = 200, products: int = 50) -> Catalog:
+    if code in _DIGIT_CUSTOMERS:
+        cust = tuple(f"{10000 + i}" for i in range(customers))
+    else:
+        cust = tuple(f"C{i:04d}" for i in range(customers))
+    if code in _DIGIT_PRODUCTS:
+        prod = tuple(f"{100000 + i}" for i in range(products))
+    else:
+        prod = tuple(f"P{i:04d}" for i in range(products))
+    return Catalog(code, cust, prod)
+
+
+def make_mapping(codes=None, customers: int = 200, products: int = 50) -> bytes:
+    """Customer and SKU mapping sheets covering every catalog code of ``codes`` (default: all)."""
+    cust, sku = [], []
+    for code in codes or TRANSFORMERS:
+        cat = catalog(code, customers, products)
+        cust += [(c, code, f"{code[-4:]}{i:05d}") for i, c in enumerate(cat.customers)]
+        sku += [(p, code, f"SKU{code[-4:]}{i:04d}") for i, p in enumerate(cat.products)]
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf) as writer:
+        pd.DataFrame(cust, columns=[CUST_OFFTAKE, CUST_GROUP, CUST_JDE]).to_excel(writer, sheet_name=CUSTOMER_SHEET, index=False)
+        pd.DataFrame(sku, columns=[SKU_OFFTAKE, SKU_GROUP, SKU_CODE]).to_excel(writer, sheet_name=SKU_SHEET, index=False)
+    return buf.getvalue()
+
+
+@dataclass(frozen=True)
+class Line:
+    """One detail line: who bought how much on which July day, on which document.
+
+    ``quantity`` is positive for returns too; layouts mark them their own way.
+    """
+    customer: str
+    customer_name: str
+    quantity: int
+    day: int
+    doc: str
+    returned: bool = False
+
+    @property
+    def signed(self) -> int:
+        return -self.quantity if self.returned else self.quantity
+
+    @property
+    def roc(self) -> str:
+        return f"114/07/{self.day:02d}"
+
+    @property
+    def iso(self) -> str:
+        return f"2025/07/{self.day:02d}"
+
+
+def _lines(cat: Catalog, n: int, rng: np.random.Generator, returns: float = 0.0) -> list[Line]:
+    """``n`` lines; about 1% have a zero quantity, 2% repeat the line before and ``returns`` are returns."""
+    cust = rng.integers(0, len(cat.customers), n)
+    qty = np.where(rng.random(n) < 0.01, 0, rng.integers(1, 25, n))
+    day = rng.integers(1, 32, n)
+    doc = rng.integers(0, 10**7, n)
+    returned = rng.random(n) < returns
+    # exact repeats, as when an export lists a line twice
+    repeat = rng.random(n) < 0.02
+    repeat[:1] = False
+    src = np.maximum.accumulate(np.where(repeat, 0, np.arange(n)))
+    cust, qty, day, doc, returned = (a[src] for a in (cust, qty, day, doc, returned))
+    return [Line(cat.customers[c], cat.customer_name(c), q, d, f"銷退{s:07d}" if r else f"S{s:07d}", r)
+            for c, q, d, s, r in zip(cust.tolist(), qty.tolist(), day.tolist(), doc.tolist(), returned.tolist())]
+
+
+def _split(rows: int, size: int, rng: np.random.Generator) -> list[tuple[int, int]]:
+    """Spread ``rows`` lines over ``size`` keys: ``(key, count)`` pairs in key order."""
+    keys, counts = np.unique(rng.integers(0, size, rows), return_counts=True)
+    return list(zip(keys.tolist(), counts.tolist()))
+
+
+def _by_product(cat: Catalog, rows: int, rng: np.random.Generator, returns: float = 0.0):
+    """``(product index, code, name, lines)`` per product block."""
+    for p, n in _split(rows, len(cat.products), rng):
+        yield p, cat.products[p], cat.product_name(p), _lines(cat, n, rng, returns)
+
+
+def _flat(cat: Catalog, rows: int, rng: np.random.Generator, returns: float = 0.0):
+    """``(product code, product name, line)`` per row, in random order."""
+    prod = rng.integers(0, len(cat.products), rows)
+    for p, line in zip(prod.tolist(), _lines(cat, rows, rng, returns)):
+        yield cat.products[p], cat.product_name(p), line
+
+
+def _periods(rows: int, per_sheet: int, limit: int) -> int:
+    return int(min(max(rows // per_sheet, 1), limit))
+
+
+LAYOUTS = {}
+
+
+def layout(*codes):
+    """Register a generator ``(cat, rows, rng) -> {sheet name: rows}`` for ``codes``."""
+    def register(func):
+        for code in codes:
+            LAYOUTS[code] = func
+        return func
+    return register
+
+
+@layout("30010008")
+def _qihao_grid(cat, rows, rng):
+    out = [["利多吉 銷貨明細表"], []]
+    for _, code, name, lines in _by_product(cat, rows, rng):
+        out.append([f"起訖品號：{code}", None, None, name])
+        out.append(["銷貨日期", "銷貨單號", None, "客戶編號", "客戶簡稱", "數量"])
+        out += [[ln.roc, ln.doc, None, ln.customer, ln.customer_name, ln.quantity] for ln in lines]
+        out.append(["小計", None, None, None, None, sum(ln.quantity for ln in lines)])
+    return {"Sheet1": out}
+
+
+@layout("30010010", "30010013")
+def _huopin_query(cat, rows, rng):
+    # quantity in column D (酒倉盛豐行) and column F (酒田)
+    out = [[], [], [], [], ["查詢日期 自 114/07/01 至 114/07/31"]]
+    for _, code, name, lines in _by_product(cat, rows, rng):
+        out.append([f"貨品編號:{code} 貨品名稱:{name}"])
+        out += [[ln.customer, ln.customer_name, None, ln.quantity, None, ln.quantity] for ln in lines]
+        out.append(["小計", None, None, sum(ln.quantity for ln in lines)])
+    return {"Sheet1": out}
+
+
+@layout("30010017", "30010316")
+def _huodan_date(cat, rows, rng):
+    out = [["貨單日期: 114/07/01 至 114/07/31"], []]
+    for _, code, name, lines in _by_product(cat, rows, rng, returns=0.05):
+        out.append([f"貨品編號:{code}  貨品名稱:{name}"])
+        out.append(["客戶編號", "客戶名稱", "銷貨數量", "退貨數量", "合計數量"])
+        out += [[ln.customer, ln.customer_name, 0 if ln.returned else ln.quantity, ln.quantity if ln.returned else 0, ln.signed]
+                for ln in lines]
+        out.append(["小計", None, None, None, sum(ln.signed for ln in lines)])
+    return {"Sheet4": out}
+
+
+@layout("30010031")
+def _guangmaolong(cat, rows, rng):
+    out = [["客戶", "客戶名稱", "品號", "品名規格", "銷量"]]
+    out += [[ln.customer, ln.customer_name, code, name, ln.quantity] for code, name, ln in _flat(cat, rows, rng)]
+    return {"0701-0731": out}
+
+
+@layout("30010059")
+def _chengbang(cat, rows, rng):
+    out = [["誠邦有限公司"], ["商品銷售明細表"]] + [[] for _ in range(8)]
+    for _, code, name, lines in _by_product(cat, rows, rng):
+        out.append([f"貨品編號:【{code}】 {name}"])
+        out += [[ln.roc, "銷貨", ln.customer, ln.customer_name, ln.quantity] for ln in lines]
+        out.append(["小計", None, None, None, sum(ln.quantity for ln in lines)])
+    return {"Sheet1": out}
+
+
+@layout("30010061")
+def _sunflower(cat, rows, rng):
+    out = [[] for _ in range(7)]
+    for c, n in _split(rows, len(cat.customers), rng):
+        out.append([f"客戶編號:{cat.customers[c]} 客戶名稱:{cat.customer_name(c)}"])
+        prod = rng.integers(0, len(cat.products), n).tolist()
+        for i, (p, ln) in enumerate(zip(prod, _lines(cat, n, rng))):
+            out.append([ln.roc if i == 0 else None, cat.products[p], cat.product_name(p), ln.quantity])
+    return {"Sheet1": out}
+
+
+@layout("30010085", "30010203")
+def _hongjiuzun(cat, rows, rng):
+    out = [["序號", "日期", "客戶編號", "客戶名稱", "產品編號", "產品名稱", "瓶數"]]
+    out += [[i + 1, datetime(2025, 7, ln.day), ln.customer, ln.customer_name, code, name, ln.quantity]
+            for i, (code, name, ln) in enumerate(_flat(cat, rows, rng))]
+    return {"夜點" if cat.code == "30010085" else "日點": out}
+
+
+@layout("30010154")
+def _hengjiu(cat, rows, rng):
+    out = [["亨玖 產品銷售統計"], ["期間", "114.7"], []]
+    out.append(["產品編號", "發票品名", "客戶/廠商簡稱", "客戶/廠商編號", "數量"])
+    for _, code, name, lines in _by_product(cat, rows, rng):
+        for i, ln in enumerate(lines):
+            head = [code, name] if i == 0 else [None, None]
+            out.append(head + [ln.customer_name, ln.customer, ln.quantity])
+    return {"Sheet1": out}
+
+
+@layout("30010176", "30010199")
+def _zhentai_daily(cat, rows, rng):
+    # one sheet per day, the day in A5
+    sheets = {}
+    days = _periods(rows, 2000, 31)
+    for day, n in _split(rows, days, rng):
+        out = [[], [], [], [], [f"日期 114/07/{day + 1:02d} 至 114/07/{day + 1:02d}"]]
+        for _, code, name, lines in _by_product(cat, n, rng):
+            out.append([f"貨品編號:{code} 貨品名稱:{name}"])
+            out += [[ln.customer, ln.customer_name, ln.quantity] for ln in lines]
+            out.append(["小計", None, sum(ln.quantity for ln in lines)])
+        sheets[f"07{day + 1:02d}"] = out
+    return sheets
+
+
+@layout("30010185")
+def _ruixing(cat, rows, rng):
+    out = [["日期區間:114/07/01~114/07/31"], []]
+    out.append(["產品編號", "品名規格", "客戶編號", "客戶名稱", "數量(瓶)"])
+    out += [[code, name, ln.customer, ln.customer_name, ln.quantity] for code, name, ln in _flat(cat, rows, rng)]
+    out.append(["總計", None, None, None, None])
+    return {"Sheet1": out}
+
+
+@layout("30010225")
+def _liandali(cat, rows, rng):
+    # sales / returns as "cases/bottles" in J and K
+    out = [["連大立 銷售統計"], ["114/07/01 - 114/07/31"], []]
+    for _, code, name, lines in _by_product(cat, rows, rng, returns=0.05):
+        out.append([code, name, "700ml"])
+        for ln in lines:
+            pair = f"{ln.quantity // 12}/{ln.quantity}"
+            out.append([None] * 7 + [ln.customer, ln.customer_name, *(("0/0", pair) if ln.returned else (pair, "0/0"))])
+    return {"4": out}
+
+
+@layout("30010315")
+def _zhencheng(cat, rows, rng):
+    # column B: "name(code)" customer rows followed by 單據類別, product rows, 出貨單 lines
+    out = [[None, "圳程出貨明細"], [], [None, "114/07/01 ~ 114/07/31"], []]
+    for c, n in _split(rows, len(cat.customers), rng):
+        out.append([None, f"{cat.customer_name(c)}({cat.customers[c]})"])
+        out.append([None, "單據類別"])
+        for p, m in _split(n, len(cat.products), rng):
+            out.append([None, f"{cat.product_name(p)}({cat.products[p]})"])
+            out += [[None, "出貨單", ln.doc, None, ln.quantity] for ln in _lines(cat, m, rng)]
+    return {"Sheet1": out}
+
+
+@layout("30020016")
+def _risong(cat, rows, rng):
+    out = [["日嵩 銷貨統計"], ["列印日期 2025/08/01"], ["期間", "2025/07/01 ~ 2025/07/31"]]
+    out.append(["貨號", "品名", "客戶", "客戶名稱", "贈品", "銷貨", "退貨", "淨額"])
+    out += [[code, name, ln.customer, ln.customer_name, 0, 0 if ln.returned else ln.quantity, ln.quantity if ln.returned else 0, ln.signed]
+            for code, name, ln in _flat(cat, rows, rng, returns=0.05)]
+    return {"AAA": out}
+
+
+@layout("30020023")
+def _songyong(cat, rows, rng):
+    out = [["松勇 銷售明細"], ["客戶代號", "客戶名稱", "品號", "品名", "銷售數量"]]
+    out += [[ln.customer, ln.customer_name, code, name, ln.quantity] for code, name, ln in _flat(cat, rows, rng)]
+    return {"Sheet4": out}
+
+
+@layout("30020027")
+def _ronghao(cat, rows, rng):
+    # the customer is only printed on the first line of its group
+    out = [["客戶代碼", "客戶名稱", "產品代號", "品名規格", "銷量"]]
+    for c, n in _split(rows, len(cat.customers), rng):
+        prod = rng.integers(0, len(cat.products), n).tolist()
+        for i, (p, ln) in enumerate(zip(prod, _lines(cat, n, rng))):
+            head = [cat.customers[c], cat.customer_name(c)] if i == 0 else [None, None]
+            out.append(head + [cat.products[p], cat.product_name(p), ln.quantity])
+    return {"20250701-20250731": out}
+
+
+@layout("30020076")
+def _jiuguo(cat, rows, rng):
+    out = []
+    for _, code, name, lines in _by_product(cat, rows, rng, returns=0.05):
+        out.append([f"貨品編號:{code} {name}"])
+        out.append(["單據日期", "單據編號", "客戶編號", "客戶簡稱", "數量"])
+        out += [[ln.iso, ln.doc, ln.customer, ln.customer_name, ln.quantity] for ln in lines]
+        out.append([])
+    return {"Sheet1": out}
+
+
+@layout("30020145")
+def _huaqi(cat, rows, rng):
+    # one sheet per product, details from row 9
+    sheets = {}
+    for _, code, name, lines in _by_product(cat, rows, rng):
+        out = [["鏵錡 出貨明細"], [], [f"貨品編號:{code} {name}"]] + [[] for _ in range(4)]
+        out.append(["日期", "單號", "客戶編號", "經銷商", "客戶名稱", "數量", "單位", "備註"])
+        out += [[ln.roc, ln.doc, ln.customer, "鏵錡", ln.customer_name, ln.quantity, "瓶", None] for ln in lines]
+        sheets[code] = out
+    return sheets
+
+
+@layout("30020177")
+def _fuwei(cat, rows, rng):
+    out = [["富為 銷貨明細"], [], []]
+    out.append(["單據日期", "單據編號", "客戶編號", "客戶名稱", "貨品編號", "貨品名稱", "單位", "數量"])
+    out += [[ln.iso, ln.doc, ln.customer, ln.customer_name, code, name, "瓶", ln.quantity]
+            for code, name, ln in _flat(cat, rows, rng, returns=0.05)]
+    return {"大盤大 (02)": out}
+
+
+@layout("30020180")
+def _weilun(cat, rows, rng):
+    out = [["銷貨單號", "銷貨日期", "客戶代號", "客戶名稱", "產品編號", "產品名稱", "數量"]]
+    out += [[ln.doc, ln.iso, ln.customer, ln.customer_name, code, name, ln.quantity]
+            for code, name, ln in _flat(cat, rows, rng)]
+    return {"工作表1": out}
+
+
+@layout("30020203")
+def _xuanxing(cat, rows, rng):
+    # one sheet per ROC month, named 11401..11412
+    sheets = {}
+    months = _periods(rows, 5000, 12)
+    for month, n in _split(rows, months, rng):
+        out = [["玄星 銷貨明細"], [], []]
+        out.append([None, None, "客戶編號", "客戶簡稱", "產品編號", "品名", "銷量", "贈量"])
+        out += [[f"114/{month + 1:02d}/{min(ln.day, 28):02d}", None, ln.customer, ln.customer_name, code, name, ln.quantity, 0]
+                for code, name, ln in _flat(cat, n, rng)]
+        out.append(["合計"])
+        sheets[f"114{month + 1:02d}"] = out
+    return sheets
+
+
+@layout("30020216")
+def _jiuyue(cat, rows, rng):
+    # 客戶簡稱 groups; the product code is the last token of the product name
+    out = [["久悅貿易 客戶銷貨明細"]]
+    for c, n in _split(rows, len(cat.customers), rng):
+        out.append([f"客戶簡稱:{cat.customers[c]} {cat.customer_name(c)} 電話:02-2345-6789"])
+        out.append(["單據日期", "單據號碼", "品名", "數量"])
+        prod = rng.integers(0, len(cat.products), n).tolist()
+        for i, (p, ln) in enumerate(zip(prod, _lines(cat, n, rng))):
+            out.append([ln.roc if i == 0 else None, ln.doc, f"{cat.product_name(p)} {cat.products[p]}", ln.quantity])
+        out.append(["合計"])
+    return {"202507": out}
+
+
+@layout("30030010")
+def _xinyi(cat, rows, rng):
+    out = [["信禕 產品銷售明細"], []]
+    for _, code, name, lines in _by_product(cat, rows, rng, returns=0.05):
+        out.append([f"產品編號:{code}"] + [None] * 8 + [f"品名規格:{name}"])
+        out += [[None, None, ln.roc, None, "銷貨退回" if ln.returned else "銷貨（庫存）", None, None, ln.doc, None, None,
+                 ln.customer, None, None, ln.customer_name, None, ln.quantity] for ln in lines]
+    return {"Page 1": out}
+
+
+@layout("30030021", "30030061")
+def _hehuan(cat, rows, rng):
+    out = [["合歡 產品出貨明細"], []]
+    for _, code, name, lines in _by_product(cat, rows, rng):
+        out.append(["產品編號：", code, None, f"[{name}]"])
+        out += [[ln.roc, ln.doc, ln.customer, ln.customer_name, None, ln.quantity] for ln in lines]
+    return {"Sheet1": out}
+
+
+@layout("30030076")
+def _yusheng(cat, rows, rng):
+    out = [["裕陞 銷貨明細"]]
+    for _, code, name, lines in _by_product(cat, rows, rng):
+        out.append([code, name])
+        out.append(["日期", "銷貨單號", "客戶編號", "客戶簡稱", "數量"])
+        out += [[datetime(2025, 7, ln.day), ln.doc, ln.customer, ln.customer_name, ln.quantity] for ln in lines]
+        out.append(["小計", None, None, None, sum(ln.quantity for ln in lines)])
+    return {"Sheet1": out}
+
+
+@layout("30030083")
+def _dongying(cat, rows, rng):
+    out = [["東瀛 貨品銷售明細"]]
+    for _, code, name, lines in _by_product(cat, rows, rng, returns=0.05):
+        out.append([f"貨品編號:{code}  貨品名稱:{name}"])
+        out.append(["客戶編號", "客戶名稱", "日期", "單號", "數量"])
+        out += [[ln.customer, ln.customer_name, ln.roc, ln.doc, ln.quantity] for ln in lines]
+        out.append(["小計", None, None, None, sum(ln.quantity for ln in lines)])
+    return {"Sheet1": out}
+
+
+@layout("30030084")
+def _huaen(cat, rows, rng):
+    # per product: customers in A:B with the product code in F, names and quantities in G and K
+    out = []
+    for _, code, name, lines in _by_product(cat, rows, rng):
+        out.append(["統計日期：2025/07/01至2025/07/31"])
+        out.append(["客戶名稱", "客戶簡稱", None, None, None, "產品編號", "品名規格", None, None, None, "銷量"])
+        out += [[ln.customer, ln.customer_name, None, None, None, code, name, None, None, None, ln.quantity] for ln in lines]
+        out.append([])
+    return {"銷售": out}
+
+
+@layout("30030088")
+def _jiujiu(cat, rows, rng):
+    out = [["九久 出貨明細"], []]
+    for _, code, name, lines in _by_product(cat, rows, rng, returns=0.05):
+        out.append([f"貨品編號:{code} {name}"])
+        out += [[], ["日期", "單號", "客戶", "名稱", "類別", None, "數量"], [], []]
+        out += [[ln.roc, ln.doc, ln.customer, ln.customer_name, "銷退單" if ln.returned else "銷貨單", None, ln.quantity]
+                for ln in lines]
+    return {"Sheet1": out}
+
+
+@layout("30030094", "33001422")
+def _heyi(cat, rows, rng):
+    out = [["和易 產品銷售明細"], []]
+    for _, code, name, lines in _by_product(cat, rows, rng, returns=0.05):
+        out.append([f"產品編號:{code}", None, None, f"品名規格:{name}"])
+        out += [[ln.roc, ln.doc, ln.customer_name, "銷貨退回" if ln.returned else "銷貨（庫存）", None, ln.quantity, None, None, None, ln.customer]
+                for ln in lines]
+    return {"Page 1": out}
+
+
+@layout("30030105")
+def _shangjing(cat, rows, rng):
+    # a single product per report, named in the 產品條件 banner
+    code, name = cat.products[0], cat.product_name(0)
+    out = [["上景 客戶銷貨明細"], [], [], [f"產品條件: {code}"]]
+    for c, n in _split(rows, len(cat.customers), rng):
+        out.append([f"客戶編號: {cat.customers[c]} [{cat.customer_name(c)} ]"])
+        out += [["銷貨退回" if ln.returned else "銷貨", ln.roc, ln.customer_name, name, ln.quantity]
+                for ln in _lines(cat, n, rng, returns=0.05)]
+    return {"rsmulia": out}
+
+
+@layout("30030106")
+def _minghui(cat, rows, rng):
+    out = [["日期", "客戶編號", "客戶簡稱", "單別", "產品編號", "名稱規格", "銷售數量", "贈送數量"]]
+    out += [[ln.roc, ln.customer, ln.customer_name, "銷貨", code, name, ln.quantity, 0]
+            for code, name, ln in _flat(cat, rows, rng)]
+    return {"Sheet1": out}
+
+
+def make_raw(code: str, rows: int, seed: int = 0, customers: int = 200, products: int = 50) -> bytes:
+    """A raw export of about ``rows`` detail lines in distributor ``code``'s layout."""
+    sheets = LAYOUTS[code](catalog(code, customers, products), rows, np.random.default_rng(seed))
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf) as writer:
+        for name, out in sheets.items():
+            pd.DataFrame(out).to_excel(writer, sheet_name=name, header=False, index=False)
+    return buf.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("code", help='distributor code, or "mapping" for the mapping workbook')
+    parser.add_argument("--rows", type=int, default=10_000, help="detail lines of the raw export")
+    parser.add_argument("--customers", type=int, default=200, help="customer codes per distributor")
+    parser.add_argument("--products", type=int, default=50, help="product codes per distributor")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="workbook to write")
+    args = parser.parse_args()
+
+    if args.code == "mapping":
+        data = make_mapping(customers=args.customers, products=args.products)
+    else:
+        data = make_raw(args.code, args.rows, args.seed, args.customers, args.products)
+    with open(args.out, "wb") as f:
+        f.write(data)
+    print(f"{args.out}: {len(data) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared building blocks for the T2 WS transformations."""
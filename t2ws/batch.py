@@ -0,0 +1,107 @@
+"""Transform many raw files, for any mix of distributors, across a process pool.
+
+Each job is one raw file tagged with its distributor code; jobs are independent and
+run through :func:`t2ws.headless.run_transform` in worker processes. The mapping is
+parsed once in the parent and written as a columnar snapshot (see
+:mod:`t2ws.snapshot`). Every worker memory-maps that snapshot once in its initializer
+instead of receiving a pickled index with each task.
+"""
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from t2ws.headless import Upload, run_transform
+from t2ws.mapping import get_mapping_index, read_source_bytes
+from t2ws.snapshot import load_snapshot, write_snapshot
+from t2ws.timing import Profile
+
+
+_CODE_PREFIX = re.compile(r"^\s*(\d{8})")
+
+# set per worker by _init_worker
+_WORKER_MAPPING: Upload | None = None
+
+
+@dataclass
+class BatchJob:
+    code: str
+    name: str
+    data: bytes
+
+
+@dataclass
+class BatchOutcome:
+    code: str
+    name: str
+    choice: str = ""
+    downloads: list[tuple[str, bytes]] = field(default_factory=list)
+    messages: list[tuple[str, str]] = field(default_factory=list)
+    error: str | None = None
+    timings: dict | None = None  # Profile.record() of the run
+
+
+def code_from_name(name: str) -> str | None:
+    """Distributor code a file name starts with, e.g. "30010085_0531.xlsx" -> "30010085"."""
+    m = _CODE_PREFIX.match(os.path.basename(name))
+    return m.group(1) if m else None
+
+
+def output_name(raw_name: str, file_name: str) -> str:
+    """Name for one job's export, unique across a batch: "<raw file stem> - <export name>"."""
+    stem = os.path.splitext(os.path.basename(raw_name))[0]
+    return f"{stem} - {file_name}"
+
+
+def _init_worker(snapshot_dir: str, digest: str, mapping: bytes) -> None:
+    global _WORKER_MAPPING
+    # carries the digest, so no task hashes the mapping again
+    _WORKER_MAPPING = Upload(mapping, "mapping.xlsx", digest)
+    load_snapshot(snapshot_dir, digest)
+
+
+def _run_job(job: BatchJob, mapping: Upload | None = None) -> BatchOutcome:
+    outcome = BatchOutcome(code=job.code, name=job.name)
+    profile = Profile(job.code, source=job.name)
+    try:
+        with profile:
+            result = run_transform(job.code, Upload(job.data, job.name), mapping if mapping is not None else _WORKER_MAPPING)
+    except Exception as exc:
+        outcome.error = f"{type(exc).__name__}: {exc}"
+        outcome.timings = profile.record()
+        return outcome
+    profile.choice = result.choice
+    outcome.timings = profile.record()
+    outcome.choice = result.choice
+    outcome.downloads = result.downloads
+    outcome.messages = result.messages
+    if not result.downloads:
+        outcome.error = "no output (see messages)"
+    return outcome
+
+
+def run_batch(jobs: list[BatchJob], mapping_source, max_workers: int | None = None) -> list[BatchOutcome]:
+    """Run every job and return the outcomes in job order."""
+    mapping = read_source_bytes(mapping_source)
+    index = get_mapping_index(mapping)
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        upload = Upload(mapping, "mapping.xlsx", index.digest)
+        return [_run_job(job, upload) for job in jobs]
+
+    snapshot_dir = tempfile.mkdtemp(prefix="t2ws-mapping-")
+    try:
+        write_snapshot(snapshot_dir, index)
+        # spawn, not fork: the Streamlit server process is multi-threaded
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(snapshot_dir, index.digest, mapping),
+        ) as pool:
+            return list(pool.map(_run_job, jobs))
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
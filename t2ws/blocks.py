@@ -0,0 +1,138 @@
+"""Declarative parser for block-style distributor reports.
+
+Most raw exports are printed reports: a header row such as ``貨品編號:A001 貨品名稱:...``
+or ``客戶簡稱:C01 ...`` opens a block, detail rows follow, and ``小計``/``合計`` rows close
+it. Instead of walking the sheet row by row, a branch describes the layout with a
+:class:`BlockLayout` and :func:`parse_blocks` evaluates it column-wise: header rows are
+found with one regex pass per header, their captured fields are forward-filled down to
+the detail rows, and detail rows are selected with boolean masks.
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from t2ws.timing import timed
+
+
+@dataclass(frozen=True)
+class Header:
+    """A row that (re)sets carry-forward fields for the rows below it.
+
+    ``marker`` is a regex searched in the stripped text of ``column``; matching rows are
+    header rows. ``pattern`` captures the carried fields as named groups. A header row
+    whose pattern does not match keeps the previous block's values, and a group that
+    does not take part in a match is carried as "". With ``skip_row=False`` the header
+    row can also be a detail row (e.g. a date line that starts a day's entries).
+    """
+    column: int
+    marker: str
+    pattern: str
+    skip_row: bool = True
+    clean: Callable[[pd.Series], pd.Series] | None = None
+
+
+@dataclass(frozen=True)
+class BlockLayout:
+    """Header rules, detail predicate and output fields for one report layout.
+
+    ``fields`` maps output names to ``Cells -> Series`` getters, ``detail`` returns the
+    detail-row mask, and rows before the first match of any ``required`` carried field
+    are dropped.
+    """
+    headers: tuple[Header, ...]
+    fields: dict[str, Callable[["Cells"], pd.Series]]
+    detail: Callable[["Cells"], pd.Series]
+    required: tuple[str, ...] = ()
+    skip_markers: tuple[str, ...] = ("小計", "合計")
+    skip_columns: tuple[int, ...] = (0,)
+    carried: tuple[str, ...] = ()
+
+
+class Cells:
+    """Column accessors over a ``header=None`` sheet, cached per column."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def value(self, column: int) -> pd.Series:
+        if column < self.frame.shape[1]:
+            return self.frame.iloc[:, column]
+        return pd.Series(np.nan, index=self.frame.index, dtype=object)
+
+    def text(self, column: int, na: str = "", strip: bool = True) -> pd.Series:
+        """``str(cell).strip()`` for every row, with ``na`` for empty cells."""
+        key = ("text", column, na, strip)
+        if key not in self._cache:
+            values = self.value(column).to_numpy(dtype=object)
+            present = pd.notna(values)
+            out = np.full(len(values), na, dtype=object)
+            if strip:
+                out[present] = [str(v).strip() for v in values[present]]
+            else:
+                out[present] = [str(v) for v in values[present]]
+            self._cache[key] = pd.Series(out, index=self.frame.index, dtype=object)
+        return self._cache[key]
+
+    def is_number(self, column: int) -> pd.Series:
+        """Non-empty cells holding an int/float, i.e. ``isinstance(cell, (int, float))``."""
+        key = ("number", column)
+        if key not in self._cache:
+            values = self.value(column)
+            if values.dtype == object:
+                types = values.map(type)
+                numeric = [t for t in types.unique() if issubclass(t, (int, float))]
+                mask = types.isin(numeric) & values.notna()
+            else:
+                mask = values.notna() & pd.api.types.is_numeric_dtype(values.dtype)
+            self._cache[key] = mask.astype(bool)
+        return self._cache[key]
+
+
+def carry_forward(cells: Cells, headers: tuple[Header, ...]) -> tuple[pd.DataFrame, pd.Series]:
+    """Return the forward-filled header fields and the mask of rows consumed by headers."""
+    carried = pd.DataFrame(index=cells.frame.index)
+    consumed = pd.Series(False, index=cells.frame.index)
+    for header in headers:
+        text = cells.text(header.column)
+        is_header = text.str.contains(header.marker, regex=True)
+        if header.clean is not None:
+            text = header.clean(text)
+        extracted = text.where(is_header).str.extract(header.pattern)
+        regex = re.compile(header.pattern)
+        matched = text[is_header].map(lambda v: regex.search(v) is not None).reindex(text.index, fill_value=False).astype(bool)
+        for name in extracted.columns:
+            col = extracted[name].astype(object)
+            col = col.where(~matched, col.fillna(""))
+            carried[name] = col.ffill()
+        if header.skip_row:
+            consumed |= is_header
+    return carried, consumed
+
+
+@timed("parse blocks")
+def parse_blocks(frame: pd.DataFrame, layout: BlockLayout) -> pd.DataFrame:
+    """Extract the detail rows of one sheet as a frame of ``layout.fields`` plus carried fields."""
+    cells = Cells(frame)
+    carried, consumed = carry_forward(cells, layout.headers)
+
+    skip = pd.Series(False, index=frame.index)
+    for column in layout.skip_columns:
+        text = cells.text(column)
+        for marker in layout.skip_markers:
+            skip |= text.str.contains(marker, regex=False)
+
+    mask = ~consumed & ~skip & layout.detail(cells).astype(bool)
+    for name in layout.required:
+        mask &= carried[name].notna()
+
+    out = {name: getter(cells)[mask] for name, getter in layout.fields.items()}
+    for name in layout.carried or tuple(carried.columns):
+        out[name] = carried.loc[mask, name]
+    return pd.DataFrame(out).reset_index(drop=True).infer_objects()
@@ -0,0 +1,96 @@
+"""Command-line batch runner for the distributor transformations.
+
+    python -m t2ws.cli 30010199 "raw/振泰*.xls" --mapping mapping.xlsx --out out/
+    python -m t2ws.cli auto "raw/*.xls*" --mapping mapping.xlsx --out out/ --workers 8
+
+Every matching raw file goes through the same branch the Streamlit app runs (see
+:mod:`t2ws.headless`), with month filters left at "All". With ``auto`` the distributor
+code is taken from the start of each file name. Files are processed across
+``--workers`` processes (see :mod:`t2ws.batch`). Outputs are written to ``--out`` as
+``<raw file stem> - <export name>``, as xlsx or, with ``--csv``, as CSV. ``--timings``
+appends each file's per-stage timings (see :mod:`t2ws.timing`) to a JSON Lines log.
+"""
+import argparse
+import glob
+import os
+import sys
+
+from t2ws.batch import BatchJob, code_from_name, output_name, run_batch
+from t2ws.timing import append_jsonl
+from t2ws.workbook import ENGINE_SETTING, read_sheet
+
+
+def expand_inputs(patterns) -> list[str]:
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(p for p in matches if p not in paths)
+    return paths
+
+
+def output_path(out_dir: str, raw_path: str, file_name: str, csv: bool) -> str:
+    name = output_name(raw_path, file_name)
+    if csv:
+        name = os.path.splitext(name)[0] + ".csv"
+    return os.path.join(out_dir, name)
+
+
+def write_output(path: str, data: bytes, csv: bool) -> None:
+    if csv:
+        # exports have no header row; keep every cell as text so codes are not reformatted
+        df = read_sheet(data, header=None, dtype=str)
+        df.to_csv(path, index=False, header=False, encoding="utf-8-sig")
+    else:
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a T2 WS transformation without the Streamlit UI.")
+    parser.add_argument("code", help='distributor code, e.g. "30010085", or "auto" to read it from each file name')
+    parser.add_argument("raw", nargs="+", help="raw sales file(s) or glob pattern(s)")
+    parser.add_argument("--mapping", required=True, help="Salesforce mapping workbook (.xlsx)")
+    parser.add_argument("--out", default=".", help="output directory (default: current directory)")
+    parser.add_argument("--csv", action="store_true", help="write CSV instead of xlsx")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1, 0 = one per CPU)")
+    parser.add_argument("--engine", choices=["default", "calamine"],
+                        help=f"Excel reader backend (default: ${ENGINE_SETTING} or openpyxl/xlrd)")
+    parser.add_argument("--timings", metavar="JSONL", help="append per-stage timings of every file to this JSON Lines log")
+    args = parser.parse_args(argv)
+    if args.engine:
+        os.environ[ENGINE_SETTING] = args.engine  # inherited by the worker processes
+
+    raw_paths = expand_inputs(args.raw)
+    if not raw_paths:
+        parser.error("no raw files matched")
+    jobs = []
+    for raw_path in raw_paths:
+        code = code_from_name(raw_path) if args.code == "auto" else args.code
+        if code is None:
+            parser.error(f"cannot tell the distributor code from the file name: {raw_path}")
+        with open(raw_path, "rb") as f:
+            jobs.append(BatchJob(code=code, name=raw_path, data=f.read()))
+
+    os.makedirs(args.out, exist_ok=True)
+    outcomes = run_batch(jobs, args.mapping, max_workers=args.workers or None)
+
+    failures = 0
+    for outcome in outcomes:
+        if args.timings and outcome.timings is not None:
+            append_jsonl(args.timings, outcome.timings)
+        for level, text in outcome.messages:
+            if level in ("warning", "error"):
+                print(f"{level.upper():7} {outcome.name}: {text}", file=sys.stderr)
+        if outcome.error is not None:
+            print(f"FAILED  {outcome.name} ({outcome.code}): {outcome.error}", file=sys.stderr)
+            failures += 1
+            continue
+        for file_name, data in outcome.downloads:
+            path = output_path(args.out, outcome.name, file_name, args.csv)
+            write_output(path, data, args.csv)
+            print(f"OK      {outcome.name} -> {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Minguo (ROC calendar) date conversion, one Series at a time.
+
+Distributor reports print dates as ``114/07/31`` (ROC year 114 = 2025) and report
+periods as ``114.7``. Every value is converted once per distinct value: the column is
+factorized, the uniques are parsed with one ``str.extract`` and integer arithmetic,
+and the results are broadcast back. A 200k-row export usually has a few hundred
+distinct dates.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+
+ROC_OFFSET = 1911
+
+# int()-style parts: "114/7/31", " 114 / 07 / 31 "
+_LOOSE = r"^\s*(\d{1,9})\s*/\s*(\d{1,9})\s*/\s*(\d{1,9})\s*$"
+# exactly YYY/MM/DD after strip()
+_STRICT = r"^(\d{3})/(\d{2})/(\d{2})$"
+_PERIOD = r"^(\d{3})\.(\d{1,2})$"
+
+
+def _ymd(year: pd.Series, month: pd.Series, day: pd.Series) -> pd.Series:
+    return year.astype(str).str.zfill(4) + month.astype(str).str.zfill(2) + day.astype(str).str.zfill(2)
+
+
+def _datetime_ymd(text: str):
+    try:
+        return pd.to_datetime(text).strftime("%Y%m%d")
+    except Exception:
+        return None
+
+
+def _by_unique(values, convert) -> pd.Series:
+    """Apply ``convert(uniques) -> object array`` once per distinct non-null value."""
+    s = pd.Series(values, copy=False)
+    codes, uniques = pd.factorize(s.astype(object))
+    converted = convert(np.asarray(uniques, dtype=object))
+    out = np.empty(len(s), dtype=object)
+    present = codes >= 0
+    out[present] = converted[codes[present]]
+    out[~present] = s.to_numpy(dtype=object)[~present]
+    return pd.Series(out, index=s.index, name=s.name, dtype=object)
+
+
+def roc_to_ymd(values, *, strict: bool = False, gregorian_years: bool = False, fallback: bool = False,
+               missing=None, keep: bool = False) -> pd.Series:
+    """Convert ROC dates (``114/07/31``) to ``YYYYMMDD`` strings.
+
+    ``strict`` only accepts ``YYY/MM/DD`` after stripping; otherwise each part may be
+    any number of digits with surrounding spaces, like ``int()`` accepts.
+    ``gregorian_years`` leaves years of 1911 and later as they are
+    (``2025/07/31``). Values that do not parse are retried with ``pd.to_datetime``
+    when ``fallback`` is set. Otherwise they, and empty cells, become ``missing``,
+    or stay unchanged with ``keep``.
+    """
+    def convert(uniques: np.ndarray) -> np.ndarray:
+        text = pd.Series([str(v) for v in uniques], dtype=object)
+        if strict:
+            text = text.str.strip()
+        parts = text.str.extract(_STRICT if strict else _LOOSE)
+        ok = parts[0].notna().to_numpy()
+        result = np.full(len(uniques), missing, dtype=object)
+        if keep:
+            result[:] = uniques
+        if ok.any():
+            y, m, d = (parts.loc[ok, i].astype("int64") for i in range(3))
+            y = y.where(gregorian_years & (y >= ROC_OFFSET), y + ROC_OFFSET)
+            result[ok] = _ymd(y, m, d).to_numpy()
+        if fallback:
+            for i in np.flatnonzero(~ok):
+                result[i] = _datetime_ymd(text.iat[i].strip())
+        return result
+
+    out = _by_unique(values, convert)
+    if not keep:
+        out = out.where(pd.Series(values, copy=False).notna().to_numpy(), missing)
+    return out
+
+
+def roc_period_end(values) -> pd.Series:
+    """Convert ROC period labels (``114.7``) to the month's last day as ``YYYYMMDD``, else None."""
+    def convert(uniques: np.ndarray) -> np.ndarray:
+        parts = pd.Series([str(v).strip() for v in uniques], dtype=object).str.extract(_PERIOD)
+        result = np.full(len(uniques), None, dtype=object)
+        ok = parts[0].notna().to_numpy()
+        if ok.any():
+            y = parts.loc[ok, 0].astype("int64") + ROC_OFFSET
+            m = parts.loc[ok, 1].astype("int64")
+            first = pd.to_datetime(pd.DataFrame({"year": y, "month": m, "day": 1}), errors="coerce")
+            end = (first + pd.offsets.MonthEnd(0)).dt.strftime("%Y%m%d")
+            result[ok] = np.where(first.notna(), end.to_numpy(dtype=object), None)
+        return result
+
+    out = _by_unique(values, convert)
+    return out.where(pd.Series(values, copy=False).notna().to_numpy(), None)
+
+
+@functools.lru_cache(maxsize=4096, typed=True)
+def _roc_date_cached(value, options: tuple):
+    return roc_to_ymd(pd.Series([value], dtype=object), **dict(options)).iat[0]
+
+
+def roc_date(value, **options):
+    """Scalar :func:`roc_to_ymd` for row loops, cached per distinct value."""
+    try:
+        return _roc_date_cached(value, tuple(sorted(options.items())))
+    except TypeError:  # unhashable cell
+        return roc_to_ymd(pd.Series([value], dtype=object), **options).iat[0]
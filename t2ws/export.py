@@ -0,0 +1,58 @@
+"""In-memory xlsx export for the download buttons.
+
+Branches used to write ``<code> transformation.xlsx`` into the server's working
+directory and re-open it for ``st.download_button``: a disk round trip per run, and two
+sessions on the same distributor overwrote each other's file. The workbook is now
+serialized into a buffer, and only when the download button is clicked. That happens
+after the branch has returned, so the export is timed into the profile of the run that
+made the button (see :meth:`t2ws.timing.Profile.resume`).
+"""
+import functools
+import io
+import zipfile
+from typing import Callable
+
+import pandas as pd
+
+from t2ws.timing import Profile, active_profile, stage
+
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ZIP_MIME = "application/zip"
+
+
+def to_xlsx_bytes(df: pd.DataFrame, **kwargs) -> bytes:
+    """``df.to_excel`` into memory, without header and index unless overridden."""
+    kwargs.setdefault("index", False)
+    kwargs.setdefault("header", False)
+    with stage("export") as timing:
+        timing.rows = len(df)
+        buf = io.BytesIO()
+        df.to_excel(buf, **kwargs)
+        return buf.getvalue()
+
+
+def _deferred_xlsx_bytes(profile: Profile | None, df: pd.DataFrame, **kwargs) -> bytes:
+    if profile is None:
+        return to_xlsx_bytes(df, **kwargs)
+    with profile.resume():
+        return to_xlsx_bytes(df, **kwargs)
+
+
+def xlsx_export(df: pd.DataFrame, **kwargs) -> Callable[[], bytes]:
+    """Deferred :func:`to_xlsx_bytes` for ``st.download_button(data=...)``, timed in the current profile."""
+    return functools.partial(_deferred_xlsx_bytes, active_profile(), df, **kwargs)
+
+
+def to_zip_bytes(files: list[tuple[str, bytes]]) -> bytes:
+    """Bundle already serialized exports (name, bytes) into one zip archive."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files:
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def zip_export(files: list[tuple[str, bytes]]) -> Callable[[], bytes]:
+    """Deferred :func:`to_zip_bytes` for ``st.download_button(data=...)``."""
+    return functools.partial(to_zip_bytes, list(files))
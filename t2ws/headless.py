@@ -0,0 +1,124 @@
+"""Run a distributor transformation without a browser.
+
+The transformers are written against the Streamlit API: ``render(st)`` asks for the
+raw and mapping uploads, previews the result and offers it through
+``st.download_button``. :func:`run_transform` calls the same ``render`` with a
+:class:`HeadlessStreamlit` as ``st``. Uploaders return the given files, filters keep
+their defaults ("All" months), and downloads are collected as bytes instead of being
+sent to a browser.
+"""
+import contextlib
+import io
+import os
+from dataclasses import dataclass, field
+
+from t2ws.mapping import read_source_bytes
+from t2ws.transformers import TRANSFORMERS, load_transformer, resolve
+
+
+class StopTransform(Exception):
+    """Raised by ``st.stop()``; the branch ended early (e.g. no valid rows)."""
+
+
+class TransformError(Exception):
+    """The branch could not produce an output file."""
+
+
+class Upload(io.BytesIO):
+    """In-memory stand-in for Streamlit's ``UploadedFile``.
+
+    ``digest`` is the content hash when the caller already knows it; the mapping index
+    then looks the upload up without hashing it again (see ``t2ws.mapping.source_digest``).
+    """
+
+    def __init__(self, data: bytes, name: str, digest: str | None = None):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.type = ""
+        self.digest = digest
+
+
+@dataclass
+class TransformResult:
+    choice: str
+    downloads: list[tuple[str, bytes]] = field(default_factory=list)
+    messages: list[tuple[str, str]] = field(default_factory=list)
+    stopped: bool = False
+
+
+class HeadlessStreamlit:
+    """The subset of the ``streamlit`` module the transformations use."""
+
+    def __init__(self, choice: str, raw: Upload, mapping: Upload):
+        self.raw = raw
+        self.mapping = mapping
+        self.result = TransformResult(choice=choice)
+
+    # ---- inputs ----
+    def file_uploader(self, label, *args, **kwargs):
+        key = str(kwargs.get("key", ""))
+        is_mapping = "mapping" in str(label).lower() or "mapping" in key.lower() or key.endswith("_map")
+        upload = self.mapping if is_mapping else self.raw
+        upload.seek(0)
+        return upload
+
+    def radio(self, label, options, index=0, *args, **kwargs):
+        return list(options)[index]
+
+    def multiselect(self, label, options, default=None, *args, **kwargs):
+        return list(options if default is None else default)
+
+    # ---- outputs ----
+    def download_button(self, label=None, data=None, file_name=None, *args, **kwargs):
+        if callable(data):
+            data = data()
+        elif hasattr(data, "read"):
+            data = data.read()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.result.downloads.append((file_name, data))
+        return False
+
+    def _message(self, level):
+        def record(body="", *args, **kwargs):
+            self.result.messages.append((level, str(body)))
+        return record
+
+    def __getattr__(self, name):
+        if name in ("warning", "error", "success", "info"):
+            return self._message(name)
+        if name in ("expander", "spinner", "container"):
+            return lambda *args, **kwargs: contextlib.nullcontext()
+        if name in ("title", "write", "caption", "markdown", "code", "dataframe", "set_page_config"):
+            return lambda *args, **kwargs: None
+        raise AttributeError(name)
+
+    def stop(self):
+        raise StopTransform()
+
+
+def run_transform(code: str, raw_source, mapping_source) -> TransformResult:
+    """Run the transformer for distributor ``code`` (e.g. "30010085") on one raw file.
+
+    ``raw_source`` and ``mapping_source`` may be paths, bytes or file objects.
+    """
+    try:
+        code = resolve(code)
+    except KeyError as exc:
+        raise TransformError(exc.args[0]) from None
+    raw = Upload(read_source_bytes(raw_source), _source_name(raw_source, "raw.xlsx"))
+    mapping = Upload(read_source_bytes(mapping_source), _source_name(mapping_source, "mapping.xlsx"),
+                     getattr(mapping_source, "digest", None))
+    st = HeadlessStreamlit(f"{code} {TRANSFORMERS[code]}", raw, mapping)
+    try:
+        load_transformer(code).render(st)
+    except StopTransform:
+        st.result.stopped = True
+    return st.result
+
+
+def _source_name(source, default: str) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    return getattr(source, "name", default)
@@ -0,0 +1,46 @@
+import re
+
+import pandas as pd
+import pyarrow as pa
+
+from t2ws.timing import timed
+
+
+# Keys are Arrow-backed: composite keys are concatenated and hashed inside Arrow
+# instead of as one Python str object per row.
+KEY_DTYPE = "string[pyarrow]"
+
+# NBSP, figure space, narrow NBSP and the ideographic (full-width) space
+_SPECIAL_SPACES = str.maketrans("", "", "\u00A0\u2007\u202F\u3000")
+_TRAILING_ZEROS = re.compile(r"\.0+$")
+
+
+def _clean_one(value: str) -> str:
+    return _TRAILING_ZEROS.sub("", value.translate(_SPECIAL_SPACES).strip())
+
+
+def _normalize_one(value: str) -> str:
+    return _clean_one(value).upper()
+
+
+def _per_unique(series: pd.Series, func) -> pd.Series:
+    s = pd.Series(series, copy=False).astype(KEY_DTYPE).fillna("")
+    # Codes repeat heavily (a few hundred customers over 100k rows), so clean each
+    # distinct value once in Python (the trailing-zero regex never goes through Arrow's
+    # RE2 engine) and broadcast the result back with an Arrow take.
+    codes, uniques = pd.factorize(s)
+    cleaned = pa.array([func(v) for v in uniques], type=pa.large_string())
+    values = pd.arrays.ArrowStringArray(pa.chunked_array([cleaned.take(pa.array(codes))]))
+    return pd.Series(values, index=s.index, name=s.name, dtype=KEY_DTYPE)
+
+
+@timed("normalize keys")
+def clean_code(series: pd.Series) -> pd.Series:
+    """Drop special spaces, surrounding whitespace and a trailing ``.0``; NA becomes ""."""
+    return _per_unique(series, _clean_one)
+
+
+@timed("normalize keys")
+def normalize_key(series: pd.Series) -> pd.Series:
+    """:func:`clean_code`, upper-cased: the join key for offtake codes and groups."""
+    return _per_unique(series, _normalize_one)
@@ -0,0 +1,373 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from t2ws.keys import KEY_DTYPE, normalize_key
+from t2ws.timing import timed
+
+
+CUSTOMER_SHEET = "Customer Mapping"
+SKU_SHEET = "SKU Mapping"
+
+CUST_OFFTAKE = "ASI_CRM_Offtake_Customer_No__c"
+CUST_JDE = "ASI_CRM_JDE_Cust_No_Formula__c"
+CUST_GROUP = "ASI_CRM_Mapping_Cust_No__c"
+
+SKU_OFFTAKE = "ASI_CRM_Offtake_Product__c"
+SKU_CODE = "ASI_CRM_SKU_Code__c"
+SKU_GROUP = "ASI_CRM_Mapping_Cust_Code__c"
+
+CUSTOMER_COLUMNS = (CUST_OFFTAKE, CUST_JDE, CUST_GROUP)
+SKU_COLUMNS = (SKU_OFFTAKE, SKU_CODE, SKU_GROUP)
+
+# (offtake code, group, target) per sheet
+_TABLE_COLUMNS = {"customer": (CUST_OFFTAKE, CUST_GROUP, CUST_JDE), "sku": (SKU_OFFTAKE, SKU_GROUP, SKU_CODE)}
+
+# Excel type of each target cell (0: text or empty), so the values pd.read_excel infers
+# without dtype=str can be rebuilt from the text; see MappingIndex.typed_targets
+_CELL_KINDS = {int: 1, float: 2, bool: 3, datetime: 4, pd.Timestamp: 4}
+_CELL_PARSERS = {1: int, 2: float, 3: lambda text: text == "True", 4: lambda text: pd.Timestamp(text).to_pydatetime()}
+
+# Compiled indexes are kept per process, so every Streamlit session that uploads
+# the same Salesforce export reuses one parse.
+_MAX_INDEXES = 4
+_INDEX_CACHE: "OrderedDict[str, MappingIndex]" = OrderedDict()
+_INDEX_LOCK = threading.Lock()
+# one lock per digest being parsed, so concurrent sessions wait for a single parse
+_PARSE_LOCKS: dict[str, threading.Lock] = {}
+
+
+def read_source_bytes(source) -> bytes:
+    """Return the raw bytes of an uploaded file, a file path or a bytes object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    pos = source.tell()
+    source.seek(0)
+    data = source.read()
+    source.seek(pos)
+    return data
+
+
+def mapping_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _known_digest(source) -> str | None:
+    # readers over an already hashed upload (t2ws.uploads.BufferReader) carry their digest
+    digest = getattr(source, "digest", None)
+    return digest if isinstance(digest, str) else None
+
+
+def source_digest(source) -> str:
+    """Content hash of ``source``, read and hashed only if the source does not carry one."""
+    return _known_digest(source) or mapping_digest(read_source_bytes(source))
+
+
+class PairLookup:
+    """Left join of (code, group) pairs to a target column, on integer ids.
+
+    Codes and groups are factorized once when the mapping is compiled, and every
+    (code id, group id) pair is packed into one int64, sorted, with the first row of a
+    duplicated pair winning like ``drop_duplicates(subset=key)``. A lookup factorizes
+    the query against the same dictionaries, finds its pair ids with ``searchsorted`` and
+    ``take``s the targets, so no ``code|group`` strings are built on either side.
+    """
+
+    def __init__(self, codes: pd.Series, groups: pd.Series, targets: pd.Series):
+        # codes and groups are join keys already (see normalize_key)
+        code_ids, code_values = pd.factorize(pd.Series(codes, copy=False).astype(KEY_DTYPE))
+        group_ids, group_values = pd.factorize(pd.Series(groups, copy=False).astype(KEY_DTYPE))
+        self.codes = pd.Index(code_values)
+        self.groups = pd.Index(group_values)
+        self._stride = max(len(self.groups), 1)
+        pairs = code_ids.astype("int64") * self._stride + group_ids
+        self.pairs, first = np.unique(pairs, return_index=True)
+        self.targets = pd.Series(targets, copy=False).iloc[first].reset_index(drop=True)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, code_col: str, group_col: str, target_col: str) -> "PairLookup":
+        return cls(normalize_key(df[code_col]), normalize_key(df[group_col]), df[target_col])
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "PairLookup":
+        return cls(frame["code"], frame["group"], frame["target"])
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per distinct pair, already normalized; ``from_frame`` rebuilds the lookup."""
+        return pd.DataFrame({
+            "code": self.codes.array.take(self.pairs // self._stride),
+            "group": self.groups.array.take(self.pairs % self._stride),
+            "target": self.targets.array,
+        })
+
+    def _group_ids(self, group, index: pd.Index) -> np.ndarray:
+        if isinstance(group, pd.Series):
+            ids, values = pd.factorize(normalize_key(group))
+            return self.groups.get_indexer(values)[ids]
+        # a literal group code is matched as given, like the branches' '|' + '30010085'
+        return np.full(len(index), self.groups.get_indexer([group])[0], dtype="int64")
+
+    @timed("mapping lookup")
+    def lookup(self, codes: pd.Series, group) -> pd.Series:
+        """Target per row of ``codes`` for ``group`` (a code or a Series); NaN where unmapped."""
+        codes = pd.Series(codes, copy=False)
+        ids, values = pd.factorize(normalize_key(codes))
+        code_ids = self.codes.get_indexer(values)[ids]
+        group_ids = self._group_ids(group, codes.index)
+        wanted = code_ids.astype("int64") * self._stride + group_ids
+        pos = np.searchsorted(self.pairs, wanted)
+        # an unknown code or group would alias a neighbouring pair id, so mask those first
+        hit = (code_ids >= 0) & (group_ids >= 0) & (pos < len(self.pairs))
+        hit[hit] = self.pairs[pos[hit]] == wanted[hit]
+        targets = self.targets.array if isinstance(self.targets.dtype, pd.api.extensions.ExtensionDtype) else self.targets.to_numpy()
+        # numeric targets turn float (NaN) where unmapped, as in a left merge
+        taken = pd.api.extensions.take(targets, np.where(hit, pos, -1), allow_fill=True)
+        return pd.Series(taken, index=codes.index)
+
+
+@dataclass(frozen=True)
+class KeyRule:
+    """How a branch spells offtake codes in its one-to-one tables.
+
+    The code is stripped, then optionally upper-cased, stripped of one trailing ``.0``
+    and of inner spaces, in that order.
+    """
+    upper: bool = True
+    drop_zero: bool = False
+    squeeze: bool = False
+
+    def apply(self, codes: pd.Series) -> pd.Series:
+        keys = codes.astype(str).str.strip()
+        if self.upper:
+            keys = keys.str.upper()
+        if self.drop_zero:
+            keys = keys.str.replace(r"\.0$", "", regex=True)
+        if self.squeeze:
+            keys = keys.str.replace(" ", "", regex=False)
+        return keys
+
+
+CUST_KEYS = KeyRule(drop_zero=True, squeeze=True)
+SKU_KEYS = KeyRule()
+
+
+@dataclass(frozen=True)
+class UniqueMap:
+    """Keys with exactly one distinct target, and the fan-out keys that were left out."""
+    values: pd.Series
+    fanout: pd.Index
+
+
+def unique_only(keys: pd.Series, values: pd.Series) -> UniqueMap:
+    """Keep keys mapping to a single distinct value (first row wins); NaN keys are dropped."""
+    kv = pd.DataFrame({"key": keys, "val": values})
+    n = kv.groupby("key")["val"].nunique()
+    kv = kv[kv["key"].isin(n.index[n == 1])].drop_duplicates(subset=["key"], keep="first")
+    return UniqueMap(pd.Series(kv["val"].to_numpy(), index=pd.Index(kv["key"]), dtype=kv["val"].dtype),
+                     pd.Index(n.index[n > 1]))
+
+
+def cell_kinds(cells: pd.Series) -> np.ndarray:
+    """Excel type code per raw cell (``_CELL_KINDS``), 0 for text and empty cells."""
+    return np.fromiter((_CELL_KINDS.get(type(v), 0) for v in cells), dtype="int8", count=len(cells))
+
+
+def infer_cells(text: pd.Series, kinds: np.ndarray) -> pd.Series:
+    """The column ``pd.read_excel`` returns without ``dtype=str``, rebuilt from its text.
+
+    Numeric, boolean and date cells get their type back, then the values go through the
+    same ``TextParser`` inference, so numeric-looking text becomes numbers and a column
+    with any empty cell float, exactly as a plain ``read_excel`` would have it.
+    """
+    if not len(text):
+        return pd.Series([], dtype=object)
+    cells = [_CELL_PARSERS[k](v) if k and isinstance(v, str) else v for v, k in zip(text, kinds)]
+    return TextParser([[v] for v in cells], header=None).read()[0]
+
+
+class MappingIndex:
+    """Parsed Customer/SKU Mapping sheets plus ready-made composite-key lookups.
+
+    The sheets are kept as text, like ``pd.read_excel(..., dtype=str)``. ``target_kinds``
+    records the Excel type of every JDE customer number and SKU code cell, for the
+    branches that always read the mapping without ``dtype=str`` (``typed=True``).
+    """
+
+    def __init__(self, digest: str, customer: pd.DataFrame, sku: pd.DataFrame,
+                 customer_lookup: PairLookup | None = None, sku_lookup: PairLookup | None = None,
+                 target_kinds: dict[str, np.ndarray] | None = None):
+        self.digest = digest
+        self.customer = customer
+        self.sku = sku
+        self.target_kinds = target_kinds or {}
+        if customer_lookup is None:
+            customer_lookup = PairLookup.build(customer, CUST_OFFTAKE, CUST_GROUP, CUST_JDE)
+        if sku_lookup is None:
+            sku_lookup = PairLookup.build(sku, SKU_OFFTAKE, SKU_GROUP, SKU_CODE)
+        self.customer_lookup = customer_lookup
+        self.sku_lookup = sku_lookup
+        self._unique_maps: dict[tuple, UniqueMap] = {}
+        self._typed: dict[str, tuple[pd.Series, PairLookup]] = {}
+        self._unique_lock = threading.Lock()
+
+    def _frame(self, table: str) -> pd.DataFrame:
+        return self.customer if table == "customer" else self.sku
+
+    def _typed_table(self, table: str) -> tuple[pd.Series, PairLookup]:
+        with self._unique_lock:
+            cached = self._typed.get(table)
+        if cached is not None:
+            return cached
+        code_col, group_col, target_col = _TABLE_COLUMNS[table]
+        df = self._frame(table)
+        kinds = self.target_kinds.get(table)
+        targets = infer_cells(df[target_col], np.zeros(len(df), dtype="int8") if kinds is None else kinds)
+        built = (targets, PairLookup(normalize_key(df[code_col]), normalize_key(df[group_col]), targets))
+        with self._unique_lock:
+            return self._typed.setdefault(table, built)
+
+    def typed_targets(self, table: str) -> pd.Series:
+        """The ``"customer"`` or ``"sku"`` target column as ``pd.read_excel`` infers it without ``dtype=str``."""
+        return self._typed_table(table)[0]
+
+    def map_customer(self, codes: pd.Series, group, typed: bool = False) -> pd.Series:
+        """Left-join offtake customer codes to JDE customer numbers for a customer group.
+
+        With ``typed`` the numbers come back as in :meth:`typed_targets` (numeric-looking
+        codes as numbers), otherwise as text.
+        """
+        lookup = self._typed_table("customer")[1] if typed else self.customer_lookup
+        return lookup.lookup(codes, group)
+
+    def map_sku(self, codes: pd.Series, group, typed: bool = False) -> pd.Series:
+        """Left-join offtake product codes to PRT SKU codes for a customer group (``typed`` as above)."""
+        lookup = self._typed_table("sku")[1] if typed else self.sku_lookup
+        return lookup.lookup(codes, group)
+
+    def merge_all(self, table: str, frame: pd.DataFrame, code_column: str, group: str, name: str,
+                  typed: bool = False) -> pd.DataFrame:
+        """Left-merge ``frame`` with every mapping row of its (code, ``group``) pair, as ``name``.
+
+        Unlike :meth:`map_customer`/:meth:`map_sku` (first row wins), a pair listed twice
+        in the mapping repeats the row, as a plain ``DataFrame.merge`` does.
+        """
+        code_col, group_col, target_col = _TABLE_COLUMNS[table]
+        df = self._frame(table)
+        right = pd.DataFrame({
+            "_pair": normalize_key(df[code_col]) + "|" + normalize_key(df[group_col]),
+            name: self.typed_targets(table) if typed else df[target_col].reset_index(drop=True),
+        })
+        left = frame.assign(_pair=normalize_key(frame[code_column]) + "|" + group)
+        return left.merge(right, on="_pair", how="left").drop(columns="_pair")
+
+    @timed("mapping tables")
+    def unique_map(self, table: str, rule: KeyRule, group: str | None = None, keyed: bool = False) -> UniqueMap:
+        """One-to-one ``"customer"`` or ``"sku"`` table, built once per mapping version.
+
+        With ``group`` only that distributor's rows are used, otherwise the whole sheet.
+        ``keyed`` appends ``|group`` to the keys (``|`` plus the raw group cell for the
+        whole sheet), as the branches' ``prep_cust``/``prep_sku`` helpers did. Targets are
+        stripped strings.
+        """
+        cache_key = (table, rule, group, keyed)
+        with self._unique_lock:
+            cached = self._unique_maps.get(cache_key)
+        if cached is not None:
+            return cached
+
+        code_col, group_col, target_col = _TABLE_COLUMNS[table]
+        df = self._frame(table)
+        if group is not None:
+            df = df[df[group_col].astype(str).str.replace(r"\.0$", "", regex=True) == group]
+        keys = rule.apply(df[code_col])
+        if keyed:
+            keys = keys + "|" + (str(group) if group is not None else df[group_col].astype(str))
+        built = unique_only(keys, df[target_col].astype(str).str.strip())
+        with self._unique_lock:
+            return self._unique_maps.setdefault(cache_key, built)
+
+
+def _read_columns(xls, sheet: str, columns, target: str) -> tuple[pd.DataFrame, np.ndarray]:
+    # Salesforce exports sometimes pad header cells, so match on the stripped name.
+    wanted = set(columns)
+    # raw cells, so the target's Excel types can be kept next to the text
+    df = xls.parse(sheet, usecols=lambda c: str(c).strip() in wanted, dtype=object)
+    df.columns = df.columns.map(lambda c: str(c).strip())
+    kinds = cell_kinds(df[target]) if target in df.columns else np.zeros(len(df), dtype="int8")
+    # empty cells stay missing, as with dtype=str (pandas 2 would turn them into "nan")
+    return df.astype("str").where(df.notna()), kinds
+
+
+def read_mapping_frames(data: bytes) -> tuple[pd.DataFrame, pd.DataFrame, dict[str, np.ndarray]]:
+    """Read only the Customer/SKU Mapping sheets and their ASI_CRM_* columns, as strings.
+
+    Also returns the Excel type of every target cell per table (see :func:`cell_kinds`).
+    The workbook is opened once; other tabs and unused Salesforce columns are skipped.
+    """
+    from t2ws.workbook import open_workbook  # workbook imports this module
+
+    with open_workbook(data) as xls:
+        customer, customer_kinds = _read_columns(xls, CUSTOMER_SHEET, CUSTOMER_COLUMNS, CUST_JDE)
+        sku, sku_kinds = _read_columns(xls, SKU_SHEET, SKU_COLUMNS, SKU_CODE)
+    return customer, sku, {"customer": customer_kinds, "sku": sku_kinds}
+
+
+def _parse_mapping(data: bytes, digest: str) -> MappingIndex:
+    customer, sku, target_kinds = read_mapping_frames(data)
+    return MappingIndex(digest, customer, sku, target_kinds=target_kinds)
+
+
+def cache_mapping_index(index: MappingIndex) -> MappingIndex:
+    """Put an already built index (e.g. loaded from a snapshot) into the shared cache."""
+    with _INDEX_LOCK:
+        _INDEX_CACHE[index.digest] = index
+        _INDEX_CACHE.move_to_end(index.digest)
+        while len(_INDEX_CACHE) > _MAX_INDEXES:
+            _INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def cached_mapping_index(digest: str) -> MappingIndex | None:
+    with _INDEX_LOCK:
+        index = _INDEX_CACHE.get(digest)
+        if index is not None:
+            _INDEX_CACHE.move_to_end(digest)
+        return index
+
+
+@timed("mapping load")
+def get_mapping_index(source) -> MappingIndex:
+    """Return the compiled mapping index for ``source``, parsing it once per distinct content."""
+    digest, data = _known_digest(source), None
+    if digest is None:
+        data = read_source_bytes(source)
+        digest = mapping_digest(data)
+    index = cached_mapping_index(digest)
+    if index is not None:
+        return index
+    with _INDEX_LOCK:
+        parse_lock = _PARSE_LOCKS.setdefault(digest, threading.Lock())
+    try:
+        with parse_lock:
+            index = cached_mapping_index(digest)
+            if index is not None:
+                return index
+            if data is None:
+                data = read_source_bytes(source)
+            return cache_mapping_index(_parse_mapping(data, digest))
+    finally:
+        with _INDEX_LOCK:
+            if _PARSE_LOCKS.get(digest) is parse_lock and not parse_lock.locked():
+                del _PARSE_LOCKS[digest]
@@ -0,0 +1,49 @@
+"""Per-process cache of parsed-and-mapped branch results.
+
+Every widget interaction reruns the whole Streamlit script, so picking a month in a
+branch's filter used to re-parse the raw workbook and re-map it just to slice rows.
+Branches with a month filter build their unfiltered frame through
+:func:`cached_frame`, keyed by distributor code, raw file hash and mapping hash, and
+the rerun only filters the cached copy.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import pandas as pd
+
+from t2ws.mapping import source_digest
+
+
+_MAX_RESULTS = 16
+_RESULT_CACHE: "OrderedDict[tuple[str, str, str], pd.DataFrame]" = OrderedDict()
+_RESULT_LOCK = threading.Lock()
+
+
+def result_key(code: str, raw_source, mapping_source) -> tuple[str, str, str]:
+    return code, source_digest(raw_source), source_digest(mapping_source)
+
+
+def cached_frame(code: str, raw_source, mapping_source, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """Return ``build()`` for this (code, raw, mapping) triple, running it once per distinct input.
+
+    A copy is returned, so callers may filter or modify it freely.
+    """
+    key = result_key(code, raw_source, mapping_source)
+    with _RESULT_LOCK:
+        frame = _RESULT_CACHE.get(key)
+        if frame is not None:
+            _RESULT_CACHE.move_to_end(key)
+    if frame is None:
+        frame = build()
+        with _RESULT_LOCK:
+            _RESULT_CACHE[key] = frame
+            _RESULT_CACHE.move_to_end(key)
+            while len(_RESULT_CACHE) > _MAX_RESULTS:
+                _RESULT_CACHE.popitem(last=False)
+    return frame.copy()
+
+
+def clear_results() -> None:
+    with _RESULT_LOCK:
+        _RESULT_CACHE.clear()
@@ -0,0 +1,126 @@
+"""Columnar on-disk snapshot of a persisted mapping index.
+
+The snapshot sits next to ``data/mapping.xlsx`` as uncompressed Arrow IPC (Feather v2)
+files, so a new session can memory-map the parsed tables instead of running the xlsx
+through openpyxl again. Each mapping's tables live in a directory named after its digest,
+written under a temporary name and renamed into place, so a file another session has
+mapped is never rewritten; ``DIGEST`` names the current one and is replaced last.
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from t2ws.mapping import MappingIndex, PairLookup, cache_mapping_index, cached_mapping_index
+
+
+_DIGEST_FILE = "DIGEST"
+_TABLES = ("customer", "sku", "customer_pairs", "sku_pairs", "customer_kinds", "sku_kinds")
+
+
+def _table_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.arrow")
+
+
+def _complete(tables_dir: str) -> bool:
+    # snapshots from before a table was added lack its file and are rewritten
+    return all(os.path.exists(_table_path(tables_dir, name)) for name in _TABLES)
+
+
+def snapshot_digest(directory: str) -> str | None:
+    try:
+        with open(os.path.join(directory, _DIGEST_FILE), encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _kinds_frame(index: MappingIndex, table: str) -> pd.DataFrame:
+    # Excel types of the target cells, for MappingIndex.typed_targets
+    rows = len(index.customer if table == "customer" else index.sku)
+    return pd.DataFrame({"kind": index.target_kinds.get(table, np.zeros(rows, dtype="int8"))})
+
+
+def write_snapshot(directory: str, index: MappingIndex) -> None:
+    """Write ``index`` to ``directory`` and make it the current snapshot."""
+    tables_dir = os.path.join(directory, index.digest)
+    os.makedirs(directory, exist_ok=True)
+    if not _complete(tables_dir):
+        frames = {
+            "customer": index.customer,
+            "sku": index.sku,
+            "customer_pairs": index.customer_lookup.to_frame(),
+            "sku_pairs": index.sku_lookup.to_frame(),
+            "customer_kinds": _kinds_frame(index, "customer"),
+            "sku_kinds": _kinds_frame(index, "sku"),
+        }
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=directory)
+        try:
+            for name, frame in frames.items():
+                # uncompressed so the file can be memory-mapped on load
+                feather.write_feather(frame.reset_index(drop=True), _table_path(tmp_dir, name), compression="uncompressed")
+            if os.path.isdir(tables_dir):
+                # incomplete (older) snapshot of the same mapping; renamed aside, since it may be mapped
+                os.replace(tables_dir, tempfile.mkdtemp(prefix=".old-", dir=directory))
+            os.replace(tmp_dir, tables_dir)
+        except OSError:
+            if not _complete(tables_dir):
+                raise
+            # another writer put the same tables in place first
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    digest_path = os.path.join(directory, _DIGEST_FILE)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, prefix=".tmp-", delete=False) as f:
+        f.write(index.digest)
+    os.replace(f.name, digest_path)
+    _prune(directory, index.digest)
+
+
+def _prune(directory: str, keep: str) -> None:
+    # unlinking leaves pages that are already mapped readable (POSIX); where the OS refuses
+    # (Windows), the files stay until a later write or clear_snapshot
+    for entry in os.listdir(directory):
+        if entry in (keep, _DIGEST_FILE) or entry.startswith(".tmp-"):
+            continue
+        path = os.path.join(directory, entry)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_snapshot(directory: str, digest: str) -> MappingIndex | None:
+    """Return the snapshot index for ``digest`` (and cache it), or None if it is missing or stale."""
+    index = cached_mapping_index(digest)
+    if index is not None:
+        return index
+    tables_dir = os.path.join(directory, digest)
+    if not _complete(tables_dir):
+        return None
+    try:
+        tables = {
+            name: feather.read_table(_table_path(tables_dir, name), memory_map=True).to_pandas()
+            for name in _TABLES
+        }
+    except (OSError, ValueError):
+        return None
+    index = MappingIndex(
+        digest,
+        tables["customer"],
+        tables["sku"],
+        customer_lookup=PairLookup.from_frame(tables["customer_pairs"]),
+        sku_lookup=PairLookup.from_frame(tables["sku_pairs"]),
+        target_kinds={table: tables[f"{table}_kinds"]["kind"].to_numpy() for table in ("customer", "sku")},
+    )
+    return cache_mapping_index(index)
+
+
+def clear_snapshot(directory: str) -> None:
+    shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,209 @@
+"""Per-stage wall time, row counts and peak memory of one transformation run.
+
+A :class:`Profile` is entered around a branch's ``render(st)``. The shared helpers the
+branches go through (workbook reads, block parsing, mapping load, key normalization,
+mapping lookups, xlsx export) are wrapped with :func:`timed` or :func:`stage`, so every
+distributor is broken down the same way without touching its code. Outside a profile
+the wrappers only cost a context-variable lookup. Work a branch defers past its run (the
+xlsx export, built only when the download is clicked) re-enters the run's profile with
+:meth:`Profile.resume`.
+
+Stages nest: a mapping lookup contains the key normalization it runs, and both are
+listed, the inner one a level deeper (``depth``). Peak memory is measured with
+``tracemalloc`` (Python and numpy allocations, process-wide) and only when the profile
+asks for it, since tracing slows allocation-heavy code down noticeably.
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable
+
+import pandas as pd
+
+
+_ACTIVE: contextvars.ContextVar["Profile | None"] = contextvars.ContextVar("t2ws_profile", default=None)
+
+# tracemalloc is process-wide; it runs while any profile in any session wants memory
+_TRACING_USERS = 0
+_TRACING_LOCK = threading.Lock()
+
+
+@dataclass
+class StageTiming:
+    stage: str
+    depth: int = 0
+    seconds: float = 0.0
+    rows: int | None = None
+    peak_bytes: int | None = None
+
+
+@dataclass
+class Profile:
+    """Stage timings of one run, recorded while the profile is entered."""
+    choice: str
+    source: str | None = None
+    memory: bool = False
+    stages: list[StageTiming] = field(default_factory=list)
+    seconds: float = 0.0
+    error: str | None = None
+    # called with the stages recorded by each resume(), e.g. to log a deferred export
+    on_resume: Callable[[list[StageTiming]], None] | None = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self._depth = 0
+        self._peaks: list[int] = []
+        self._tracing = False
+        self._token = None
+        self._start = 0.0
+
+    def __enter__(self) -> "Profile":
+        if self.memory:
+            self._tracing = _start_tracing()
+        self._token = _ACTIVE.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.seconds = time.perf_counter() - self._start
+        _ACTIVE.reset(self._token)
+        if self._tracing:
+            _stop_tracing()
+            self._tracing = False
+        if exc is not None and self.error is None:
+            self.error = type(exc).__name__
+
+    @contextlib.contextmanager
+    def resume(self):
+        """Record stages into this profile again, for work deferred past the run."""
+        first = len(self.stages)
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+            if self.on_resume is not None and len(self.stages) > first:
+                self.on_resume(self.stages[first:])
+
+    def frame(self) -> pd.DataFrame:
+        """One row per stage, in start order, for the timing panel."""
+        return pd.DataFrame({
+            "Stage": ["· " * s.depth + s.stage for s in self.stages],
+            "ms": [round(s.seconds * 1000, 1) for s in self.stages],
+            "Rows": pd.array([s.rows for s in self.stages], dtype="Int64"),
+            "Peak MiB": [None if s.peak_bytes is None else round(s.peak_bytes / 2**20, 1) for s in self.stages],
+        })
+
+    def record(self, deferred: list[StageTiming] | None = None) -> dict:
+        """JSON-ready summary: when, what, total seconds and every stage.
+
+        With ``deferred`` (stages from a :meth:`resume`), only those stages and their time.
+        """
+        stages = self.stages if deferred is None else deferred
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "choice": self.choice,
+            "source": self.source,
+            "seconds": round(self.seconds if deferred is None else sum(s.seconds for s in deferred if s.depth == 0), 4),
+            "error": self.error,
+            "deferred": deferred is not None,
+            "stages": [asdict(s) for s in stages],
+        }
+
+
+def _start_tracing() -> bool:
+    global _TRACING_USERS
+    with _TRACING_LOCK:
+        if _TRACING_USERS == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif _TRACING_USERS == 0:
+            return False  # someone else (e.g. a debugger) owns tracemalloc
+        _TRACING_USERS += 1
+        return True
+
+
+def _stop_tracing() -> None:
+    global _TRACING_USERS
+    with _TRACING_LOCK:
+        _TRACING_USERS -= 1
+        if _TRACING_USERS == 0:
+            tracemalloc.stop()
+
+
+def active_profile() -> "Profile | None":
+    """The profile recording in this context, if any."""
+    return _ACTIVE.get()
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Time the ``with`` body as stage ``name`` of the active profile.
+
+    Yields the :class:`StageTiming`, so the body can set ``rows``; without an active
+    profile the timing is simply discarded.
+    """
+    profile = _ACTIVE.get()
+    if profile is None:
+        yield StageTiming(name)
+        return
+    timing = StageTiming(name, depth=profile._depth)
+    profile.stages.append(timing)
+    tracing = profile._tracing and tracemalloc.is_tracing()
+    if tracing:
+        # tracemalloc has one peak; carry the enclosing stage's peak so far on a stack
+        current, peak = tracemalloc.get_traced_memory()
+        if profile._peaks:
+            profile._peaks[-1] = max(profile._peaks[-1], peak)
+        tracemalloc.reset_peak()
+        profile._peaks.append(current)
+    profile._depth += 1
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        timing.seconds = time.perf_counter() - start
+        profile._depth -= 1
+        if tracing:
+            base = current
+            own = max(profile._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            timing.peak_bytes = own - base
+            if profile._peaks:
+                profile._peaks[-1] = max(profile._peaks[-1], own)
+
+
+def _row_count(result) -> int | None:
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return len(result)
+    if isinstance(result, dict) and all(isinstance(v, pd.DataFrame) for v in result.values()):
+        return sum(len(v) for v in result.values())
+    return None
+
+
+def timed(name: str):
+    """Decorator: run the function as stage ``name``; frame/Series results set ``rows``."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE.get() is None:
+                return func(*args, **kwargs)
+            with stage(name) as timing:
+                result = func(*args, **kwargs)
+                timing.rows = _row_count(result)
+            return result
+        return wrapper
+    return decorate
+
+
+def append_jsonl(path: str, record: dict) -> None:
+    """Append one record to a JSON Lines log, creating its directory if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -0,0 +1,68 @@
+"""Registry of distributor transformations, imported on first use.
+
+Each distributor lives in its own module, ``t2ws.transformers.t<code>``, exposing
+``render(st)``: the Streamlit page for that raw format. ``st`` is the ``streamlit``
+module in the app and :class:`t2ws.headless.HeadlessStreamlit` in batch runs.
+:data:`TRANSFORMERS` lists the codes and display names. A module is imported only
+when its distributor is selected, so an app rerun never compiles the other 35 layouts.
+"""
+import importlib
+from types import ModuleType
+
+
+# code -> display name, in selectbox order
+TRANSFORMERS = {
+    "30010008": "利多吉",
+    "30010010": "酒倉盛豐行",
+    "30010013": "酒田",
+    "30010017": "正興(振興)",
+    "30010031": "廣茂隆(八條)",
+    "30010059": "誠邦有限公司",
+    "30010061": "向日葵",
+    "30010085": "宏酒樽 (夜)",
+    "30010154": "亨玖",
+    "30010176": "振泰 ON",
+    "30010185": "瑞星翰德(夜點)",
+    "30010199": "振泰 OFF",
+    "30010203": "宏酒樽 (日)",
+    "30010225": "連大立",
+    "30010315": "圳程",
+    "30010316": "大倉捷",
+    "30020016": "日嵩",
+    "30020023": "松勇ON",
+    "30020027": "榮好(實儀)",
+    "30020076": "酒國英豪",
+    "30020145": "鏵錡",
+    "30020177": "富為MM(甲揚)",
+    "30020180": "暐倫 OFF",
+    "30020203": "玄星 OFF",
+    "30020216": "久悅貿易",
+    "30030010": "信禕",
+    "30030021": "合歡 ON",
+    "30030061": "合歡 OFF",
+    "30030076": "裕陞（分月）",
+    "30030083": "東瀛",
+    "30030084": "華恩",
+    "30030088": "九久",
+    "30030094": "和易 ON",
+    "30030105": "上景",
+    "30030106": "明輝",
+    "33001422": "和易 OFF",
+}
+
+
+def choices() -> list[str]:
+    """Selectbox labels, e.g. "30010085 宏酒樽 (夜)"."""
+    return [f"{code} {name}" for code, name in TRANSFORMERS.items()]
+
+
+def resolve(code_or_choice: str) -> str:
+    """Distributor code for a code or a selectbox label; KeyError if unknown."""
+    code = str(code_or_choice).strip().split(" ", 1)[0]
+    if code not in TRANSFORMERS:
+        raise KeyError(f"Unknown distributor code: {code_or_choice}")
+    return code
+
+
+def load_transformer(code_or_choice: str) -> ModuleType:
+    return importlib.import_module(f"{__name__}.t{resolve(code_or_choice)}")
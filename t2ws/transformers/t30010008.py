@@ -0,0 +1,225 @@
+"""30010008 利多吉."""
+
+import pandas as pd
+
+from t2ws.dates import roc_date
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders: allow both .xls and .xlsx
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls","xlsx"], key="liduoji_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls","xlsx"], key="liduoji_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # =============== helpers ===============
+        def norm_code(s: str) -> str:
+            return str(s).strip().upper().replace(" ", "").replace(".0", "")
+
+        def unique_only_map(df, key_col, val_col, norm=lambda x: x, group_col=None):
+            """Build key->val map taking the first value for each key."""
+            if group_col:
+                # Check if group_col is a column name or a literal value
+                if group_col in df.columns:
+                    tmp = df[[key_col, val_col, group_col]].dropna().copy()
+                    tmp["key"] = tmp[key_col].astype(str).map(norm) + '|' + tmp[group_col].astype(str)
+                else:
+                    tmp = df[[key_col, val_col]].dropna().copy()
+                    tmp["key"] = tmp[key_col].astype(str).map(norm) + '|' + str(group_col)
+            else:
+                tmp = df[[key_col, val_col]].dropna().copy()
+                tmp["key"] = tmp[key_col].astype(str).map(norm)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            tmp = tmp.drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+        # ---- header detection helpers (robust to slight shifts)
+        def looks_like_header(cells):
+            row = [str(c).strip() for c in cells]
+            joined = "|".join(row)
+            has_date = any(tok in joined for tok in ["銷貨日期", "日期"])
+            has_doc  = any(tok in joined for tok in ["銷貨單號", "單據號碼"])
+            has_cust = any(tok in joined for tok in ["客戶", "客戶簡稱", "客戶編號", "客戶代號"])
+            has_qty  = any(tok in joined for tok in ["數量", "數量(瓶)"])
+            return has_date and has_doc and has_cust and has_qty
+
+        def find_indices(header_cells):
+            """Return (date_idx, doc_idx, cust_code_idx, cust_name_idx, qty_idx) best-effort."""
+            row = [str(c).strip() for c in header_cells]
+            def idx_of(cands):
+                for t in cands:
+                    if t in row:
+                        return row.index(t)
+                return None
+            date_idx = idx_of(["銷貨日期","日期"])
+            doc_idx  = idx_of(["銷貨單號","單據號碼"])
+            cust_code_idx = idx_of(["客戶編號","客戶代號"])
+            cust_name_idx = idx_of(["客戶簡稱","客戶"])
+            qty_idx  = idx_of(["數量","數量(瓶)"])
+            # fallbacks (common layout: A,B,D,E,F)
+            if date_idx is None: date_idx = 0
+            if doc_idx  is None: doc_idx  = 1
+            if cust_code_idx is None: cust_code_idx = 3
+            if cust_name_idx is None: cust_name_idx = 4
+            if qty_idx  is None: qty_idx  = 5
+            return date_idx, doc_idx, cust_code_idx, cust_name_idx, qty_idx
+
+        # =============== 1) Parse all sheets (blocks: 起訖品號 …) ===============
+        with open_workbook(raw_data_file) as xls:
+            sheets = xls.sheet_names
+
+            def extract_sheet(sheet_name: str) -> pd.DataFrame:
+                df = xls.parse(sheet_name, header=None)
+                if df.empty:
+                    return pd.DataFrame()
+
+                ncols = df.shape[1]
+                recs = []
+                current_code = ""
+                current_name = ""
+                in_grid = False
+                header_idx_tuple = None  # indices for columns within the grid
+
+                def sval(r, c):
+                    return str(df.iat[r, c]).strip() if (c < ncols and pd.notna(df.iat[r, c])) else ""
+
+                def seek_name_forward(start_row: int) -> str:
+                    for rr in range(start_row + 1, min(start_row + 4, len(df))):
+                        s3 = sval(rr, 3)
+                        if s3:
+                            return s3
+                    return ""
+
+                for r in range(len(df)):
+                    # collect a window of cells for header sniffing when needed
+                    row_cells = [df.iat[r, c] if (c < ncols and pd.notna(df.iat[r, c])) else "" for c in range(min(12, ncols))]
+                    s0 = sval(r, 0)
+
+                    # ---- product header: "起訖品號：<code>" (name usually in col D)
+                    if isinstance(s0, str) and s0.startswith("起訖品號："):
+                        current_code = s0.replace("起訖品號：", "").strip().upper()
+                        # prefer same-row col D; else look forwards
+                        maybe_name = sval(r, 3)
+                        current_name = maybe_name if maybe_name else seek_name_forward(r)
+                        in_grid = False
+                        header_idx_tuple = None
+                        continue
+
+                    # ---- detail grid header (robust detection)
+                    if looks_like_header(row_cells):
+                        in_grid = True
+                        header_idx_tuple = find_indices([str(x).strip() for x in row_cells])
+                        continue
+
+                    if not in_grid or not current_code or header_idx_tuple is None:
+                        continue
+
+                    # ---- subtotal/other non-data lines: skip (do NOT break the sheet scan)
+                    joined = "|".join([str(c).strip() for c in row_cells])
+                    if any(tag in joined for tag in ("合計", "小計")):
+                        continue
+
+                    # ---- detail row using detected indices
+                    date_idx, doc_idx, cust_code_idx, cust_name_idx, qty_idx = header_idx_tuple
+                    date_cell = df.iat[r, date_idx] if date_idx < ncols else None
+                    doc_cell  = sval(r, doc_idx) if doc_idx < ncols else ""
+                    cc_cell   = sval(r, cust_code_idx) if cust_code_idx < ncols else ""
+                    cname_cell= sval(r, cust_name_idx) if cust_name_idx < ncols else ""
+
+                    date_ymd  = roc_date(date_cell, strict=True, fallback=True)  # 114/07/31 -> 20250731, else None
+                    if not date_ymd:
+                        # not a detail row (blank, text, footer, next product header, etc.)
+                        continue
+
+                    # quantity: first try qty_idx; else scan a few cols to the right of name
+                    qty_val = None
+                    if qty_idx < ncols:
+                        qty_val = pd.to_numeric(df.iat[r, qty_idx], errors="coerce")
+                    if (qty_val is None) or pd.isna(qty_val):
+                        for c in range(min(ncols, cust_name_idx + 1), min(ncols, cust_name_idx + 4)):
+                            qv = pd.to_numeric(df.iat[r, c], errors="coerce")
+                            if pd.notna(qv):
+                                qty_val = qv
+                                break
+
+                    if qty_val is None or float(qty_val) == 0:
+                        continue
+
+                    recs.append({
+                        "Sheet": sheet_name,
+                        "Row": r,
+                        "Date": date_ymd,
+                        "DocumentNo": doc_cell,
+                        "CustomerCode_ext": cc_cell,
+                        "CustomerName": cname_cell,
+                        "ProductCode": current_code,
+                        "ProductName": current_name,
+                        "Quantity": int(float(qty_val)),
+                    })
+
+                return pd.DataFrame(recs)
+
+            # --- Parse all sheets with logging, guard against empty concat
+            frames = []
+            parse_log = []
+            for s in sheets:
+                try:
+                    d = extract_sheet(s)
+                    n = 0 if d is None else len(d)
+                    if n:
+                        frames.append(d)
+                    parse_log.append(f"{s}: {n} rows")
+                except Exception as e:
+                    parse_log.append(f"{s}: ERROR → {e}")
+
+        if not frames:
+            st.error("No valid rows found in any sheet.\n\nParse summary:\n" + "\n".join(parse_log))
+            st.stop()
+
+        df_all = pd.concat(frames, ignore_index=True)
+
+        # Combine duplicates within the same doc/customer/product/date
+        group_keys = ["Date", "DocumentNo", "CustomerCode_ext", "CustomerName", "ProductCode", "ProductName"]
+        df_all = df_all.groupby(group_keys, as_index=False)["Quantity"].sum()
+
+        # =============== 2) Mappings using Composite Keys ===============
+        mapping_index = get_mapping_index(mapping_file)
+
+        # Customer mapping
+        df_all["CustomerCode_norm"] = df_all["CustomerCode_ext"].map(norm_code)
+        df_all["CustomerCode"] = mapping_index.map_customer(df_all['CustomerCode_norm'], '30010008').fillna("")
+
+        # SKU mapping
+        df_all["ProductCode_norm"] = df_all["ProductCode"].str.strip().str.upper()
+        df_all["PRT_Product_Code"] = mapping_index.map_sku(df_all['ProductCode_norm'], '30010008')
+
+        # =============== 3) Assemble final output (preserve order) ===============
+        df_all = df_all.sort_values(["Date", "DocumentNo"]).reset_index(drop=True)
+
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30010008",
+            "GroupName": "利多吉",
+            "CustomerCode": df_all["CustomerCode"],
+            "CustomerName": df_all["CustomerName"],
+            "Date": df_all["Date"],
+            "PRT_Product_Code": df_all["PRT_Product_Code"],
+            "ProductCode": df_all["ProductCode_norm"],
+            "ProductName": df_all["ProductName"],
+            "Quantity": df_all["Quantity"].astype(int),
+            "DocumentNo": df_all["DocumentNo"],
+        })
+
+        # ---- UI
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(final.head(30))
+
+        with st.expander("🔎 Parse summary (per sheet)"):
+            st.code("\n".join(parse_log))
+
+        # Export (no headers, no index)
+        out_name = "30010008_利多吉_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final), file_name=out_name, mime=XLSX_MIME)
@@ -0,0 +1,76 @@
+"""30010010 酒倉盛豐行."""
+import re
+
+import pandas as pd
+
+from t2ws.blocks import BlockLayout, Header, parse_blocks
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import read_sheet
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xlsx"], key="sakakura_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xlsx"], key="sakakura_mapping")
+
+    if raw_data_file and mapping_file:
+        raw_df = read_sheet(raw_data_file, 0, header=None)
+        # Extract date from cell A5
+        date_string = str(raw_df.iloc[4, 0])
+        match = re.search(r'至\s*(\d{3}/\d{2}/\d{2})', date_string)
+        if match:
+            roc_date = match.group(1)
+            year, month, day = map(int, roc_date.split('/'))
+            final_date = f"{year + 1911}{month:02d}{day:02d}"
+        else:
+            final_date = None
+
+        # "貨品編號:<code> 貨品名稱:<name>" opens a product block; 小計 rows are skipped
+        layout = BlockLayout(
+            headers=(
+                Header(0, r"(?s)^(?=.*貨品編號)(?=.*貨品名稱)", r"貨品編號[:：](?P<product_code>[A-Z0-9\-]+)\s+貨品名稱[:：](?P<product_name>.+)"),
+            ),
+            fields={
+                "Customer Code": lambda c: c.text(0),
+                "Customer Name": lambda c: c.text(1),
+                "Quantity": lambda c: c.value(3),
+            },
+            detail=lambda c: (c.text(0) != "") & (c.text(1) != "") & c.is_number(3),
+            required=("product_code",),
+            skip_markers=("小計",),
+            skip_columns=(0, 1),
+        )
+        blocks = parse_blocks(raw_df, layout)
+
+        df_cleaned = pd.DataFrame({
+            "Customer Code": blocks["Customer Code"],
+            "Customer Name": blocks["Customer Name"],
+            "Date": final_date,
+            "Product Code": blocks["product_code"],
+            "Product Name": blocks["product_name"].astype(object).str.strip(),
+            "Quantity": blocks["Quantity"].map(int),
+        }, columns=[
+            "Customer Code", "Customer Name", "Date",
+            "Product Code", "Product Name", "Quantity"
+        ])
+
+        mapping_index = get_mapping_index(mapping_file)
+
+        mapped_customer = mapping_index.map_customer(df_cleaned['Customer Code'], '30010010', typed=True)
+        df_cleaned["Customer Code"] = mapped_customer.astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+
+        mapped_sku = mapping_index.map_sku(df_cleaned['Product Code'], '30010010', typed=True)
+
+        product_code_index = df_cleaned.columns.get_loc("Product Code")
+        df_cleaned.insert(product_code_index, "PRT Product Code", mapped_sku.astype(str).str.strip())
+
+        df_cleaned.insert(0, "Column1", "INV")
+        df_cleaned.insert(1, "Column2", "U")
+        df_cleaned.insert(2, "Column3", "30010010")
+        df_cleaned.insert(3, "Column4", "酒倉 ON")
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_cleaned)
+
+        output_filename = "30010010 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_cleaned), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,115 @@
+"""30010017 正興(振興)."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import read_sheet
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="zhengxing_raw")
+    mapping_file = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="zhengxing_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # --- Load raw (Sheet4) ---
+        df_raw = read_sheet(raw_data_file, "Sheet4", header=None)
+
+        def to_int(x):
+            try:
+                if pd.isna(x): return 0
+                return int(float(str(x).strip()))
+            except:
+                return 0
+
+        records = []
+        current_product_code = None
+        current_product_name = None
+        doc_date = None  # YYYYMMDD (Gregorian)
+
+        for i in range(len(df_raw)):
+            row = df_raw.iloc[i]
+            c0 = str(row[0]).strip() if pd.notna(row[0]) else ""
+            c1 = str(row[1]).strip() if pd.notna(row[1]) else ""
+            c2 = row[2] if len(row) > 2 else None   # 銷貨數量
+            c3 = row[3] if len(row) > 3 else None   # 退貨數量
+            c4 = row[4] if len(row) > 4 else None   # 合計數量
+
+            # Banner date: "貨單日期: 114/07/28 至 114/07/31"  -> use right-side date
+            if "貨單日期" in c0 and "至" in c0:
+                m = re.search(r"至\s*([0-9]{3})/([0-9]{2})/([0-9]{2})", c0)
+                if m:
+                    y, mm, dd = map(int, m.groups())
+                    doc_date = f"{y + 1911:04d}{mm:02d}{dd:02d}"
+                continue
+
+            # Product header: "貨品編號:G0003  貨品名稱:BEEFEATER GIN"
+            if "貨品編號" in c0:
+                m = re.search(r"貨品編號[:：]\s*([A-Za-z0-9\-]+)", c0)
+                n = re.search(r"貨品名稱[:：]\s*(.+)", c0)
+                if m: current_product_code = m.group(1).strip()
+                if n: current_product_name = n.group(1).strip()
+                continue
+
+            # Skip subtotal/total lines
+            if c0.startswith("小計") or c0.startswith("合計"):
+                continue
+
+            # Data rows: 客戶編號 | 客戶簡稱 | 銷貨數量 | 退貨數量 | 合計數量
+            if c0 and c1 and (pd.notna(c2) or pd.notna(c3) or pd.notna(c4)):
+                sales = to_int(c2)
+                returns = to_int(c3)
+                qty = sales - returns
+                if qty == 0:
+                    # Fallback to 合計數量 if both sides are blank / 0
+                    qty = to_int(c4)
+                if qty == 0:
+                    continue
+
+                records.append([
+                    "INV", "U", "30010017", "正興(振興)",
+                    c0, c1, doc_date, None,                 # PRT_Product_Code (None if unmapped)
+                    current_product_code, current_product_name, qty
+                ])
+
+        if not records:
+            st.warning("No transactional rows were parsed. Please verify the sheet layout.")
+            st.stop()
+
+        df_parsed = pd.DataFrame(records, columns=[
+            "Type","Action","GroupCode","GroupName",
+            "CustomerCode","CustomerName","Date",
+            "PRT_Product_Code","ProductCode","ProductName","Quantity"
+        ])
+
+        # --- Load mappings (do not force replacements) ---
+        mapping_index = get_mapping_index(mapping_file)
+
+        # Customer mapping: replace with JDE when available; otherwise leave BLANK
+        df_parsed["CustomerCode"] = (
+            mapping_index.map_customer(df_parsed['CustomerCode'], '30010017')
+            .fillna("")
+            .astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+        )
+
+        # SKU mapping: fill PRT_Product_Code when available; else leave as NaN (do NOT force)
+        df_parsed["PRT_Product_Code"] = mapping_index.map_sku(df_parsed['ProductCode'], '30010017')
+
+        # --- De-duplicate exact duplicates (keep first) ---
+        dedup_keys = ["GroupCode","CustomerCode","Date","ProductCode","Quantity"]
+        df_final = df_parsed.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+
+        # Final order (no headers / no index on export)
+        df_final = df_final[[
+            "Type","Action","GroupCode","GroupName",
+            "CustomerCode","CustomerName","Date",
+            "PRT_Product_Code","ProductCode","ProductName","Quantity"
+        ]]
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_final)
+
+        # Export: no headers, no index
+        output_filename = "30010017 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_final), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,90 @@
+"""30010031 廣茂隆(八條)."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="gml_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="gml_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---- Load raw (single sheet like '0728-0731') ----
+        with open_workbook(raw_data_file) as xls:
+            sheet_name = xls.sheet_names[0]
+            df_raw = xls.parse(sheet_name, header=None)
+
+        # First row is header row
+        df_raw.columns = df_raw.iloc[0]
+        df_raw = df_raw.iloc[1:].reset_index(drop=True)
+
+        # Standardize columns
+        rename_map = {"客戶": "CustomerCode", "客戶名稱": "CustomerName",
+                      "品號": "ProductCode", "品名規格": "ProductName", "銷量": "Quantity"}
+        df = df_raw.rename(columns=rename_map)[["CustomerCode","CustomerName","ProductCode","ProductName","Quantity"]]
+
+        # Quantity -> int, drop zeros
+        def to_int(x):
+            try:
+                if pd.isna(x): return 0
+                return int(float(str(x).strip()))
+            except:
+                return 0
+
+        df["Quantity"] = df["Quantity"].apply(to_int)
+        df = df[df["Quantity"] != 0].copy()
+
+        # Normalize codes to strings (strip possible .0)
+        for col in ["CustomerCode","ProductCode"]:
+            df[col] = df[col].astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+
+        # ---- Date from sheet name: e.g. '0728-0731' -> use end date '0731' -> default year 2025 ----
+        m = re.match(r"^(\d{2})(\d{2})-(\d{2})(\d{2})$", sheet_name)
+        if m:
+            mm_end, dd_end = m.group(3), m.group(4)
+            year = "2025"  # adjust if you want a parameterized year
+            date_val = f"{year}{mm_end}{dd_end}"
+        else:
+            # fallback: keep blank if the sheet name isn’t in the expected pattern
+            date_val = None
+        df["Date"] = date_val
+
+        # ---- Load mappings (dtype=str), FILTERED to this wholesaler (30010031) ----
+        mapping_index = get_mapping_index(mapping_file)
+
+        # ---- Customer mapping (non-forced): use JDE when present, else keep original ----
+        df["CustomerCode"] = (
+            mapping_index.map_customer(df['CustomerCode'], '30010031')
+            .fillna("")  # <- key change: no fallback to external code
+            .astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+        )
+
+        # ---- SKU mapping (non-forced): fill PRT SKU when present, else leave NaN ----
+        df["PRT_Product_Code"] = mapping_index.map_sku(df['ProductCode'], '30010031')
+
+        # ---- Add metadata columns and order ----
+        df.insert(0, "Type", "INV")
+        df.insert(1, "Action", "U")
+        df.insert(2, "GroupCode", "30010031")
+        df.insert(3, "GroupName", "廣茂隆(八條)")
+
+        df_final = df[[
+            "Type","Action","GroupCode","GroupName",
+            "CustomerCode","CustomerName","Date",
+            "PRT_Product_Code","ProductCode","ProductName","Quantity"
+        ]].copy()
+
+        # ---- De-duplicate exact duplicates ----
+        dedup_keys = ["GroupCode","CustomerCode","Date","ProductCode","Quantity"]
+        df_final = df_final.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+
+        # ---- Preview + Export (NO headers, NO index) ----
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_final)
+
+        output_filename = "30010031 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_final), file_name=output_filename, mime=XLSX_MIME)
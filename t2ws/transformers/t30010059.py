@@ -0,0 +1,112 @@
+"""30010059 誠邦有限公司."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.keys import clean_code
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import read_sheet
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xlsx"], key="raw_30010059")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xlsx"], key="mapping_30010059")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------- read raw ----------
+        raw_df = read_sheet(raw_data_file, 0, header=None)
+
+        # Step 1: detect format A/B
+        offset = 0
+        for i in range(10, len(raw_df)):
+            row = raw_df.iloc[i]
+            col_a = str(row[0]).strip() if pd.notna(row[0]) else ""
+            col_b = str(row[1]).strip() if pd.notna(row[1]) else ""
+            if re.match(r"\d{4}/\d{2}/\d{2}|\d{3}/\d{2}/\d{2}", col_a):
+                offset = 0 if col_b.startswith("\u92b7") else 1  # 銷
+                break
+
+        # Step 2: extract transactions
+        data = []
+        current_product_code = None
+        current_product_name = None
+        found_first_product = False
+
+        for i in range(len(raw_df)):
+            row = raw_df.iloc[i]
+            col_a = str(row[0]).strip() if pd.notna(row[0]) else ""
+            col_b = str(row[1 - offset]).strip() if pd.notna(row[1 - offset]) else ""
+            col_c = str(row[2 - offset]).strip() if pd.notna(row[2 - offset]) else ""
+            col_d = str(row[3 - offset]).strip() if pd.notna(row[3 - offset]) else ""
+            col_e = row[4 - offset] if pd.notna(row[4 - offset]) else None
+
+            col_a_clean = col_a.replace('\u3000', ' ').replace('\xa0', ' ').strip()
+
+            # Match both 【】 and []
+            if "貨品編號:" in col_a_clean:
+                m = re.search(r"貨品編號:\s*[\[\【]([^\]\】]+)[\]\】]\s*(.+)", col_a_clean)
+                if m:
+                    current_product_code = m.group(1).strip()
+                    current_product_name = m.group(2).strip()
+                    found_first_product = True
+                continue
+
+            if not found_first_product:
+                continue
+
+            if ("合計" in col_a_clean) or ("小計" in col_a_clean):
+                continue
+
+            if col_c and isinstance(col_e, (int, float)) and current_product_code and current_product_name:
+                try:
+                    y, mth, d = map(int, col_a_clean.split("/"))
+                    if y < 1911:
+                        y += 1911
+                    gregorian_date = f"{y}{mth:02d}{d:02d}"
+                except Exception:
+                    gregorian_date = col_a_clean
+
+                data.append([
+                    col_c, col_d, gregorian_date,
+                    current_product_code, current_product_name,
+                    int(col_e)
+                ])
+
+        df_cleaned = pd.DataFrame(data, columns=[
+            "Customer Code", "Customer Name", "Date",
+            "Product Code", "Product Name", "Quantity"
+        ])
+
+        # ---------- load mappings ----------
+        mapping_index = get_mapping_index(mapping_file)
+
+        # ✅ Customer mapping using Composite Key (Customer + Customer_No) - filter for 30010059 only
+        df_cleaned["Customer Code"] = clean_code(mapping_index.map_customer(df_cleaned['Customer Code'], '30010059'))
+
+        # ✅ SKU mapping using Composite Key (Product + Customer_Code) - filter for 30010059 only
+        product_index = df_cleaned.columns.get_loc("Product Code")
+        df_cleaned.insert(
+            product_index,
+            "PRT Product Code",
+            clean_code(mapping_index.map_sku(df_cleaned['Product Code'], '30010059'))
+        )
+
+        # ---------- fixed columns + final ----------
+        fixed_df = pd.DataFrame({
+            "Column1": ["INV"] * len(df_cleaned),
+            "Column2": ["U"] * len(df_cleaned),
+            "Column3": ["30010059"] * len(df_cleaned),
+            "Column4": ["誠邦有限公司"] * len(df_cleaned)
+        })
+
+        df_final = pd.concat([fixed_df, df_cleaned], axis=1)
+
+        # Final safety: ensure Customer Code is text and clean
+        df_final["Customer Code"] = clean_code(df_final["Customer Code"]).astype("string")
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_final)
+
+        output_filename = "processed_30010059.xlsx"
+        st.download_button(label="📅 Download Processed File", data=xlsx_export(df_final), file_name=output_filename, mime=XLSX_MIME)
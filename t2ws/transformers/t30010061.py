@@ -0,0 +1,73 @@
+"""30010061 向日葵."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import read_sheet
+
+
+def render(st):
+    uploaded_file = st.file_uploader("Upload Raw Sales Data", type=["xlsx"], key="sunflower_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xlsx"], key="sunflower_mapping")
+
+    if uploaded_file is not None and mapping_file is not None:
+        df = read_sheet(uploaded_file, header=None)
+
+        # Create an empty list to store the extracted data
+        data = []
+
+        # Initialize variables to hold the current customer name, code, and date
+        current_customer = None
+        current_customer_code = None
+        current_date = None
+
+        # Start processing from row 8 (index 7)
+        for i in range(7, len(df)):
+            row = df.iloc[i]
+
+            if isinstance(row[0], str) and '客戶名稱' in row[0]:
+                cleaned_text = re.sub(r'[\u200b\ufeff]', '', row[0]).strip()
+                match = re.search(r'客戶編號[:：]\s*([\d\-]+).*客戶名稱[:：]\s*(.*)', cleaned_text)
+                if match:
+                    current_customer_code = match.group(1).strip()
+                    current_customer = match.group(2).strip()
+
+            if isinstance(row[0], str) and re.match(r'\d{3}/\d{2}/\d{2}', row[0]):
+                year, month, day = map(int, row[0].split('/'))
+                current_date = f'{year + 1911}{month:02}{day:02}'
+
+            if pd.notna(row[1]):
+                product_code = row[1]
+                product_name = row[2]
+                quantity = row[3]
+
+                data.append([current_customer_code, current_customer, current_date, product_code, product_name, quantity])
+
+        result_df = pd.DataFrame(data, columns=['Customer Code', 'Customer Name', 'Date', 'Product Code', 'Product Name', 'Quantity'])
+
+        # Add fixed columns
+        result_df.insert(0, 'Column1', 'INV')
+        result_df.insert(1, 'Column2', 'U')
+        result_df.insert(2, 'Column3', '30010061')
+        result_df.insert(3, 'Column4', '向日葵')
+
+        # --- ✅ CUSTOMER MAPPING ---
+        mapping_index = get_mapping_index(mapping_file)
+
+        mapped_customer = mapping_index.map_customer(result_df['Customer Code'], '30010061', typed=True)
+        result_df["Customer Code"] = mapped_customer.astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+
+        # --- ✅ SKU MAPPING ---
+        mapped_sku = mapping_index.map_sku(result_df['Product Code'], '30010061', typed=True)
+
+        product_index = result_df.columns.get_loc("Product Code")
+        result_df.insert(product_index, "PRT Product Code", mapped_sku.astype(str).str.strip())
+
+        # Preview data in Streamlit
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(result_df)
+
+        output_filename = "30010061 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(result_df), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,185 @@
+"""30010154 亨玖."""
+
+import pandas as pd
+
+from t2ws.dates import roc_period_end
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.keys import normalize_key
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders: allow both .xls and .xlsx
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls","xlsx"], key="hengjiu_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls","xlsx"], key="hengjiu_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # -------- Helpers --------
+        def find_period_end_ymd(frame: pd.DataFrame) -> str | None:
+            """Look for '114.7' style period and return end-of-month YYYYMMDD."""
+            # top-left 20x8 block, scanned row by row
+            cells = pd.Series(frame.iloc[:20, :8].to_numpy().ravel(), dtype=object)
+            ends = roc_period_end(cells).dropna()
+            return ends.iat[0] if len(ends) else None
+
+        def unique_only_map(df, key_col, val_col, normalize=lambda s: s, group_col=None):
+            """Build key->val map taking the first value for each key."""
+            if group_col:
+                if group_col in df.columns:
+                    tmp = df[[key_col, val_col, group_col]].dropna().copy()
+                    tmp["key"] = tmp[key_col].astype(str).map(normalize) + '|' + tmp[group_col].astype(str)
+                else:
+                    tmp = df[[key_col, val_col]].dropna().copy()
+                    tmp["key"] = tmp[key_col].astype(str).map(normalize) + '|' + str(group_col)
+            else:
+                tmp = df[[key_col, val_col]].dropna().copy()
+                tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            tmp = tmp.drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0", "")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        # -------- 1) Parse ALL sheets --------
+        with open_workbook(raw_data_file) as xls:
+            sheets = xls.sheet_names
+
+            def extract_sheet(sheet_name: str) -> pd.DataFrame:
+                df = xls.parse(sheet_name, header=None)
+                if df.empty:
+                    return pd.DataFrame()
+
+                # find period end date (YYYYMMDD)
+                period_date = find_period_end_ymd(df)
+
+                # locate header row (產品編號, 發票品名, 客戶/廠商簡稱, 客戶/廠商編號, 數量)
+                header_row = None
+                for r in range(len(df)):
+                    row = [str(df.iat[r, c]).strip() if (c < df.shape[1] and pd.notna(df.iat[r, c])) else "" for c in range(df.shape[1])]
+                    if ("產品編號" in row and "發票品名" in row and "客戶/廠商編號" in row and "數量" in row):
+                        header_row = r
+                        break
+                if header_row is None:
+                    return pd.DataFrame()
+
+                recs = []
+                current_prod_code = None
+                current_prod_name = None
+
+                for r in range(header_row + 1, len(df)):
+                    prod_code = df.iat[r, 0] if df.shape[1] > 0 else None
+                    prod_name = df.iat[r, 1] if df.shape[1] > 1 else None
+                    cust_name = df.iat[r, 2] if df.shape[1] > 2 else None
+                    cust_code = df.iat[r, 3] if df.shape[1] > 3 else None
+                    qty_cell  = df.iat[r, 4] if df.shape[1] > 4 else None
+
+                    # New product header row
+                    if isinstance(prod_code, str) and prod_code.strip():
+                        current_prod_code = norm_sku(prod_code)
+                        current_prod_name = str(prod_name).strip() if isinstance(prod_name, str) else ""
+                        # same-row customer?
+                        if isinstance(cust_name, str) and cust_name.strip():
+                            q = pd.to_numeric(qty_cell, errors="coerce")
+                            if pd.notna(q) and q != 0:
+                                recs.append({
+                                    "Date": period_date,
+                                    "CustomerCode_ext": str(cust_code).strip() if cust_code is not None else "",
+                                    "CustomerName": cust_name.strip(),
+                                    "ProductCode": current_prod_code,
+                                    "ProductName": current_prod_name,
+                                    "Quantity": int(q),
+                                })
+                        continue
+
+                    # Detail row under current product
+                    if current_prod_code and isinstance(cust_name, str) and cust_name.strip():
+                        q = pd.to_numeric(qty_cell, errors="coerce")
+                        if pd.notna(q) and q != 0:
+                            recs.append({
+                                "Date": period_date,
+                                "CustomerCode_ext": str(cust_code).strip() if cust_code is not None else "",
+                                "CustomerName": cust_name.strip(),
+                                "ProductCode": current_prod_code,
+                                "ProductName": current_prod_name,
+                                "Quantity": int(q),
+                            })
+
+                return pd.DataFrame(recs)
+
+            frames, parse_log = [], []
+            for s in sheets:
+                try:
+                    d = extract_sheet(s)
+                    n = 0 if d is None else len(d)
+                    if n:
+                        frames.append(d)
+                    parse_log.append(f"{s}: {n} rows")
+                except Exception as e:
+                    parse_log.append(f"{s}: ERROR → {e}")
+
+        if not frames:
+            st.error("No valid rows found in any sheet.\n\nParse summary:\n" + "\n".join(parse_log))
+            st.stop()
+
+        df_all = pd.concat(frames, ignore_index=True)
+
+        # -------- 2) Mappings (unique-only; prefer filtered 30010154, then global) --------
+        mapping_index = get_mapping_index(mapping_file)
+        cust_map = mapping_index.customer.copy()
+        sku_map  = mapping_index.sku.copy()
+
+        cust_map["ASI_CRM_Mapping_Cust_No__c"] = normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"])
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"])
+
+        cust_f = cust_map[normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"]) == "30010154"].copy()
+        sku_f  = sku_map[normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"]) == "30010154"].copy()
+
+        cust_f_map = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code, "ASI_CRM_Mapping_Cust_No__c")
+        cust_g_map = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code, "ASI_CRM_Mapping_Cust_No__c")
+        sku_f_map  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",           norm_sku, "ASI_CRM_Mapping_Cust_Code__c")
+        sku_g_map  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",           norm_sku, "ASI_CRM_Mapping_Cust_Code__c")
+
+        df_all["CustomerCode_norm"] = df_all["CustomerCode_ext"].map(norm_code)
+        df_all["Cust_CompositeKey"] = df_all["CustomerCode_norm"] + '|' + '30010154'
+        df_all["CustomerCode"] = df_all["Cust_CompositeKey"].map(cust_f_map).fillna(
+                                  df_all["Cust_CompositeKey"].map(cust_g_map)).fillna("")  # leave blank if unmapped
+
+        df_all["ProductCode_norm"] = df_all["ProductCode"].map(norm_sku)
+        df_all["Prod_CompositeKey"] = df_all["ProductCode_norm"] + '|' + '30010154'
+        df_all["PRT_Product_Code"] = df_all["Prod_CompositeKey"].map(sku_f_map).fillna(
+                                      df_all["Prod_CompositeKey"].map(sku_g_map)).fillna("")
+
+        # -------- 3) Assemble final + aggregate duplicates --------
+        final_fixed = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30010154",
+            "GroupName": "亨玖",
+            "CustomerCode": df_all["CustomerCode"],
+            "CustomerName": df_all["CustomerName"],
+            "Date": df_all["Date"],
+            "PRT_Product_Code": df_all["PRT_Product_Code"],
+            "ProductCode": df_all["ProductCode_norm"],
+            "ProductName": df_all["ProductName"],
+            "Quantity": df_all["Quantity"].astype(int),
+        })
+
+        final_fixed = final_fixed.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "CustomerCode","CustomerName","Date",
+             "PRT_Product_Code","ProductCode","ProductName"],
+            as_index=False
+        )["Quantity"].sum()
+
+        # -------- UI --------
+        st.write("✅ Processed Data Preview (first 25 rows):")
+        st.dataframe(final_fixed.head(25))
+
+        with st.expander("🔎 Parse summary (per sheet)"):
+            st.code("\n".join(parse_log))
+
+        # Download (no headers, no index)
+        out_name = "30010154_亨玖_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final_fixed), file_name=out_name, mime=XLSX_MIME)
@@ -0,0 +1,112 @@
+"""30010176 振泰 ON."""
+import pandas as pd
+
+from t2ws.blocks import BlockLayout, Header, parse_blocks
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.results import cached_frame
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xls"], key="zhen_tai_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xlsx"], key="zhen_tai_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        def parse_and_map() -> pd.DataFrame:
+            # "貨品編號:<code> 貨品名稱:<name>" opens a product block; rows below are
+            # customer code | customer name | quantity until the next product
+            layout = BlockLayout(
+                headers=(
+                    Header(0, r"^貨品編號:", r"(?s)^貨品編號:\s*(?P<product_code>.*?)\s*(?:貨品名稱:\s*(?P<product_name>.*?)\s*)?$"),
+                ),
+                fields={
+                    "Customer Code": lambda c: c.text(0, na="nan"),
+                    "Customer Name": lambda c: c.text(1),
+                    "Quantity": lambda c: c.value(2),
+                },
+                detail=lambda c: (c.text(0, na="nan") != "") & c.is_number(2) & (c.value(2) != 0),
+                required=("product_code",),
+                skip_markers=("小計",),
+            )
+
+            def extract_from_date_sheets(file):
+                with open_workbook(file) as xls:
+                    all_data = []
+                    sheet_dates = {}
+
+                    for sheet_name in xls.sheet_names:
+                        df = xls.parse(sheet_name, header=None)
+
+                        # ✅ Skip sheet if A5 is missing
+                        if df.shape[0] <= 4 or pd.isna(df.iloc[4, 0]):
+                            continue
+
+                        # Extract date from A5
+                        raw_date_cell = str(df.iloc[4, 0])
+
+                        if "至" in raw_date_cell:
+                            raw_date = raw_date_cell.split("至")[1].strip()
+                            try:
+                                parts = raw_date.split("/")
+                                year = int(parts[0]) + 1911
+                                month = int(parts[1])
+                                day = int(parts[2])
+                                formatted_date = f"{year:04d}{month:02d}{day:02d}"
+                            except:
+                                formatted_date = None
+                        else:
+                            formatted_date = None
+                        sheet_dates[sheet_name] = formatted_date
+
+                        block = parse_blocks(df, layout).rename(columns={"product_code": "Product Code", "product_name": "Product Name"})
+                        if not block.empty:
+                            block.insert(0, "Sheet", sheet_name)
+                            block["Date"] = formatted_date
+                            all_data.append(block[["Sheet", "Customer Code", "Customer Name", "Date", "Product Code", "Product Name", "Quantity"]])
+
+                return pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
+
+            df = extract_from_date_sheets(raw_data_file)
+
+            # Mapping setup
+            mapping_index = get_mapping_index(mapping_file)
+
+            # Filter customer mapping
+            mapped_customer = mapping_index.map_customer(df['Customer Code'], '30010176', typed=True)
+            df["Customer Code"] = mapped_customer.astype(str).str.replace(r"\.0$", "", regex=True)
+
+            mapped_sku = mapping_index.map_sku(df['Product Code'], '30010176', typed=True)
+            df.insert(df.columns.get_loc("Product Code"), "PRT Product Code", mapped_sku.astype(str).str.strip())
+
+            # Add 4 fixed columns
+            df.insert(1, "Col1", "INV")
+            df.insert(2, "Col2", "U")
+            df.insert(3, "Col3", "30010176")
+            df.insert(4, "Col4", "振泰 ON")
+            return df
+
+        # Month filter clicks rerun the script; reuse the parsed + mapped frame for this raw/mapping pair
+        df = cached_frame("30010176", raw_data_file, mapping_file, parse_and_map)
+
+        # Optional: Toggle by Month (📅 grouped by available months)
+        available_months = sorted(set([d[:6] for d in df["Date"].dropna().astype(str)]))
+        month_filter = st.radio("📅 Filter by Month:", ["All"] + available_months)
+
+        if month_filter != "All":
+            df = df[df["Date"].astype(str).str.startswith(month_filter)]
+
+        # Final column order without 'Sheet'
+        df = df[[
+            "Col1", "Col2", "Col3", "Col4",
+            "Customer Code", "Customer Name", "Date",
+            "PRT Product Code", "Product Code", "Product Name", "Quantity"
+        ]]
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df)
+
+        # Export to Excel (remove first row, no headers)
+        output_filename = "30010176_transformation.xlsx"
+        df_export = df.copy()
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_export), file_name=output_filename, mime=XLSX_MIME)
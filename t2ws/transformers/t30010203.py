@@ -0,0 +1,62 @@
+"""30010203 宏酒樽 (日)."""
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xlsx"], key="new_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xlsx"], key="new_mapping")
+    
+    if raw_data_file is not None and mapping_file is not None:
+        # Find the sheet that contains "日" in the name
+        with open_workbook(raw_data_file) as xls:
+            sheet_name = next((sheet for sheet in xls.sheet_names if "日" in sheet), None)
+            df_raw = xls.parse(sheet_name) if sheet_name else None
+
+        if sheet_name:
+            mapping_index = get_mapping_index(mapping_file)
+            
+            df_transformed = df_raw.iloc[:, [1, 2, 3, 4, 5, 6]].copy()
+            df_transformed.columns = ["Date", "Outlet Code", "Outlet Name", "Product Code", "Product Name", "Number of Bottles"]
+            
+            # Add fixed columns
+            df_transformed.insert(0, "Column1", "INV")
+            df_transformed.insert(1, "Column2", "U")
+            df_transformed.insert(2, "Column3", "30010203")
+            df_transformed.insert(3, "Column4", "宏酒樽 OFF")
+            
+            df_transformed["Date"] = pd.to_datetime(df_transformed["Date"]).dt.strftime('%Y%m%d')
+            
+            # ✅ Map product codes using Composite Key (Product + Customer)
+            # Clean and normalize SKU columns
+            df_transformed["Product Code"] = df_transformed["Product Code"].astype(str).str.strip().str.upper()
+            df_transformed["SKU Code"] = mapping_index.map_sku(df_transformed["Product Code"], "30010203", typed=True)
+            
+            # ✅ Fix Outlet Code Mapping Issue ✅
+            df_transformed["Outlet Code"] = df_transformed["Outlet Code"].astype(str)
+
+            # Optional replacement only if values are dates (skip if not needed)
+            df_transformed["Outlet Code"] = df_transformed["Outlet Code"].replace({
+                "2024-05-01 00:00:00": "5月1日",
+                "2024-07-01 00:00:00": "7月1日",
+                "2024-07-02 00:00:00": "07-02"
+            })
+            
+            # ✅ Customer Mapping using Composite Key (Customer + Customer)
+            df_transformed["PRT Customer Code"] = mapping_index.map_customer(df_transformed["Outlet Code"], "30010203", typed=True)
+            df_transformed.drop(columns=["Outlet Code"], inplace=True)
+            
+            # Reorder the columns
+            column_order = ["Column1", "Column2", "Column3", "Column4", "PRT Customer Code", "Outlet Name", "Date", "SKU Code", "Product Code", "Product Name", "Number of Bottles"]
+            df_transformed = df_transformed[column_order]
+
+            # Preview data in Streamlit
+            st.write("✅ Processed Data Preview:")
+            st.dataframe(df_transformed)
+            
+            # Export without headers
+            output_filename = "30010203 transformation.xlsx"
+            st.download_button(label="📥 Download Processed File", data=xlsx_export(df_transformed), file_name=output_filename, mime=XLSX_MIME)
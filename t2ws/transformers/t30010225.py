@@ -0,0 +1,178 @@
+"""30010225 連大立."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders (allow .xls / .xlsx) ----
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls", "xlsx"], key="liandali_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls", "xlsx"], key="liandali_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        with open_workbook(raw_data_file) as xls:
+            sheet_name = None
+            for sn in xls.sheet_names:
+                if str(sn).strip() == "4":
+                    sheet_name = sn
+                    break
+            if sheet_name is None:
+                sheet_name = xls.sheet_names[0]
+
+            df0 = xls.parse(sheet_name, header=None)
+
+        def parse_end_date_from_banner(df):
+            for r in range(min(15, len(df))):
+                for c in range(min(6, df.shape[1])):
+                    txt = str(df.iat[r, c]).strip() if pd.notna(df.iat[r, c]) else ""
+                    m = re.search(r'(\d{2,3})/(\d{2})/(\d{2})\s*-\s*(\d{2,3})/(\d{2})/(\d{2})', txt)
+                    if m:
+                        y2, mm2, dd2 = m.group(4), m.group(5), m.group(6)
+                        yy = int(y2)
+                        if len(y2) == 3:
+                            year = yy + 1911
+                        else:
+                            year = 2000 + yy
+                        return f"{year:04d}{int(mm2):02d}{int(dd2):02d}"
+                t0 = str(df.iat[r, 0]).strip() if pd.notna(df.iat[r, 0]) else ""
+                t1 = str(df.iat[r, 1]).strip() if pd.notna(df.iat[r, 1]) else ""
+                joined = f"{t0} {t1}".strip()
+                m = re.search(r'(\d{2,3})/(\d{2})/(\d{2})\s*-\s*(\d{2,3})/(\d{2})/(\d{2})', joined)
+                if m:
+                    y2, mm2, dd2 = m.group(4), m.group(5), m.group(6)
+                    yy = int(y2)
+                    if len(y2) == 3:
+                        year = yy + 1911
+                    else:
+                        year = 2000 + yy
+                    return f"{year:04d}{int(mm2):02d}{int(dd2):02d}"
+            return ""
+
+        date_end = parse_end_date_from_banner(df0)
+
+        def parse_pair_to_bottles(s):
+            s = str(s).strip()
+            m = re.match(r'(\d+)\s*/\s*(\d+)', s)
+            if not m:
+                return 0
+            return int(m.group(2))
+
+        records = []
+        current_prod_code = ""
+        current_prod_name = ""
+
+        for r in range(len(df0)):
+            c0  = str(df0.iat[r, 0]).strip()  if pd.notna(df0.iat[r, 0]) else ""
+            c1  = str(df0.iat[r, 1]).strip()  if pd.notna(df0.iat[r, 1]) else ""
+            c2  = str(df0.iat[r, 2]).strip()  if pd.notna(df0.iat[r, 2]) else ""
+            c7  = str(df0.iat[r, 7]).strip()  if pd.notna(df0.iat[r, 7]) else ""
+            c8  = str(df0.iat[r, 8]).strip()  if pd.notna(df0.iat[r, 8]) else ""
+            c9  = str(df0.iat[r, 9]).strip()  if pd.notna(df0.iat[r, 9]) else ""
+            c10 = str(df0.iat[r,10]).strip()  if pd.notna(df0.iat[r,10]) else ""
+
+            if re.match(r'^\d{6,}$', c0) and c1 and c2:
+                current_prod_code = c0
+                current_prod_name = c1
+                continue
+
+            if c7 and c8 and ("/" in c9 or "/" in c10):
+                sales_bottles   = parse_pair_to_bottles(c9) if "/" in c9 else 0
+                returns_bottles = parse_pair_to_bottles(c10) if "/" in c10 else 0
+                net = sales_bottles - returns_bottles
+                if net == 0:
+                    continue
+                records.append({
+                    "CustomerCode_ext": c7,
+                    "CustomerName": c8,
+                    "Date": date_end,
+                    "ProductCode": current_prod_code,
+                    "ProductName": current_prod_name,
+                    "Quantity": int(net)
+                })
+
+        raw_df = pd.DataFrame(records)
+        if raw_df.empty:
+            st.error("No transactional rows parsed from the raw file.")
+            st.stop()
+
+        mapping_index = get_mapping_index(mapping_file)
+
+        cust_map = mapping_index.customer.copy()
+
+        sku_map  = mapping_index.sku.copy()
+
+        cust_map.columns = cust_map.columns.map(str)
+        sku_map.columns  = sku_map.columns.map(str)
+
+        group_code = "30010225"
+        group_name = "連大立"
+
+        cust_map["ASI_CRM_Mapping_Cust_No__c"]   = cust_map["ASI_CRM_Mapping_Cust_No__c"].astype(str).str.replace(r"\.0$","", regex=True)
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = sku_map["ASI_CRM_Mapping_Cust_Code__c"].astype(str).str.replace(r"\.0$","", regex=True)
+
+        cust_f = cust_map[cust_map["ASI_CRM_Mapping_Cust_No__c"] == group_code].copy()
+        sku_f  = sku_map[ sku_map["ASI_CRM_Mapping_Cust_Code__c"] == group_code].copy()
+
+        def unique_only_map(dfm, key_col, val_col, normalize=lambda s: s):
+            tmp = dfm[[key_col, val_col]].dropna().copy()
+            tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            counts = tmp.groupby("key")["val"].nunique().reset_index(name="n")
+            uniq = set(counts[counts["n"] == 1]["key"])
+            tmp = tmp[tmp["key"].isin(uniq)].drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+        def norm_code(s): return str(s).strip().upper().replace(" ", "").replace(".0","")
+        def norm_sku(s):  return str(s).strip().upper()
+
+        m_cust_f = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_cust_g = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_sku_f  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+        m_sku_g  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+
+        df1 = raw_df.copy()
+        df1["CustomerCode_norm"] = df1["CustomerCode_ext"].map(norm_code)
+        df1["Customer Code"] = df1["CustomerCode_norm"].map(m_cust_f).fillna(
+                                  df1["CustomerCode_norm"].map(m_cust_g)
+                               ).fillna("")
+
+        df1["ProductCode_norm"] = df1["ProductCode"].map(norm_sku)
+        df1["PRT Product Code"] = df1["ProductCode_norm"].map(m_sku_f).fillna(
+                                     df1["ProductCode_norm"].map(m_sku_g)
+                                  ).fillna("")
+
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": group_code,
+            "GroupName": group_name,
+            "Customer Code": df1["Customer Code"],
+            "Customer Name": df1["CustomerName"],
+            "Date": df1["Date"],
+            "PRT Product Code": df1["PRT Product Code"],
+            "Product Code": df1["ProductCode_norm"],
+            "Product Name": df1["ProductName"],
+            "Number of Bottles": df1["Quantity"].astype(int)
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "Customer Code","Customer Name","Date",
+             "PRT Product Code","Product Code","Product Name"],
+            as_index=False
+        )["Number of Bottles"].sum().sort_values(
+            ["Date","Product Code","Customer Name"]
+        ).reset_index(drop=True)
+
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "Customer Code","Customer Name","Date",
+                       "PRT Product Code","Product Code","Product Name","Number of Bottles"]
+        out_name = "30010225_連大立_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
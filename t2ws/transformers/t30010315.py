@@ -0,0 +1,103 @@
+"""30010315 圳程."""
+import itertools
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xlsx"], key="zc_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xlsx"], key="zc_mapping")
+
+    if raw_data_file and mapping_file:
+        import openpyxl
+
+        # Streamed read-only: one row in memory plus a two-row look-ahead, whatever the sheet length
+        wb = openpyxl.load_workbook(raw_data_file, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            ws.reset_dimensions()  # exported reports often carry a stale <dimension>; read every row
+
+            report_date_raw = None
+            records = []
+            product_name = product_code = customer_name = customer_code = None
+
+            # columns B..E; `after` is None on the last two rows (nothing to look ahead to)
+            rows, ahead, after = itertools.tee(ws.iter_rows(min_col=2, max_col=5, values_only=True), 3)
+            next(ahead, None)
+            next(after, None)
+            next(after, None)
+            for row_no, (row, next_row, after_row) in enumerate(itertools.zip_longest(rows, ahead, after), start=1):
+                b = str(row[0]).strip() if row[0] else ""
+                c = str(row[1]).strip() if row[1] else ""
+                e = row[3] if row[3] else None
+
+                # Try B3, then B4 if B3 is empty
+                if row_no in (3, 4) and report_date_raw is None and row[0]:
+                    report_date_raw = b
+
+                if "(" in b and ")" in b:
+                    last_open = b.rfind("(")
+                    last_close = b.rfind(")")
+                    code = b[last_open + 1 : last_close]
+                    name = b[:last_open].strip()
+
+                    if after_row is not None and str(next_row[0]).strip() == "單據類別":
+                        customer_name = name
+                        customer_code = code
+                    else:
+                        product_name = name
+                        product_code = code
+
+                if b == "出貨單" and c and isinstance(e, (int, float)):
+                    records.append({
+                        "Customer Code": customer_code,
+                        "Customer Name": customer_name,
+                        "Product Code": product_code,
+                        "Product Name": product_name,
+                        "Quantity": int(e),
+                        "Document Number": c
+                    })
+        finally:
+            wb.close()
+
+        # Parse the date string if available
+        report_date = ""
+        report_date_raw = report_date_raw or ""
+        if "~" in report_date_raw:
+            right_date = report_date_raw.split("~")[-1].strip()
+            if len(right_date.split("/")) == 3:
+                y, m, d = right_date.split("/")
+                report_date = f"{int(y):04}{int(m):02}{int(d):02}"
+
+        df_transformed = pd.DataFrame(records)
+        df_transformed["Date"] = report_date
+        df_transformed.insert(0, "Column1", "INV")
+        df_transformed.insert(1, "Column2", "U")
+        df_transformed.insert(2, "Column3", "30010315")
+        df_transformed.insert(3, "Column4", "圳程有限公司")
+
+        # Load mappings
+        mapping_index = get_mapping_index(mapping_file)
+
+        # Customer mapping using Composite Key
+        mapped_customer = mapping_index.map_customer(df_transformed['Customer Code'], '30010315', typed=True)
+        df_transformed["Customer Code"] = mapped_customer.astype(str).str.replace(r"\.0$", "", regex=True)
+
+        # SKU mapping using Composite Key
+        mapped_sku = mapping_index.map_sku(df_transformed['Product Code'], '30010315', typed=True)
+
+        product_index = df_transformed.columns.get_loc("Product Code")
+        df_transformed.insert(product_index, "PRT Product Code", mapped_sku.astype(str).str.strip())
+
+        # Reorder for consistency
+        column_order = ["Column1", "Column2", "Column3", "Column4", "Customer Code", "Customer Name", "Date", "PRT Product Code", "Product Code", "Product Name", "Quantity", "Document Number"]
+        df_transformed = df_transformed[column_order]
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_transformed)
+
+        output_filename = "30010315_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_transformed), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,172 @@
+"""30010316 大倉捷."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders (allow .xls / .xlsx)
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls","xlsx"], key="dakangjie_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls","xlsx"], key="dakangjie_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # -------- Helpers --------
+        def extract_end_date(df: pd.DataFrame) -> str | None:
+            """
+            Find '貨單日期: 114/07/28 至 114/07/31' and return the right-hand date as YYYYMMDD.
+            """
+            for r in range(min(12, len(df))):
+                for c in range(min(6, df.shape[1])):
+                    s = str(df.iat[r, c]) if pd.notna(df.iat[r, c]) else ""
+                    m = re.search(r'貨單日期[:：]\s*(\d{3})/(\d{2})/(\d{2})\s*至\s*(\d{3})/(\d{2})/(\d{2})', s)
+                    if m:
+                        y = int(m.group(4)) + 1911
+                        mth = int(m.group(5))
+                        d = int(m.group(6))
+                        return f"{y:04d}{mth:02d}{d:02d}"
+            return None
+
+        def unique_only_map(df, key_col, val_col, normalize=lambda s: s):
+            tmp = df[[key_col, val_col]].dropna().copy()
+            tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            tmp = tmp.drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0", "")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        # -------- 1) Parse relevant sheets (the report is on 工作表2 in your sample) --------
+        with open_workbook(raw_data_file) as xls:
+            sheets = xls.sheet_names
+
+            def parse_sheet(sheet_name: str) -> pd.DataFrame:
+                df = xls.parse(sheet_name, header=None)
+                if df.empty:
+                    return pd.DataFrame()
+
+                date_ymd = extract_end_date(df)
+                if date_ymd is None:
+                    # Skip sheets with no date range (likely not the report)
+                    return pd.DataFrame()
+
+                recs = []
+                current_code = ""
+                current_name = ""
+
+                for r in range(len(df)):
+                    c0 = df.iat[r, 0] if df.shape[1] > 0 else None
+                    c1 = df.iat[r, 1] if df.shape[1] > 1 else None
+                    c2 = df.iat[r, 2] if df.shape[1] > 2 else None  # 銷貨數量
+                    c3 = df.iat[r, 3] if df.shape[1] > 3 else None  # 退貨數量
+                    c4 = df.iat[r, 4] if df.shape[1] > 4 else None  # 合計數量
+
+                    s0 = str(c0).strip() if pd.notna(c0) else ""
+
+                    # New product header line e.g. "貨品編號:B0008  貨品名稱:馬爹利(名仕) MARTELL"
+                    if s0.startswith("貨品編號:"):
+                        m = re.search(r'貨品編號[:：]\s*([A-Za-z0-9\-]+)\s+貨品名稱[:：]\s*(.+)', s0)
+                        if m:
+                            current_code = m.group(1).strip().upper()
+                            current_name = m.group(2).strip()
+                        else:
+                            # Fallback if formatting is odd
+                            parts = re.split(r'\s{2,}', s0.replace("貨品編號:", "").replace("貨品名稱:", " ").strip(), maxsplit=1)
+                            current_code = parts[0].strip().upper() if parts else ""
+                            current_name = parts[1].strip() if len(parts) > 1 else (str(c1).strip() if isinstance(c1, str) else "")
+                        continue
+
+                    if s0 in ("小計", "客戶編號", "總計"):
+                        continue
+
+                    # Customer detail line under the current product
+                    if current_code and s0 and re.match(r'^[A-Za-z0-9\-]+$', s0) and isinstance(c1, str):
+                        # Prefer '合計數量' if present; otherwise compute 銷貨 - 退貨
+                        qty = pd.to_numeric(c4, errors="coerce")
+                        if pd.isna(qty):
+                            sales = pd.to_numeric(c2, errors="coerce")
+                            returns = pd.to_numeric(c3, errors="coerce")
+                            sales = 0 if pd.isna(sales) else sales
+                            returns = 0 if pd.isna(returns) else returns
+                            qty = sales - returns
+                        if pd.notna(qty) and qty != 0:
+                            recs.append({
+                                "Date": date_ymd,
+                                "CustomerCode_ext": s0,
+                                "CustomerName": str(c1).strip(),
+                                "ProductCode": current_code,
+                                "ProductName": current_name,
+                                "Quantity": int(qty)
+                            })
+
+                return pd.DataFrame(recs)
+
+            frames, parse_log = [], []
+            for s in sheets:
+                try:
+                    t = parse_sheet(s)
+                    if not t.empty:
+                        frames.append(t)
+                    parse_log.append(f"{s}: {len(t)} rows")
+                except Exception as e:
+                    parse_log.append(f"{s}: ERROR → {e}")
+
+        if not frames:
+            st.error("No valid rows found.\n\nParse summary:\n" + "\n".join(parse_log))
+            st.stop()
+
+        df_all = pd.concat(frames, ignore_index=True)
+
+        # -------- 2) Mappings using Composite Keys --------
+        mapping_index = get_mapping_index(mapping_file)
+
+        # Customer mapping
+        df_all["CustomerCode_norm"] = df_all["CustomerCode_ext"].map(norm_code)
+        df_all["CustomerCode"] = mapping_index.map_customer(df_all['CustomerCode_norm'], '30010316').fillna("")
+
+        # SKU mapping
+        df_all["ProductCode_norm"] = df_all["ProductCode"].map(norm_sku)
+        df_all["PRT_Product_Code"] = mapping_index.map_sku(df_all['ProductCode_norm'], '30010316').fillna("")
+
+        # -------- 3) Assemble final + aggregate duplicates --------
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30010316",
+            "GroupName": "大倉捷",
+            "CustomerCode": df_all["CustomerCode"],
+            "CustomerName": df_all["CustomerName"],
+            "Date": df_all["Date"],
+            "PRT_Product_Code": df_all["PRT_Product_Code"],
+            "ProductCode": df_all["ProductCode_norm"],
+            "ProductName": df_all["ProductName"],
+            "Quantity": df_all["Quantity"].astype(int),
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "CustomerCode","CustomerName","Date",
+             "PRT_Product_Code","ProductCode","ProductName"],
+            as_index=False
+        )["Quantity"].sum().sort_values(["ProductCode","CustomerName"]).reset_index(drop=True)
+
+        # -------- UI --------
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        with st.expander("🔎 Parse & Mapping Summary"):
+            unmapped_cust = int((final["CustomerCode"] == "").sum())
+            unmapped_sku  = int((final["PRT_Product_Code"] == "").sum())
+            st.code("\n".join(parse_log))
+            st.write(f"Total rows: {len(final)} | Unmapped customers: {unmapped_cust} | Unmapped SKUs: {unmapped_sku}")
+
+        # -------- Download (no headers, no index) --------
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "CustomerCode","CustomerName","Date",
+                       "PRT_Product_Code","ProductCode","ProductName","Quantity"]
+        out_name = "30010316_大倉捷_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
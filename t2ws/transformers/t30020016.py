@@ -0,0 +1,111 @@
+"""30020016 日嵩."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import CUST_KEYS, KeyRule, get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="risong_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="risong_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------- 1) Load & detect header row ----------
+        with open_workbook(raw_data_file) as xls:
+            sheet = xls.sheet_names[0]  # expected 'AAA'
+            raw = xls.parse(sheet, header=None)
+
+            header_row_idx = None
+            for i in range(min(15, len(raw))):
+                row_vals = raw.iloc[i].astype(str).tolist()
+                if ("貨號" in row_vals[0]) and ("客戶" in (row_vals[2] if len(row_vals) > 2 else "")):
+                    header_row_idx = i
+                    break
+            if header_row_idx is None:
+                header_row_idx = 3  # fallback if layout shifts
+
+            df = xls.parse(sheet, header=None, skiprows=header_row_idx)
+        df.columns = ["ProductCode","ProductName","CustomerCode","CustomerName","FreeQty","SalesQty","ReturnQty","NetQty"]
+
+        # remove lingering column header row if any
+        df = df[df["CustomerCode"] != "客戶"].copy()
+
+        # ---------- 2) Numeric casting & keep Net != 0 ----------
+        for col in ["FreeQty","SalesQty","ReturnQty","NetQty"]:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+        df = df[df["NetQty"] != 0].copy()
+
+        # ---------- 3) Date from banner line (use END of range) ----------
+        row2 = " ".join([str(x) for x in raw.iloc[2].tolist() if pd.notna(x)])
+        dates = re.findall(r'(\d{4})/(\d{2})/(\d{2})', row2)
+        date_val = None
+        if dates:
+            y, m, d = dates[-1]                       # end date
+            date_val = f"{y}{m}{d}"
+        df["Date"] = date_val
+
+        # ---------- 4) Key normalization ----------
+        def norm_cust(s: str) -> str:
+            s = str(s).strip()
+            s = re.sub(r'\.0$', '', s)
+            s = s.upper().replace(' ', '')
+            return s
+
+        def norm_sku(s: str) -> str:
+            s = str(s).strip().upper().replace(' ', '')
+            # full-width letters -> half-width (defensive)
+            s = s.replace('Ｌ','L').replace('Ａ','A').replace('Ｂ','B')
+            return s
+
+        df["CustomerCode_norm"] = df["CustomerCode"].apply(norm_cust)
+        df["ProductCode_norm"]  = df["ProductCode"].apply(norm_sku)
+
+        # ---------- 5) Load mappings ----------
+        mapping_index = get_mapping_index(mapping_file)
+        # one-to-one tables (fan-out keys left out), built once per mapping version:
+        # filtered to 30020016 (preferred) + global fallback
+        cust_f_dict   = mapping_index.unique_map("customer", CUST_KEYS, "30020016", keyed=True).values
+        cust_all_dict = mapping_index.unique_map("customer", CUST_KEYS, keyed=True).values
+        sku_f_dict    = mapping_index.unique_map("sku", KeyRule(squeeze=True), "30020016", keyed=True).values
+        sku_all_dict  = mapping_index.unique_map("sku", KeyRule(squeeze=True), keyed=True).values
+
+        # ---------- 6) Apply mapping WITHOUT forcing, and avoid many-to-one fan-out ----------
+        jde_from_filtered = (df["CustomerCode_norm"] + '|30020016').map(cust_f_dict)
+        jde_from_global   = df["CustomerCode_norm"].map(cust_all_dict)
+        df["CustomerCode_final"] = (
+            jde_from_filtered.fillna(jde_from_global).fillna(df["CustomerCode_norm"])
+            .astype(str).str.replace(r"\.0$", "", regex=True)
+        )
+
+        prt_from_filtered = (df["ProductCode_norm"] + '|30020016').map(sku_f_dict)
+        prt_from_global   = df["ProductCode_norm"].map(sku_all_dict)
+        df["PRT_Product_Code"] = prt_from_filtered.fillna(prt_from_global)  # leave NaN if still missing
+
+        # ---------- 7) Assemble final & dedup ----------
+        df_final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30020016",
+            "GroupName": "日嵩",
+            "CustomerCode": df["CustomerCode_final"],
+            "CustomerName": df["CustomerName"],
+            "Date": df["Date"],
+            "PRT_Product_Code": df["PRT_Product_Code"],
+            "ProductCode": df["ProductCode_norm"],
+            "ProductName": df["ProductName"],
+            "Quantity": df["NetQty"].astype(int)
+        })
+
+        # remove exact duplicates; this plus unique-only mapping prevents the “same row repeated 5 times” issue
+        dedup_keys = ["GroupCode","CustomerCode","Date","ProductCode","Quantity"]
+        df_final = df_final.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+
+        # ---------- 8) Preview & export (no headers / no index) ----------
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_final)
+
+        output_filename = "30020016 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_final), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,134 @@
+"""30020023 松勇ON."""
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders (allow .xls / .xlsx) ----
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls", "xlsx"], key="songyong_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls", "xlsx"], key="songyong_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        with open_workbook(raw_data_file) as xls:
+            sheet_name = None
+            for sn in xls.sheet_names:
+                if str(sn).strip().lower() == "sheet4":
+                    sheet_name = sn
+                    break
+            if sheet_name is None:
+                sheet_name = xls.sheet_names[0]
+
+            df0 = xls.parse(sheet_name, header=None)
+
+        header_row = 1
+        wanted = ("客戶代號", "品號", "銷售數量")
+        for i in range(min(8, len(df0))):
+            row_vals = [str(x) if pd.notna(x) else "" for x in df0.iloc[i].tolist()]
+            if all(any(w in cell for cell in row_vals) for w in wanted):
+                header_row = i
+                break
+
+        hdr = df0.iloc[header_row].tolist()
+        df = df0.iloc[header_row + 1:].copy()
+        df.columns = hdr
+
+        rename = {
+            "客戶代號": "CustomerCode_ext",
+            "客戶名稱": "CustomerName",
+            "品號":   "ProductCode",
+            "品名":   "ProductName",
+            "銷售數量": "Quantity",
+        }
+        df = df.rename(columns=rename)
+        keep_cols = ["CustomerCode_ext","CustomerName","ProductCode","ProductName","Quantity"]
+        df = df[[c for c in keep_cols if c in df.columns]].copy()
+
+        def to_int(x):
+            try:
+                if pd.isna(x): return 0
+                return int(float(str(x).strip()))
+            except:
+                return 0
+
+        df["Quantity"] = df["Quantity"].apply(to_int)
+        df = df[df["Quantity"] != 0].copy()
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0","")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        df["CustomerCode_norm"] = df["CustomerCode_ext"].map(norm_code)
+        df["ProductCode_norm"]  = df["ProductCode"].map(norm_sku)
+
+        mapping_index = get_mapping_index(mapping_file)
+
+        cust_map = mapping_index.customer.copy()
+
+        sku_map  = mapping_index.sku.copy()
+
+        cust_map.columns = cust_map.columns.map(str)
+        sku_map.columns  = sku_map.columns.map(str)
+
+        group_code = "30020023"
+        group_name = "松勇ON"
+
+        cust_map["ASI_CRM_Mapping_Cust_No__c"]   = cust_map["ASI_CRM_Mapping_Cust_No__c"].astype(str).str.replace(r"\.0$","", regex=True)
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = sku_map["ASI_CRM_Mapping_Cust_Code__c"].astype(str).str.replace(r"\.0$","", regex=True)
+
+        cust_f = cust_map[cust_map["ASI_CRM_Mapping_Cust_No__c"] == group_code].copy()
+        sku_f  = sku_map[ sku_map["ASI_CRM_Mapping_Cust_Code__c"] == group_code].copy()
+
+        def unique_only_map(dfm, key_col, val_col, normalize=lambda s: s):
+            tmp = dfm[[key_col, val_col]].dropna().copy()
+            tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            counts = tmp.groupby("key")["val"].nunique().reset_index(name="n")
+            uniq = set(counts[counts["n"] == 1]["key"])
+            tmp = tmp[tmp["key"].isin(uniq)].drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+        m_cust_f = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_cust_g = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_sku_f  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+        m_sku_g  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+
+        df["Customer Code"] = df["CustomerCode_norm"].map(m_cust_f).fillna(
+                                df["CustomerCode_norm"].map(m_cust_g)
+                              ).fillna("")
+        df["PRT Product Code"] = df["ProductCode_norm"].map(m_sku_f).fillna(
+                                   df["ProductCode_norm"].map(m_sku_g)
+                                 ).fillna("")
+
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": group_code,
+            "GroupName": group_name,
+            "Customer Code": df["Customer Code"],
+            "Customer Name": df["CustomerName"],
+            "Date": "",
+            "PRT Product Code": df["PRT Product Code"],
+            "Product Code": df["ProductCode_norm"],
+            "Product Name": df["ProductName"],
+            "Number of Bottles": df["Quantity"].astype(int),
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "Customer Code","Customer Name","Date",
+             "PRT Product Code","Product Code","Product Name"],
+            as_index=False
+        )["Number of Bottles"].sum().sort_values(
+            ["Product Code","Customer Name"]
+        ).reset_index(drop=True)
+
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        out_name = "30020023_松勇ON_transformation.xlsx"
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "Customer Code","Customer Name","Date",
+                       "PRT Product Code","Product Code","Product Name","Number of Bottles"]
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
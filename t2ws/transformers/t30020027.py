@@ -0,0 +1,94 @@
+"""30020027 榮好(實儀)."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="ronghao_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="ronghao_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---- 1) Load primary sheet (e.g., '20250317-20250322') ----
+        with open_workbook(raw_data_file) as xls:
+            sheet = xls.sheet_names[0]
+            df_raw = xls.parse(sheet, header=None)
+
+        # First row is the header row
+        df_raw.columns = df_raw.iloc[0]
+        df_body = df_raw.iloc[1:].reset_index(drop=True)
+
+        # Standardize expected columns
+        rename_map = {
+            "客戶代碼": "CustomerCode",
+            "客戶名稱": "CustomerName",
+            "產品代號": "ProductCode",
+            "品名規格": "ProductName",
+            "銷量":   "Quantity",
+        }
+        df = df_body.rename(columns=rename_map)[["CustomerCode","CustomerName","ProductCode","ProductName","Quantity"]]
+
+        # 2) Forward-fill customer code/name for continuation rows
+        df["CustomerCode"] = df["CustomerCode"].ffill()
+        df["CustomerName"] = df["CustomerName"].ffill()
+
+        # 3) Quantity -> int, keep only non-zero
+        df["Quantity"] = pd.to_numeric(df["Quantity"], errors="coerce").fillna(0).astype(int)
+        df = df[df["Quantity"] != 0].copy()
+
+        # 4) Normalize keys
+        def norm_cust(s: str) -> str:
+            s = str(s).strip()
+            s = re.sub(r"\.0$", "", s)
+            return s
+
+        def norm_sku(s: str) -> str:
+            return str(s).strip().upper()
+
+        df["CustomerCode_norm"] = df["CustomerCode"].apply(norm_cust)
+        df["ProductCode_norm"]  = df["ProductCode"].apply(norm_sku)
+
+        # 5) Date from sheet name: 'YYYYMMDD-YYYYMMDD' -> use END date
+        m = re.match(r"^(\d{8})-(\d{8})$", sheet)
+        date_val = m.group(2) if m else None
+        df["Date"] = date_val
+
+        # ---- 6) Load mappings using Composite Keys ----
+        mapping_index = get_mapping_index(mapping_file)
+
+        # Customer mapping
+        mapped_customer = mapping_index.map_customer(df['CustomerCode_norm'], '30020027')
+        df["CustomerCode_final"] = mapped_customer.fillna(df["CustomerCode_norm"]).astype(str).str.replace(r"\.0$", "", regex=True)
+
+        # SKU mapping
+        df["PRT_Product_Code"] = mapping_index.map_sku(df['ProductCode_norm'], '30020027')
+
+        # 8) Assemble final ordered frame
+        df_final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30020027",
+            "GroupName": "榮好(實儀)",
+            "CustomerCode": df["CustomerCode_final"],
+            "CustomerName": df["CustomerName"],
+            "Date": df["Date"],
+            "PRT_Product_Code": df["PRT_Product_Code"],
+            "ProductCode": df["ProductCode_norm"],
+            "ProductName": df["ProductName"],
+            "Quantity": df["Quantity"],
+        })
+
+        # 9) De-duplicate exact duplicates
+        dedup_keys = ["GroupCode","CustomerCode","Date","ProductCode","Quantity"]
+        df_final = df_final.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+
+        # 10) Preview + Export (NO headers / NO index)
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_final)
+
+        output_filename = "30020027 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_final), file_name=output_filename, mime=XLSX_MIME)
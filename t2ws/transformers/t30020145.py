@@ -0,0 +1,79 @@
+"""30020145 鏵錡."""
+import re
+
+import pandas as pd
+
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xlsx"], key="30020145_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xlsx"], key="30020145_mapping")
+
+    if raw_data_file and mapping_file:
+        def extract_product_data_from_workbook(file):
+            with open_workbook(file) as xls:
+                combined_data = []
+
+                for sheet_name in xls.sheet_names:
+                    df = xls.parse(sheet_name, header=None)
+
+                    merged_cell_value = str(df.iloc[2, 0])
+                    product_match = re.search(r"貨品編號[:：]([A-Z0-9\-]+)\s+(.*)", merged_cell_value)
+
+                    if not product_match:
+                        continue
+
+                    product_code = product_match.group(1).strip()
+                    product_name = product_match.group(2).strip()
+
+                    df_data = df.iloc[8:, :8].copy()
+                    df_data.columns = ["Date", "Document No", "Customer Code", "Distributor", "Customer Name", "Quantity", "Unit", "Note"]
+
+                    for _, row in df_data.iterrows():
+                        if pd.isna(row["Date"]) or pd.isna(row["Customer Code"]) or pd.isna(row["Quantity"]):
+                            continue
+
+                        combined_data.append({
+                            "Customer Code": row["Customer Code"],
+                            "Customer Name": row["Customer Name"],
+                            "Date": row["Date"],
+                            "Product Code": product_code,
+                            "Product Name": product_name,
+                            "Quantity": row["Quantity"],
+                            "Document No": row["Document No"]
+                        })
+
+            return pd.DataFrame(combined_data)
+
+        df_combined = extract_product_data_from_workbook(raw_data_file)
+        df_combined["Date"] = roc_to_ymd(df_combined["Date"])
+
+        # Load mapping sheets
+        mapping_index = get_mapping_index(mapping_file)
+
+        # Customer Mapping using Composite Key
+        mapped_customer = mapping_index.map_customer(df_combined['Customer Code'], '30020145', typed=True)
+        df_combined["Customer Code"] = mapped_customer.astype(str).str.replace(r"\.0$", "", regex=True)
+
+        # SKU Mapping using Composite Key
+        mapped_sku = mapping_index.map_sku(df_combined['Product Code'], '30020145', typed=True)
+
+        product_index = df_combined.columns.get_loc("Product Code")
+        df_combined.insert(product_index, "PRT Product Code", mapped_sku.astype(str).str.strip())
+
+        # Insert fixed columns
+        df_combined.insert(0, "Column4", "任我行")
+        df_combined.insert(0, "Column3", "30020145")
+        df_combined.insert(0, "Column2", "U")
+        df_combined.insert(0, "Column1", "INV")
+
+        # Preview result
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_combined)
+
+        output_filename = "30020145_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_combined), file_name=output_filename, mime=XLSX_MIME)
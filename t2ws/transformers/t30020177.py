@@ -0,0 +1,153 @@
+"""30020177 富為MM(甲揚)."""
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls", "xlsx"], key="fu_wei_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls", "xlsx"], key="fu_wei_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        with open_workbook(raw_data_file) as xls:
+            sheet_name = None
+            for sn in xls.sheet_names:
+                if str(sn).strip() == "大盤大 (02)":
+                    sheet_name = sn
+                    break
+            if sheet_name is None:
+                sheet_name = xls.sheet_names[0]
+
+            df0 = xls.parse(sheet_name, header=None)
+
+        hdr_row = None
+        for i in range(min(20, len(df0))):
+            row = [str(x).strip() if pd.notna(x) else "" for x in df0.iloc[i].tolist()]
+            if ("單據日期" in row) and ("客戶編號" in row) and ("貨品編號" in row) and ("貨品名稱" in row):
+                hdr_row = i
+                break
+        if hdr_row is None:
+            hdr_row = 5
+
+        hdr = df0.iloc[hdr_row].tolist()
+        df = df0.iloc[hdr_row+1:].copy()
+        df.columns = hdr
+
+        rename = {
+            "單據日期": "Date",
+            "單據編號": "DocNo",
+            "客戶編號": "CustomerCode_ext",
+            "客戶名稱": "CustomerName",
+            "貨品編號": "ProductCode",
+            "貨品名稱": "ProductName",
+            "單位": "Unit",
+            "數量": "Quantity",
+            "單價": "UnitPrice",
+            "小計": "Subtotal",
+            "總計金額": "Total",
+            "附註": "Note"
+        }
+        df = df.rename(columns=rename)
+
+        df = df[~df["Date"].isna()].copy()
+        df["Quantity"] = pd.to_numeric(df["Quantity"], errors="coerce").fillna(0).astype(int)
+        df = df[df["Quantity"] != 0].copy()
+
+        def to_ymd(s):
+            s = "" if s is None else str(s).strip()
+            if not s:
+                return ""
+            try:
+                dt = pd.to_datetime(s, errors='coerce')
+                if pd.isna(dt):
+                    return ""
+                return dt.strftime("%Y%m%d")
+            except:
+                return ""
+        df["Date"] = df["Date"].apply(to_ymd)
+
+        def signed_qty(row):
+            q = int(row["Quantity"])
+            doc = str(row.get("DocNo", ""))
+            if "退" in doc:
+                return -abs(q)
+            return q
+        df["Quantity"] = df.apply(signed_qty, axis=1)
+
+        mapping_index = get_mapping_index(mapping_file)
+
+        cust_map = mapping_index.customer.copy()
+
+        sku_map  = mapping_index.sku.copy()
+
+        cust_map.columns = cust_map.columns.map(str)
+        sku_map.columns  = sku_map.columns.map(str)
+        cust_map["ASI_CRM_Mapping_Cust_No__c"]   = cust_map["ASI_CRM_Mapping_Cust_No__c"].astype(str).str.replace(r"\.0$", "", regex=True)
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = sku_map["ASI_CRM_Mapping_Cust_Code__c"].astype(str).str.replace(r"\.0$", "", regex=True)
+
+        group_code = "30020177"
+        group_name = "富為MM(甲揚)"
+
+        cust_f = cust_map[cust_map["ASI_CRM_Mapping_Cust_No__c"] == group_code].copy()
+        sku_f  = sku_map[ sku_map["ASI_CRM_Mapping_Cust_Code__c"] == group_code].copy()
+
+        def unique_only_map(dfm, key_col, val_col, normalize=lambda s: s):
+            tmp = dfm[[key_col, val_col]].dropna().copy()
+            tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            counts = tmp.groupby("key")["val"].nunique().reset_index(name="n")
+            uniq = set(counts[counts["n"] == 1]["key"])
+            tmp = tmp[tmp["key"].isin(uniq)].drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0", "")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        m_cust_f = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_cust_g = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_sku_f  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+        m_sku_g  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+
+        df["CustomerCode_norm"] = df["CustomerCode_ext"].map(norm_code)
+        df["Customer Code"] = df["CustomerCode_norm"].map(m_cust_f).fillna(
+                                df["CustomerCode_norm"].map(m_cust_g)
+                              ).fillna("")
+
+        df["ProductCode_norm"] = df["ProductCode"].map(norm_sku)
+        df["PRT Product Code"] = df["ProductCode_norm"].map(m_sku_f).fillna(
+                                   df["ProductCode_norm"].map(m_sku_g)
+                                 ).fillna("")
+
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": group_code,
+            "GroupName": group_name,
+            "Customer Code": df["Customer Code"],
+            "Customer Name": df["CustomerName"],
+            "Date": df["Date"],
+            "PRT Product Code": df["PRT Product Code"],
+            "Product Code": df["ProductCode_norm"],
+            "Product Name": df["ProductName"],
+            "Number of Bottles": df["Quantity"].astype(int),
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "Customer Code","Customer Name","Date",
+             "PRT Product Code","Product Code","Product Name"],
+            as_index=False
+        )["Number of Bottles"].sum().sort_values(
+            ["Date","Product Code","Customer Name"]
+        ).reset_index(drop=True)
+
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        out_name = "30020177_富為MM(甲揚)_transformation.xlsx"
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "Customer Code","Customer Name","Date",
+                       "PRT Product Code","Product Code","Product Name","Number of Bottles"]
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
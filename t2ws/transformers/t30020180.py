@@ -0,0 +1,114 @@
+"""30020180 暐倫 OFF."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import SKU_KEYS, KeyRule, get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="weilen_off_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="weilen_off_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------- 1) Load raw (first row is header) ----------
+        with open_workbook(raw_data_file) as xls:
+            sheet = xls.sheet_names[0]  # e.g., '工作表1'
+            df_raw = xls.parse(sheet, header=None)
+        df_raw.columns = df_raw.iloc[0]
+        df = df_raw.iloc[1:].reset_index(drop=True)
+
+        # Standardize expected columns (defensive rename)
+        rename = {
+            "銷貨單號": "DocumentNo",
+            "銷貨日期": "DateRaw",
+            "客戶代號": "CustomerCode",
+            "客戶名稱": "CustomerName",
+            "產品編號": "ProductCode",
+            "產品名稱": "ProductName",
+            "數量":    "Quantity",
+        }
+        df = df.rename(columns=rename)
+
+        # Keep only needed columns if they exist
+        cols_needed = ["DateRaw","CustomerCode","CustomerName","ProductCode","ProductName","Quantity"]
+        df = df[[c for c in cols_needed if c in df.columns]].copy()
+
+        # ---------- 2) Date → YYYYMMDD ----------
+        def to_yyyymmdd(x):
+            # try pandas first (handles Excel serials, datetime, strings)
+            try:
+                return pd.to_datetime(x).strftime("%Y%m%d")
+            except Exception:
+                s = str(x)
+                m = re.search(r"(\d{4})[/-](\d{2})[/-](\d{2})", s)
+                if m:
+                    return f"{m.group(1)}{m.group(2)}{m.group(3)}"
+                return None
+
+        df["Date"] = df["DateRaw"].apply(to_yyyymmdd) if "DateRaw" in df.columns else None
+
+        # ---------- 3) Quantity → int; keep only non-zero ----------
+        df["Quantity"] = pd.to_numeric(df.get("Quantity", 0), errors="coerce").fillna(0).astype(int)
+        df = df[df["Quantity"] != 0].copy()
+
+        # ---------- 4) Normalize keys ----------
+        def norm_cust(s: str) -> str:
+            s = str(s).strip()
+            s = re.sub(r"\.0$", "", s)
+            return s
+
+        def norm_sku(s: str) -> str:
+            return str(s).strip().upper()
+
+        df["CustomerCode_norm"] = df.get("CustomerCode", "").apply(norm_cust)
+        df["ProductCode_norm"]  = df.get("ProductCode", "").apply(norm_sku)
+
+        # ---------- 5) Load mappings ----------
+        mapping_index = get_mapping_index(mapping_file)
+        # one-to-one tables (fan-out keys left out), built once per mapping version:
+        # filtered to 30020180 (preferred) + global fallback
+        cust_f_dict   = mapping_index.unique_map("customer", KeyRule(upper=False, drop_zero=True), "30020180", keyed=True).values
+        cust_all_dict = mapping_index.unique_map("customer", KeyRule(upper=False, drop_zero=True), keyed=True).values
+        sku_f_dict    = mapping_index.unique_map("sku", SKU_KEYS, "30020180", keyed=True).values
+        sku_all_dict  = mapping_index.unique_map("sku", SKU_KEYS, keyed=True).values
+
+        # ---------- 6) Apply mapping (non-forced, unique-only) ----------
+        jde_from_filtered = (df["CustomerCode_norm"] + '|30020180').map(cust_f_dict)
+        jde_from_global   = df["CustomerCode_norm"].map(cust_all_dict)
+        df["CustomerCode_final"] = (
+            jde_from_filtered.fillna(jde_from_global).fillna(df["CustomerCode_norm"])
+            .astype(str).str.replace(r"\.0$", "", regex=True)
+        )
+
+        prt_from_filtered = (df["ProductCode_norm"] + '|30020180').map(sku_f_dict)
+        prt_from_global   = df["ProductCode_norm"].map(sku_all_dict)
+        df["PRT_Product_Code"] = prt_from_filtered.fillna(prt_from_global)  # leave NaN if still missing
+
+        # ---------- 7) Assemble final ordered frame ----------
+        df_final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30020180",
+            "GroupName": "暐倫 OFF",
+            "CustomerCode": df["CustomerCode_final"],
+            "CustomerName": df.get("CustomerName", ""),
+            "Date": df["Date"],
+            "PRT_Product_Code": df["PRT_Product_Code"],
+            "ProductCode": df["ProductCode_norm"],
+            "ProductName": df.get("ProductName", ""),
+            "Quantity": df["Quantity"],
+        })
+
+        # ---------- 8) De-duplicate exact duplicates ----------
+        dedup_keys = ["GroupCode","CustomerCode","Date","ProductCode","Quantity"]
+        df_final = df_final.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+
+        # ---------- 9) Preview & export (no headers / no index) ----------
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_final)
+
+        output_filename = "30020180 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_final), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,174 @@
+"""30020203 玄星 OFF."""
+import re
+
+import pandas as pd
+
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import CUST_KEYS, SKU_KEYS, get_mapping_index
+from t2ws.results import cached_frame
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="xuanxing_off_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="xuanxing_off_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        def parse_and_map() -> pd.DataFrame:
+            # ---------------------------
+            # Helpers
+            # ---------------------------
+            def to_int(x):
+                try: return int(float(x))
+                except: return 0
+
+            def norm_cust(s: str) -> str:
+                s = str(s).strip().upper().replace(" ", "")
+                return re.sub(r"\.0$", "", s)
+
+            def norm_sku(s: str) -> str:
+                return str(s).strip().upper()
+
+            # ---------------------------
+            # 1) Load all monthly sheets named like 11401..11412
+            # ---------------------------
+            with open_workbook(raw_data_file) as xls:
+                month_sheets = [s for s in xls.sheet_names if re.fullmatch(r"\d{5}", s)]
+
+                def extract_month(sheet_name: str) -> pd.DataFrame:
+                    df = xls.parse(sheet_name, header=None)
+
+                    # find header row where C="客戶編號", D="客戶簡稱", E="產品編號"
+                    header_idx = None
+                    for i in range(min(25, len(df))):
+                        c = str(df.iat[i, 2]).strip() if df.shape[1] > 2 else ""
+                        d = str(df.iat[i, 3]).strip() if df.shape[1] > 3 else ""
+                        e = str(df.iat[i, 4]).strip() if df.shape[1] > 4 else ""
+                        if c == "客戶編號" and d == "客戶簡稱" and e == "產品編號":
+                            header_idx = i
+                            break
+                    if header_idx is None:
+                        return pd.DataFrame()
+
+                    rows = []
+                    for r in range(header_idx + 1, len(df)):
+                        if str(df.iat[r, 0]).strip() == "合計":
+                            break
+
+                        date_cell = df.iat[r, 0]
+                        cust_code = df.iat[r, 2]
+                        cust_name = df.iat[r, 3]
+                        prod_code = df.iat[r, 4]
+                        prod_name = df.iat[r, 5]
+                        sales_qty = df.iat[r, 6]
+                        free_qty  = df.iat[r, 7] if df.shape[1] > 7 else 0
+
+                        if pd.isna(prod_code) and pd.isna(prod_name) and pd.isna(cust_code):
+                            continue
+
+                        qty = to_int(sales_qty) + to_int(free_qty)
+                        if qty == 0:
+                            continue
+
+                        rows.append({
+                            "Date": date_cell,
+                            "CustomerCode": cust_code,
+                            "CustomerName": cust_name,
+                            "ProductCode": prod_code,
+                            "ProductName": prod_name,
+                            "Quantity": qty
+                        })
+                    return pd.DataFrame(rows)
+
+                df_all = pd.concat([extract_month(s) for s in month_sheets], ignore_index=True)
+
+            if df_all.empty:
+                st.warning("No valid rows found across monthly tabs.")
+                st.stop()
+
+            # Minguo (or Gregorian / Excel) dates -> YYYYMMDD, once per distinct value
+            df_all["Date"] = roc_to_ymd(df_all["Date"], gregorian_years=True, fallback=True)
+
+            # ---------------------------
+            # 2) Normalize + month key
+            # ---------------------------
+            df_all["CustomerCode_norm"] = df_all["CustomerCode"].apply(norm_cust)
+            df_all["ProductCode_norm"]  = df_all["ProductCode"].apply(norm_sku)
+            df_all["Month"] = df_all["Date"].astype(str).str[:6]  # YYYYMM
+
+            # ---------------------------
+            # 3) Load mappings (unique-only; prefer filtered, then global)
+            # ---------------------------
+            mapping_index = get_mapping_index(mapping_file)
+            # one-to-one tables (fan-out keys left out), built once per mapping version:
+            # filtered to 30020203 (preferred) + global fallback
+            cust_f_dict   = mapping_index.unique_map("customer", CUST_KEYS, "30020203", keyed=True).values
+            cust_all_dict = mapping_index.unique_map("customer", CUST_KEYS, keyed=True).values
+            sku_f_dict    = mapping_index.unique_map("sku", SKU_KEYS, "30020203", keyed=True).values
+            sku_all_dict  = mapping_index.unique_map("sku", SKU_KEYS, keyed=True).values
+
+            # ---------------------------
+            # 4) Apply mapping
+            #     CHANGE: if no mapping, leave CustomerCode blank (not original)
+            # ---------------------------
+            jde_from_filtered = (df_all["CustomerCode_norm"] + '|30020203').map(cust_f_dict)
+            jde_from_global   = df_all["CustomerCode_norm"].map(cust_all_dict)
+            mapped_jde        = jde_from_filtered.combine_first(jde_from_global)
+            df_all["CustomerCode_final"] = mapped_jde.fillna("")  # blank when unmapped
+
+            prt_from_filtered = (df_all["ProductCode_norm"] + '|30020203').map(sku_f_dict)
+            prt_from_global   = df_all["ProductCode_norm"].map(sku_all_dict)
+            df_all["PRT_Product_Code"] = prt_from_filtered.fillna(prt_from_global)  # leave NaN if missing
+
+            # ---------------------------
+            # 5) Build final frame (all months), de-dupe
+            # ---------------------------
+            df_all_final = pd.DataFrame({
+                "Type": "INV",
+                "Action": "U",
+                "GroupCode": "30020203",
+                "GroupName": "玄星 OFF",
+                "CustomerCode": df_all["CustomerCode_final"],
+                "CustomerName": df_all["CustomerName"],
+                "Date": df_all["Date"],
+                "PRT_Product_Code": df_all["PRT_Product_Code"],
+                "ProductCode": df_all["ProductCode_norm"],
+                "ProductName": df_all["ProductName"],
+                "Quantity": df_all["Quantity"].astype(int),
+                "Month": df_all["Month"],
+            })
+
+            dedup_keys = ["GroupCode","CustomerCode","Date","ProductCode","Quantity"]
+            df_all_final = df_all_final.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+            return df_all_final
+
+        # Month filter clicks rerun the script; reuse the parsed + mapped frame for this raw/mapping pair
+        df_all_final = cached_frame("30020203", raw_data_file, mapping_file, parse_and_map)
+
+        # ---------------------------
+        # 6) UI: Toggle by Month (📅)
+        # ---------------------------
+        available_months = sorted(df_all_final["Month"].dropna().astype(str).unique().tolist())
+        month_filter = st.radio("📅 Filter by Month:", ["All"] + available_months, index=0)
+
+        if month_filter != "All":
+            df_view = df_all_final[df_all_final["Month"] == month_filter].copy()
+        else:
+            df_view = df_all_final.copy()
+
+        # Drop helper Month column from display/export
+        df_view = df_view[[
+            "Type","Action","GroupCode","GroupName",
+            "CustomerCode","CustomerName","Date",
+            "PRT_Product_Code","ProductCode","ProductName","Quantity"
+        ]]
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_view)
+
+        # ---------------------------
+        # 7) Export selection (no headers / no index)
+        # ---------------------------
+        out_name = "30020203_玄星OFF_all_months.xlsx" if month_filter == "All" else f"30020203_玄星OFF_{month_filter}.xlsx"
+        st.download_button(label="📥 Download Selected Month", data=xlsx_export(df_view), file_name=out_name, mime=XLSX_MIME)
@@ -0,0 +1,154 @@
+"""30020216 久悅貿易."""
+import re
+
+import pandas as pd
+
+from t2ws.dates import roc_date
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import CUST_KEYS, SKU_KEYS, get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="jiuyue_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="jiuyue_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------- 1) Pick a YYYYMM sheet if present ----------
+        with open_workbook(raw_data_file) as xls:
+            month_like = [s for s in xls.sheet_names if re.fullmatch(r"\d{6}", s)]
+            sheet = month_like[0] if month_like else xls.sheet_names[0]
+            df_raw = xls.parse(sheet, header=None)
+
+        # ---------- 2) Helpers ----------
+        def parse_customer(line: str):
+            s = re.sub(r'[\u200b\ufeff]', '', line)
+            s = re.sub(r'\s+', ' ', s)
+            m = re.search(r'客戶簡稱[:：]\s*([A-Z0-9\-]+)\s+(.+?)(?:\s+電\s*話|$)', s)
+            if m:
+                return m.group(1).strip(), m.group(2).strip()
+            return None, None
+
+        def last_code_token(name: str):
+            toks = str(name).strip().split()
+            if toks:
+                tail = toks[-1]
+                if re.fullmatch(r"[A-Za-z0-9\-]+", tail):
+                    return tail
+            return ""
+
+        # ---------- 3) Extract rows ----------
+        records = []
+        current_cust_code = None
+        current_cust_name = None
+        current_date = None
+
+        for i in range(len(df_raw)):
+            c0 = df_raw.iat[i, 0]
+            c1 = df_raw.iat[i, 1] if df_raw.shape[1] > 1 else None   # ← Document No
+            c2 = df_raw.iat[i, 2] if df_raw.shape[1] > 2 else None   # Name
+            c3 = df_raw.iat[i, 3] if df_raw.shape[1] > 3 else None   # Qty
+
+            # New customer block
+            if isinstance(c0, str) and c0.strip().startswith("客戶簡稱"):
+                code, name = parse_customer(c0)
+                if code:
+                    current_cust_code = code
+                    current_cust_name = name
+                continue
+
+            # Skip headers/totals
+            if str(c0).strip() in ["單據日期", "合    計：", "合計", "合    計:"]:
+                continue
+
+            # Date line
+            if isinstance(c0, str) and re.match(r"^\d{3}/\d{2}/\d{2}$", c0.strip()):
+                current_date = roc_date(c0.strip(), gregorian_years=True)
+
+            # Product rows: robust qty parse (handles "3.00" strings)
+            prod_name = c2 if isinstance(c2, str) else (str(c2) if pd.notna(c2) else None)
+            qty = pd.to_numeric(c3, errors="coerce")
+            if prod_name and pd.notna(qty):
+                qty = int(float(qty))
+                if qty == 0:
+                    continue
+                prod_code = last_code_token(prod_name)
+                records.append({
+                    "DocumentNo": c1,                         # NEW
+                    "CustomerCode_ext": current_cust_code,    # keep external for de-dup only
+                    "CustomerName": current_cust_name,
+                    "Date": current_date,
+                    "ProductCode": prod_code,
+                    "ProductName": prod_name,
+                    "Quantity": qty
+                })
+
+        if not records:
+            st.warning("No valid rows found.")
+            st.stop()
+
+        df_rec = pd.DataFrame(records)
+
+        # ---------- 4) Normalize keys ----------
+        def norm_cust(s: str) -> str:
+            s = str(s).strip().upper().replace(" ", "")
+            return re.sub(r"\.0$", "", s)
+
+        def norm_sku(s: str) -> str:
+            return str(s).strip().upper()
+
+        df_rec["CustomerCode_norm"] = df_rec["CustomerCode_ext"].apply(norm_cust)
+        df_rec["ProductCode_norm"]  = df_rec["ProductCode"].apply(norm_sku)
+
+        # ---------- 5) Load mappings (unique-only; prefer filtered, then global) ----------
+        mapping_index = get_mapping_index(mapping_file)
+        # one-to-one tables (fan-out keys left out), built once per mapping version:
+        # filtered to 30020216 (preferred) + global fallback
+        cust_f_dict   = mapping_index.unique_map("customer", CUST_KEYS, "30020216", keyed=True).values
+        cust_all_dict = mapping_index.unique_map("customer", CUST_KEYS, keyed=True).values
+        sku_f_dict    = mapping_index.unique_map("sku", SKU_KEYS, "30020216", keyed=True).values
+        sku_all_dict  = mapping_index.unique_map("sku", SKU_KEYS, keyed=True).values
+
+        # ---------- 6) Apply mapping
+        # Leave CustomerCode BLANK when unmapped (per your requirement)
+        # ----------
+        jde_from_filtered = (df_rec["CustomerCode_norm"] + '|30020216').map(cust_f_dict)
+        jde_from_global   = df_rec["CustomerCode_norm"].map(cust_all_dict)
+        df_rec["CustomerCode_final"] = jde_from_filtered.combine_first(jde_from_global).fillna("")
+
+        prt_from_filtered = (df_rec["ProductCode_norm"] + '|30020216').map(sku_f_dict)
+        prt_from_global   = df_rec["ProductCode_norm"].map(sku_all_dict)
+        df_rec["PRT_Product_Code"] = prt_from_filtered.fillna(prt_from_global)  # may stay NaN
+
+        # ---------- 7) Build output ----------
+        df_final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30020216",
+            "GroupName": "久悅貿易",
+            "CustomerCode": df_rec["CustomerCode_final"],          # blank if unmapped
+            "CustomerName": df_rec["CustomerName"],
+            "Date": df_rec["Date"],
+            "PRT_Product_Code": df_rec["PRT_Product_Code"],
+            "ProductCode": df_rec["ProductCode_norm"],
+            "ProductName": df_rec["ProductName"],
+            "Quantity": df_rec["Quantity"].astype(int),
+            "DocumentNo": df_rec["DocumentNo"],                    # helper (not exported)
+            "_custKey": df_rec["CustomerCode_final"].mask(
+                df_rec["CustomerCode_final"].eq(""), df_rec["CustomerCode_norm"]
+            ),  # use external code only for de-dup key
+        })
+
+        # ---------- 8) De-dup: keep distinct lines (uses doc no + product name + custKey) ----------
+        dedup_keys = ["GroupCode","_custKey","Date","ProductCode","ProductName","Quantity","DocumentNo"]
+        df_final = df_final.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+
+        # drop helper columns from export
+        df_export = df_final.drop(columns=["DocumentNo","_custKey"])
+
+        # ---------- 9) Preview + Export (no headers / no index) ----------
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_export)
+
+        output_filename = "30020216 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_export), file_name=output_filename, mime=XLSX_MIME)
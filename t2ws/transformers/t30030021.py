@@ -0,0 +1,175 @@
+"""30030021 合歡 ON."""
+import re
+
+import pandas as pd
+
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.keys import normalize_key
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders (allow .xls / .xlsx)
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls", "xlsx"], key="hehuan_on_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls", "xlsx"], key="hehuan_on_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------------- Utilities ----------------
+        def unique_only_map(df, key_col, val_col, normalize=lambda s: s, group_col=None):
+            """Build key->val map taking the first value for each key."""
+            if group_col:
+                # Check if group_col is a column name or a literal value
+                if group_col in df.columns:
+                    tmp = df[[key_col, val_col, group_col]].dropna().copy()
+                    tmp["key"] = tmp[key_col].astype(str).map(normalize) + "|" + tmp[group_col].astype(str)
+                else:
+                    tmp = df[[key_col, val_col]].dropna().copy()
+                    tmp["key"] = tmp[key_col].astype(str).map(normalize) + "|" + str(group_col)
+            else:
+                tmp = df[[key_col, val_col]].dropna().copy()
+                tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            tmp = tmp.drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0", "")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        # ---------------- 1) Parse all sheets ----------------
+        with open_workbook(raw_data_file) as xls:
+            sheets = xls.sheet_names
+
+            def parse_sheet(sheet_name: str) -> pd.DataFrame:
+                df = xls.parse(sheet_name, header=None)
+                if df.empty:
+                    return pd.DataFrame()
+
+                recs = []
+                current_prod_code = ""
+                current_prod_name = ""
+
+                for r in range(len(df)):
+                    c0 = df.iat[r, 0] if 0 < df.shape[1] else None
+                    s0 = str(c0).strip() if pd.notna(c0) else ""
+
+                    # Product header line: "產品編號：" in col0, code in col1, name in col3
+                    if s0.startswith("產品編號"):
+                        code = str(df.iat[r, 1]).strip().upper() if (df.shape[1] > 1 and pd.notna(df.iat[r, 1])) else ""
+                        name = str(df.iat[r, 3]).strip() if (df.shape[1] > 3 and pd.notna(df.iat[r, 3])) else ""
+                        name = name.lstrip("[").strip()
+                        current_prod_code, current_prod_name = code, name
+                        continue
+
+                    # Detail line begins with Minguo date like "114/05/07"
+                    if re.match(r"^\d{3}/\d{2}/\d{2}$", s0):
+                        doc_no   = str(df.iat[r, 1]).strip() if (df.shape[1] > 1 and pd.notna(df.iat[r, 1])) else ""
+                        cust_ext = str(df.iat[r, 2]).strip() if (df.shape[1] > 2 and pd.notna(df.iat[r, 2])) else ""
+                        cust_nm  = str(df.iat[r, 3]).strip() if (df.shape[1] > 3 and pd.notna(df.iat[r, 3])) else ""
+                        qty      = pd.to_numeric(df.iat[r, 5] if df.shape[1] > 5 else None, errors="coerce")
+
+                        if current_prod_code and cust_nm and pd.notna(qty) and qty != 0:
+                            recs.append({
+                                "Date": s0,
+                                "CustomerCode_ext": cust_ext,
+                                "CustomerName": cust_nm,
+                                "ProductCode": current_prod_code,
+                                "ProductName": current_prod_name,
+                                "Quantity": int(qty),
+                                "DocNo": doc_no,
+                                "Sheet": sheet_name
+                            })
+
+                return pd.DataFrame(recs)
+
+            parts, parse_log = [], []
+            for s in sheets:
+                try:
+                    p = parse_sheet(s)
+                    if not p.empty:
+                        parts.append(p)
+                    parse_log.append(f"{s}: {len(p)} rows")
+                except Exception as e:
+                    parse_log.append(f"{s}: ERROR → {e}")
+
+        if not parts:
+            st.error("No valid rows found in any sheet.\n\nParse summary:\n" + "\n".join(parse_log))
+            st.stop()
+
+        raw_extracted = pd.concat(parts, ignore_index=True)
+
+        # Minguo 114/07/31 -> 20250731 ('' if not a date), once per distinct value
+        raw_extracted["Date"] = roc_to_ymd(raw_extracted["Date"], strict=True, missing="")
+
+        # ---------------- 2) Mappings (unique-only; prefer 30030021, then global) ----------------
+        # IMPORTANT: read with header=0 so column names exist
+        mapping_index = get_mapping_index(mapping_file)
+        cust_map = mapping_index.customer.copy()
+        sku_map  = mapping_index.sku.copy()
+
+        # normalize column labels (trim stray whitespace)
+        cust_map.columns = cust_map.columns.map(lambda x: str(x).strip())
+        sku_map.columns  = sku_map.columns.map(lambda x: str(x).strip())
+
+        # proceed with expected columns
+        cust_map["ASI_CRM_Mapping_Cust_No__c"] = normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"])
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"])
+
+        cust_f = cust_map[normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"]) == "30030021"].copy()
+        sku_f  = sku_map[normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"]) == "30030021"].copy()
+
+        m_cust_f = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code, group_col="30030021")
+        m_cust_g = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code, group_col="ASI_CRM_Mapping_Cust_No__c")
+        m_sku_f  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku, group_col="30030021")
+        m_sku_g  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku, group_col="ASI_CRM_Mapping_Cust_Code__c")
+
+        df_m = raw_extracted.copy()
+        df_m["CustomerCode_norm"] = df_m["CustomerCode_ext"].map(norm_code)
+        df_m["CustomerCode"] = (df_m["CustomerCode_norm"] + '|30030021').map(m_cust_f).fillna(
+                                df_m["CustomerCode_norm"].map(m_cust_g)
+                              ).fillna("")  # leave blank if unmapped (non-forced)
+
+        df_m["ProductCode_norm"] = df_m["ProductCode"].map(norm_sku)
+        df_m["PRT_Product_Code"] = (df_m["ProductCode_norm"] + '|30030021').map(m_sku_f).fillna(
+                                    df_m["ProductCode_norm"].map(m_sku_g)
+                                  ).fillna("")
+
+        # ---------------- 3) Assemble final + aggregate duplicates ----------------
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30030021",
+            "GroupName": "合歡 ON",
+            "CustomerCode": df_m["CustomerCode"],
+            "CustomerName": df_m["CustomerName"],
+            "Date": df_m["Date"],
+            "PRT_Product_Code": df_m["PRT_Product_Code"],
+            "ProductCode": df_m["ProductCode_norm"],
+            "ProductName": df_m["ProductName"],
+            "Quantity": df_m["Quantity"].astype(int),
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "CustomerCode","CustomerName","Date",
+             "PRT_Product_Code","ProductCode","ProductName"],
+            as_index=False
+        )["Quantity"].sum().sort_values(["Date","ProductCode","CustomerName"]).reset_index(drop=True)
+
+        # ---------------- UI ----------------
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        with st.expander("🔎 Parse & Mapping Summary"):
+            unmapped_cust = int((final["CustomerCode"] == "").sum())
+            unmapped_sku  = int((final["PRT_Product_Code"] == "").sum())
+            st.code("\n".join(parse_log))
+            st.write(f"Total rows: {len(final)} | Unmapped customers: {unmapped_cust} | Unmapped SKUs: {unmapped_sku}")
+
+        # ---------------- Download (no headers, no index) ----------------
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "CustomerCode","CustomerName","Date",
+                       "PRT_Product_Code","ProductCode","ProductName","Quantity"]
+        out_name = "30030021_合歡ON_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
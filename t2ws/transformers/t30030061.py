@@ -0,0 +1,152 @@
+"""30030061 合歡 OFF."""
+import re
+
+import pandas as pd
+
+from t2ws.dates import roc_date
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import CUST_KEYS, SKU_KEYS, get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="hehuan_off_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="hehuan_off_mapping")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------------------------
+        # Helpers
+        # ---------------------------
+        def clean_name(s):
+            if pd.isna(s): return ""
+            s = str(s).strip()
+            s = re.sub(r'^[\[\【]\s*', '', s)  # leading bracket
+            s = re.sub(r'\s*[\]\】]$', '', s)  # trailing bracket
+            return s
+
+        def norm_cust(s: str) -> str:
+            s = str(s).strip().upper().replace(" ", "")
+            return re.sub(r"\.0$", "", s)
+
+        def norm_sku(s: str) -> str:
+            return str(s).strip().upper()
+
+        # ---------------------------
+        # 1) Load first sheet
+        # ---------------------------
+        with open_workbook(raw_data_file) as xls:
+            sheet = xls.sheet_names[0]
+            df = xls.parse(sheet, header=None)
+
+        # ---------------------------
+        # 2) Parse: walk "產品編號" blocks, sum qty per document/customer/product
+        # ---------------------------
+        records = []
+        current_prod_code = None
+        current_prod_name = None
+        current_date = None
+        current_doc  = None
+
+        for i in range(len(df)):
+            c0 = df.iat[i, 0]
+            c1 = df.iat[i, 1] if df.shape[1] > 1 else None  # 單據號碼
+            c2 = df.iat[i, 2] if df.shape[1] > 2 else None  # 客戶編號
+            c3 = df.iat[i, 3] if df.shape[1] > 3 else None  # 客戶簡稱
+            c5 = df.iat[i, 5] if df.shape[1] > 5 else None  # 數量
+
+            # header row announcing a product block
+            if isinstance(c0, str) and c0.strip().startswith("產品編號"):
+                # product code usually in col1, product name in col3 (bracketed)
+                current_prod_code = norm_sku(c1) if pd.notna(c1) else ""
+                current_prod_name = clean_name(df.iat[i, 3] if df.shape[1] > 3 else "")
+                continue
+
+            # skip totals/footer
+            if isinstance(c2, str) and "台幣合計" in c2:
+                continue
+
+            # date (Minguo) appears in col0; forward-fill to free lines
+            if isinstance(c0, str) and re.match(r"^\d{3}/\d{2}/\d{2}$", c0.strip()):
+                current_date = roc_date(c0.strip(), gregorian_years=True, fallback=True)
+
+            # document number forward-fill
+            if isinstance(c1, str) and c1.strip():
+                current_doc = c1.strip()
+
+            # quantity is numeric in col5 (accept "3", "3.00")
+            qty = pd.to_numeric(c5, errors="coerce")
+
+            if pd.notna(qty) and current_prod_code and current_date:
+                records.append({
+                    "Date": current_date,
+                    "DocumentNo": current_doc,
+                    "CustomerCode_ext": str(c2).strip() if pd.notna(c2) else "",
+                    "CustomerName": str(c3).strip() if pd.notna(c3) else "",
+                    "ProductCode": current_prod_code,
+                    "ProductName": current_prod_name,
+                    "Quantity": int(float(qty))
+                })
+
+        if not records:
+            st.warning("No valid rows found.")
+            st.stop()
+
+        df_txn = pd.DataFrame(records)
+
+        # Combine sales + free within the same doc/customer/product/date
+        group_keys = ["Date","DocumentNo","CustomerCode_ext","CustomerName","ProductCode","ProductName"]
+        df_txn = df_txn.groupby(group_keys, as_index=False)["Quantity"].sum()
+
+        # ---------------------------
+        # 3) Mappings (unique-only; prefer filtered to 30030061, then global)
+        # ---------------------------
+        mapping_index = get_mapping_index(mapping_file)
+        # one-to-one tables (fan-out keys left out), built once per mapping version:
+        # filtered to 30030061 (preferred) + global fallback
+        cust_f_dict   = mapping_index.unique_map("customer", CUST_KEYS, "30030061").values
+        cust_all_dict = mapping_index.unique_map("customer", CUST_KEYS).values
+        sku_f_dict    = mapping_index.unique_map("sku", SKU_KEYS, "30030061").values
+        sku_all_dict  = mapping_index.unique_map("sku", SKU_KEYS).values
+
+        # Normalize keys then map
+        df_txn["CustomerCode_norm"] = df_txn["CustomerCode_ext"].apply(norm_cust)
+        df_txn["ProductCode_norm"]  = df_txn["ProductCode"].apply(norm_sku)
+
+        jde_from_filtered = df_txn["CustomerCode_norm"].map(cust_f_dict)
+        jde_from_global   = df_txn["CustomerCode_norm"].map(cust_all_dict)
+        # Per your rule: leave blank if unmapped (do NOT keep external code)
+        df_txn["CustomerCode_final"] = jde_from_filtered.combine_first(jde_from_global).fillna("")
+
+        prt_from_filtered = df_txn["ProductCode_norm"].map(sku_f_dict)
+        prt_from_global   = df_txn["ProductCode_norm"].map(sku_all_dict)
+        df_txn["PRT_Product_Code"] = prt_from_filtered.fillna(prt_from_global)  # may remain NaN
+
+        # ---------------------------
+        # 4) Assemble output + safe de-dup (guard by DocumentNo)
+        # ---------------------------
+        df_final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30030061",
+            "GroupName": "合歡 OFF",
+            "CustomerCode": df_txn["CustomerCode_final"],     # blank if unmapped
+            "CustomerName": df_txn["CustomerName"],
+            "Date": df_txn["Date"],
+            "PRT_Product_Code": df_txn["PRT_Product_Code"],
+            "ProductCode": df_txn["ProductCode_norm"],
+            "ProductName": df_txn["ProductName"],
+            "Quantity": df_txn["Quantity"].astype(int),
+            "DocumentNo": df_txn["DocumentNo"]
+        })
+
+        dedup_keys = ["DocumentNo","CustomerCode","Date","ProductCode","ProductName","Quantity"]
+        df_final = df_final.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+
+        # ---------------------------
+        # 5) Preview & Export (no headers / no index)
+        # ---------------------------
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_final)
+
+        output_filename = "30030061 transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_final), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,175 @@
+"""30030076 裕陞（分月）."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import CUST_KEYS, SKU_KEYS, get_mapping_index
+from t2ws.results import cached_frame
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xlsx)", type=["xlsx"], key="yusheng_raw_v4")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xlsx)", type=["xlsx"], key="yusheng_map_v4")
+
+    if raw_data_file is not None and mapping_file is not None:
+        def parse_and_map() -> pd.DataFrame:
+            # ---------- Helpers ----------
+            def norm_cust(s: str) -> str:
+                s = str(s).strip().upper().replace(" ", "")
+                return re.sub(r"\.0$", "", s)
+
+            def norm_sku(s: str) -> str:
+                return str(s).strip().upper()
+
+            # ---------- 1) Parse ALL sheets (multi product blocks per sheet) ----------
+            with open_workbook(raw_data_file) as xls:
+                sheets = xls.sheet_names
+
+                def extract_sheet(sheet_name: str) -> pd.DataFrame:
+                    df = xls.parse(sheet_name, header=None)
+                    if df.empty:
+                        return pd.DataFrame()
+
+                    rows = []
+                    current_prod_code, current_prod_name = "", ""
+                    in_table = False  # inside 日期/銷貨單號/客戶編號/客戶簡稱 grid
+
+                    def sval(r, c):
+                        return str(df.iat[r, c]).strip() if (df.shape[1] > c and pd.notna(df.iat[r, c])) else ""
+
+                    for r in range(len(df)):
+                        s0, s1, s2, s3 = sval(r, 0), sval(r, 1), sval(r, 2), sval(r, 3)
+
+                        # ---- Product header (two layouts)
+                        m_inline = re.match(r"^\s*(\d{6,})\s+(.+)$", s0)  # "123456 品名" in col A
+                        if (re.fullmatch(r"\d{6,}", s0) and s1 and ":" not in s0 and "/" not in s0) or m_inline:
+                            if m_inline:
+                                current_prod_code, current_prod_name = m_inline.group(1).strip(), m_inline.group(2).strip()
+                            else:
+                                current_prod_code, current_prod_name = s0, s1
+                            in_table = False
+                            continue
+
+                        # ---- Grid header
+                        if s0 == "日期" and s1 == "銷貨單號" and s2 == "客戶編號" and s3 == "客戶簡稱":
+                            in_table = True
+                            continue
+
+                        if not in_table or not current_prod_code:
+                            continue
+
+                        # ---- Footer/summary lines to skip
+                        if any(k in s0 for k in ["合計", "小計"]):
+                            continue
+
+                        # ---- Detail line
+                        # A: 日期  B: 銷貨單號  C: 客戶編號  D: 客戶簡稱  E: 數量
+                        date_cell = df.iat[r, 0] if df.shape[1] > 0 else None
+                        qty_cell  = df.iat[r, 4] if df.shape[1] > 4 else None
+
+                        # Some workbooks have "列印日期" at the top; DO NOT break on it—just ignore non-date cells
+                        try:
+                            date_fmt = pd.to_datetime(date_cell).strftime("%Y%m%d")
+                        except Exception:
+                            date_fmt = None
+
+                        qty = pd.to_numeric(qty_cell, errors="coerce")
+
+                        if date_fmt and pd.notna(qty) and float(qty) != 0:
+                            rows.append({
+                                "Date": date_fmt,
+                                "DocumentNo": sval(r, 1),
+                                "CustomerCode_ext": sval(r, 2),
+                                "CustomerName": sval(r, 3),
+                                "ProductCode": norm_sku(current_prod_code),
+                                "ProductName": current_prod_name,
+                                "Quantity": int(float(qty)),
+                            })
+
+                    return pd.DataFrame(rows)
+
+                parsed = [extract_sheet(s) for s in sheets]
+            df_all = pd.concat([d for d in parsed if not d.empty], ignore_index=True)
+            if df_all.empty:
+                st.warning("No valid rows found across sheets.")
+                st.stop()
+
+            # Combine duplicates within same doc/customer/product/date (e.g., sales + free lines)
+            group_keys = ["Date","DocumentNo","CustomerCode_ext","CustomerName","ProductCode","ProductName"]
+            df_all = df_all.groupby(group_keys, as_index=False)["Quantity"].sum()
+
+            # ---------- 2) Mappings (unique-only; prefer filtered to 30030076, then global) ----------
+            mapping_index = get_mapping_index(mapping_file)
+            # one-to-one tables (fan-out keys left out), built once per mapping version:
+            # filtered to 30030076 (preferred) + global fallback
+            cust_f_dict   = mapping_index.unique_map("customer", CUST_KEYS, "30030076").values
+            cust_all_dict = mapping_index.unique_map("customer", CUST_KEYS).values
+            sku_f_dict    = mapping_index.unique_map("sku", SKU_KEYS, "30030076").values
+            sku_all_dict  = mapping_index.unique_map("sku", SKU_KEYS).values
+
+            df_all["CustomerCode_norm"] = df_all["CustomerCode_ext"].apply(norm_cust)
+            df_all["ProductCode_norm"]  = df_all["ProductCode"].apply(norm_sku)
+
+            jde_filtered = df_all["CustomerCode_norm"].map(cust_f_dict)
+            jde_global   = df_all["CustomerCode_norm"].map(cust_all_dict)
+            # Per rule: leave blank if unmapped (do NOT keep external)
+            df_all["CustomerCode_final"] = jde_filtered.combine_first(jde_global).fillna("")
+
+            prt_filtered = df_all["ProductCode_norm"].map(sku_f_dict)
+            prt_global   = df_all["ProductCode_norm"].map(sku_all_dict)
+            df_all["PRT_Product_Code"]   = prt_filtered.fillna(prt_global)
+
+            # ---------- 3) Assemble output + Month key ----------
+            df_all["Month"] = df_all["Date"].astype(str).str[:6]
+            df_final = pd.DataFrame({
+                "Type": "INV",
+                "Action": "U",
+                "GroupCode": "30030076",
+                "GroupName": "裕陞",
+                "CustomerCode": df_all["CustomerCode_final"],
+                "CustomerName": df_all["CustomerName"],
+                "Date": df_all["Date"],
+                "PRT_Product_Code": df_all["PRT_Product_Code"],
+                "ProductCode": df_all["ProductCode_norm"],
+                "ProductName": df_all["ProductName"],
+                "Quantity": df_all["Quantity"].astype(int),
+                "DocumentNo": df_all["DocumentNo"],
+                "Month": df_all["Month"],
+            })
+
+            # De-dup (conservative: keep DocumentNo)
+            dedup_keys = ["DocumentNo","CustomerCode","Date","ProductCode","ProductName","Quantity"]
+            df_final = df_final.drop_duplicates(subset=dedup_keys, keep="first").reset_index(drop=True)
+            return df_final
+
+        # Month filter clicks rerun the script; reuse the parsed + mapped frame for this raw/mapping pair
+        df_final = cached_frame("30030076", raw_data_file, mapping_file, parse_and_map)
+
+        # ---------- 4) Multi-month selector + export ----------
+        months = sorted(df_final["Month"].dropna().astype(str).unique().tolist())
+        selected_months = st.multiselect("📅 Select month(s) to view/export:", options=months, default=months)
+
+        df_view = df_final[df_final["Month"].isin(selected_months)].copy() if selected_months else df_final.head(0).copy()
+
+        # Drop helper Month; keep DocumentNo for safety
+        df_view = df_view[[
+            "Type","Action","GroupCode","GroupName",
+            "CustomerCode","CustomerName","Date",
+            "PRT_Product_Code","ProductCode","ProductName","Quantity","DocumentNo"
+        ]]
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_view)
+
+        # Filename
+        if not selected_months or len(selected_months) == len(months):
+            tag = "all_months"
+        elif len(selected_months) <= 4:
+            tag = "_".join(selected_months)
+        else:
+            tag = f"{selected_months[0]}_to_{selected_months[-1]}_{len(selected_months)}mo"
+
+        out_name = f"30030076_裕陞_{tag}.xlsx"
+        st.download_button(label="📥 Download Selected Month(s)", data=xlsx_export(df_view), file_name=out_name, mime=XLSX_MIME)
@@ -0,0 +1,179 @@
+"""30030083 東瀛."""
+import re
+
+import pandas as pd
+
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.keys import normalize_key
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders (allow .xls / .xlsx)
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls", "xlsx"], key="dongying_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls", "xlsx"], key="dongying_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------------- Utilities ----------------
+        def unique_only_map(df, key_col, val_col, normalize=lambda s: s):
+            """Build key->val map taking the first value for each key."""
+            tmp = df[[key_col, val_col]].dropna().copy()
+            tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            tmp = tmp.drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0", "")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        # ---------------- 1) Parse all sheets ----------------
+        with open_workbook(raw_data_file) as xls:
+            sheets = xls.sheet_names
+
+            def parse_sheet(sheet_name: str) -> pd.DataFrame:
+                df = xls.parse(sheet_name, header=None)
+                if df.empty:
+                    return pd.DataFrame()
+
+                recs = []
+                current_code = ""
+                current_name = ""
+
+                for r in range(len(df)):
+                    s0 = str(df.iat[r, 0]).strip() if (df.shape[1] > 0 and pd.notna(df.iat[r, 0])) else ""
+
+                    # Product header: e.g. "貨品編號:D0530-0  貨品名稱:格蘭利威12年-盒裝"
+                    if s0.startswith("貨品編號"):
+                        m = re.search(r"貨品編號[:：]\s*([A-Za-z0-9\-]+)\s+(?:貨品名稱[:：])?\s*(.+)", s0)
+                        if m:
+                            current_code = m.group(1).strip().upper()
+                            current_name = m.group(2).strip()
+                        else:
+                            # fallback if only code present on line
+                            current_code = s0.split("貨品編號")[-1].lstrip(":：").strip().upper()
+                            current_name = ""
+                        continue
+
+                    # Detail rows: col2 is Minguo date "114/07/24"
+                    if df.shape[1] > 4:
+                        date_cell = df.iat[r, 2]
+                        date_str = str(date_cell).strip() if pd.notna(date_cell) else ""
+                        if re.match(r"^\d{3}/\d{2}/\d{2}$", date_str):
+                            cust_code = str(df.iat[r, 0]).strip() if pd.notna(df.iat[r, 0]) else ""
+                            cust_name = str(df.iat[r, 1]).strip() if pd.notna(df.iat[r, 1]) else ""
+                            # skip headers/subtotals
+                            if cust_code in ("小計", "總計", "客戶編號", "") or cust_name in ("客戶名稱", ""):
+                                continue
+
+                            doc_no = str(df.iat[r, 3]).strip() if pd.notna(df.iat[r, 3]) else ""
+                            qty = pd.to_numeric(df.iat[r, 4], errors="coerce")
+
+                            if current_code and cust_name and pd.notna(qty) and qty != 0:
+                                is_return = any(mark in doc_no for mark in ("退", "銷退", "退回", "退貨"))
+                                q = -abs(int(qty)) if is_return else int(qty)
+
+                                recs.append({
+                                    "Date": date_str,
+                                    "CustomerCode_ext": cust_code,
+                                    "CustomerName": cust_name,
+                                    "ProductCode": current_code,
+                                    "ProductName": current_name,
+                                    "Quantity": q,
+                                    "DocNo": doc_no,
+                                    "Sheet": sheet_name
+                                })
+                return pd.DataFrame(recs)
+
+            parts, parse_log = [], []
+            for s in sheets:
+                try:
+                    p = parse_sheet(s)
+                    if not p.empty:
+                        parts.append(p)
+                    parse_log.append(f"{s}: {len(p)} rows")
+                except Exception as e:
+                    parse_log.append(f"{s}: ERROR → {e}")
+
+        if not parts:
+            st.error("No valid rows found in any sheet.\n\nParse summary:\n" + "\n".join(parse_log))
+            st.stop()
+
+        raw_extracted = pd.concat(parts, ignore_index=True)
+
+        # Minguo 114/07/31 -> 20250731 ('' if not a date), once per distinct value
+        raw_extracted["Date"] = roc_to_ymd(raw_extracted["Date"], strict=True, missing="")
+
+        # ---------------- 2) Mappings (unique-only; prefer 30030083, then global) ----------------
+        mapping_index = get_mapping_index(mapping_file)
+        cust_map = mapping_index.customer.copy()
+        sku_map  = mapping_index.sku.copy()
+
+        # trim column labels
+        cust_map.columns = cust_map.columns.map(lambda x: str(x).strip())
+        sku_map.columns  = sku_map.columns.map(lambda x: str(x).strip())
+
+        cust_map["ASI_CRM_Mapping_Cust_No__c"] = normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"])
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"])
+
+        cust_f = cust_map[normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"]) == "30030083"].copy()
+        sku_f  = sku_map[normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"]) == "30030083"].copy()
+
+        m_cust_f = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_cust_g = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_sku_f  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+        m_sku_g  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+
+        df_m = raw_extracted.copy()
+        df_m["CustomerCode_norm"] = df_m["CustomerCode_ext"].map(norm_code)
+        df_m["CustomerCode"] = df_m["CustomerCode_norm"].map(m_cust_f).fillna(
+                                df_m["CustomerCode_norm"].map(m_cust_g)
+                              ).fillna("")  # leave blank if unmapped (non-forced)
+
+        df_m["ProductCode_norm"] = df_m["ProductCode"].map(norm_sku)
+        df_m["PRT_Product_Code"] = df_m["ProductCode_norm"].map(m_sku_f).fillna(
+                                    df_m["ProductCode_norm"].map(m_sku_g)
+                                  ).fillna("")
+
+        # ---------------- 3) Assemble final + aggregate (keep DocNo to avoid merging invoices) ----------------
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30030083",
+            "GroupName": "東瀛",
+            "CustomerCode": df_m["CustomerCode"],
+            "CustomerName": df_m["CustomerName"],
+            "Date": df_m["Date"],
+            "PRT_Product_Code": df_m["PRT_Product_Code"],
+            "ProductCode": df_m["ProductCode_norm"],
+            "ProductName": df_m["ProductName"],
+            "Quantity": df_m["Quantity"].astype(int),
+            "DocNo": df_m["DocNo"],
+            "Sheet": df_m["Sheet"]
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "CustomerCode","CustomerName","Date",
+             "PRT_Product_Code","ProductCode","ProductName","DocNo","Sheet"],
+            as_index=False
+        )["Quantity"].sum().sort_values(["Date","ProductCode","CustomerName","DocNo"]).reset_index(drop=True)
+
+        # ---------------- UI ----------------
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        with st.expander("🔎 Parse & Mapping Summary"):
+            unmapped_cust = int((final["CustomerCode"] == "").sum())
+            unmapped_sku  = int((final["PRT_Product_Code"] == "").sum())
+            st.code("\n".join(parse_log))
+            st.write(f"Total rows: {len(final)} | Unmapped customers: {unmapped_cust} | Unmapped SKUs: {unmapped_sku}")
+
+        # ---------------- Download (no headers, no index). Exclude DocNo/Sheet per your standard. ----------------
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "CustomerCode","CustomerName","Date",
+                       "PRT_Product_Code","ProductCode","ProductName","Quantity"]
+        out_name = "30030083_東瀛_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
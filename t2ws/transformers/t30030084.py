@@ -0,0 +1,205 @@
+"""30030084 華恩."""
+import re
+
+import pandas as pd
+
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.keys import normalize_key
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders (allow .xls / .xlsx)
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls", "xlsx"], key="huaen_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls", "xlsx"], key="huaen_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------------- Helpers ----------------
+        def parse_date_range(s):
+            # "統計日期：2025/06/23至2025/06/30" -> end date "20250630"
+            s = "" if s is None else str(s)
+            m = re.search(r'(\d{4})/(\d{2})/(\d{2})\s*至\s*(\d{4})/(\d{2})/(\d{2})', s)
+            if m:
+                y2, m2, d2 = int(m.group(4)), int(m.group(5)), int(m.group(6))
+                return f"{y2:04d}{m2:02d}{d2:02d}"
+            return ""
+
+        def unique_only_map(df, key_col, val_col, normalize=lambda s: s):
+            """Build key->val map taking the first value for each key."""
+            tmp = df[[key_col, val_col]].dropna().copy()
+            tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            tmp = tmp.drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0", "")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        # ---------------- 1) Parse raw ("銷售") ----------------
+        with open_workbook(raw_data_file) as xls:
+            sheet_name = "銷售" if "銷售" in xls.sheet_names else xls.sheet_names[0]
+            df = xls.parse(sheet_name, header=None)
+
+        # Pass 1: collect blocks of customers per product (with end date)
+        blocks = []  # {"date": ymd, "product_code": code, "customers": [(ext_code, name), ...]}
+        i = 0
+        while i < len(df):
+            cell0 = df.iloc[i, 0] if 0 in df.columns else None
+            if "統計日期" in (str(cell0) if pd.notna(cell0) else ""):
+                date_ymd = parse_date_range(cell0)
+                # find "客戶名稱" row
+                j = i + 1
+                while j < len(df) and str(df.iloc[j, 0]).strip() != "客戶名稱":
+                    j += 1
+                if j >= len(df):
+                    i += 1
+                    continue
+                # from j+1 downward: rows with customer code/name + product code in col5
+                k = j + 1
+                customers = []
+                product_code = ""
+                while k < len(df):
+                    ccode = str(df.iloc[k, 0]).strip() if pd.notna(df.iloc[k, 0]) else ""
+                    cname = str(df.iloc[k, 1]).strip() if pd.notna(df.iloc[k, 1]) else ""
+                    pcode = str(df.iloc[k, 5]).strip() if (df.shape[1] > 5 and pd.notna(df.iloc[k, 5])) else ""
+                    if ccode and cname and pcode and ccode != "客戶名稱":
+                        if not product_code:
+                            product_code = pcode.upper()
+                        customers.append((ccode, cname))
+                        k += 1
+                        continue
+                    # stop on blank separator
+                    if (not ccode and not cname):
+                        break
+                    k += 1
+                if product_code and customers:
+                    blocks.append({"date": date_ymd, "product_code": product_code, "customers": customers})
+                i = k
+                continue
+            i += 1
+
+        # Pass 2: for each "品名規格 ... 銷量" section, collect (name, qty) rows in order
+        qty_sections = []  # list of list[(product_name, qty)]
+        i = 0
+        while i < len(df):
+            row = df.iloc[i]
+            found = False
+            for c in range(df.shape[1]):
+                if str(row[c]).strip() == "品名規格":
+                    # quantity often located c+4 columns to the right (observed: name at col6, qty at col10)
+                    qty_col = c + 4 if (c + 4) < df.shape[1] else df.shape[1] - 1
+                    names_qty = []
+                    r = i + 1
+                    while r < len(df):
+                        name = str(df.iat[r, c]).strip() if pd.notna(df.iat[r, c]) else ""
+                        # stop at subtotal/blank
+                        if not name:
+                            break
+                        # next column might contain "合計 :" marker
+                        next_cell = str(df.iat[r, c + 1]).strip() if (c + 1) < df.shape[1] and pd.notna(df.iat[r, c + 1]) else ""
+                        if "合計" in next_cell:
+                            break
+                        qty = pd.to_numeric(df.iat[r, qty_col] if (qty_col) < df.shape[1] else None, errors="coerce")
+                        if pd.notna(qty):
+                            names_qty.append((name, int(qty)))
+                        r += 1
+                    if names_qty:
+                        qty_sections.append(names_qty)
+                    i = r
+                    found = True
+                    break
+            if not found:
+                i += 1
+
+        # Pair blocks with quantity sections by order; zip customers with names_qty
+        records = []
+        pair_count = min(len(blocks), len(qty_sections))
+        for idx in range(pair_count):
+            blk = blocks[idx]
+            pairs = qty_sections[idx]
+            customers = blk["customers"]
+            for (cust_code, cust_name), (pname, qty) in zip(customers, pairs):
+                records.append({
+                    "Date": blk["date"],
+                    "CustomerCode_ext": cust_code,
+                    "CustomerName": cust_name,
+                    "ProductCode": blk["product_code"],
+                    "ProductName": pname,
+                    "Quantity": int(qty),
+                    "DocNo": "",
+                    "Sheet": sheet_name
+                })
+
+        raw_extracted = pd.DataFrame(records)
+        if raw_extracted.empty:
+            st.error("No detail rows parsed. Please verify the layout.")
+            st.stop()
+
+        # ---------------- 2) Mappings (unique-only; prefer 30030084, then global; leave blank if unmapped) ----------------
+        mapping_index = get_mapping_index(mapping_file)
+        cust_map = mapping_index.customer.copy()
+        sku_map  = mapping_index.sku.copy()
+        cust_map.columns = cust_map.columns.map(lambda x: str(x).strip())
+        sku_map.columns  = sku_map.columns.map(lambda x: str(x).strip())
+
+        cust_map["ASI_CRM_Mapping_Cust_No__c"] = normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"])
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"])
+
+        cust_f = cust_map[normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"]) == "30030084"].copy()
+        sku_f  = sku_map[normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"]) == "30030084"].copy()
+
+        m_cust_f = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_cust_g = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_sku_f  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+        m_sku_g  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+
+        df_m = raw_extracted.copy()
+        df_m["CustomerCode_norm"] = df_m["CustomerCode_ext"].map(norm_code)
+        df_m["CustomerCode"] = df_m["CustomerCode_norm"].map(m_cust_f).fillna(
+                                df_m["CustomerCode_norm"].map(m_cust_g)
+                              ).fillna("")  # leave blank if unmapped (non-forced)
+        df_m["ProductCode_norm"] = df_m["ProductCode"].map(norm_sku)
+        df_m["PRT_Product_Code"] = df_m["ProductCode_norm"].map(m_sku_f).fillna(
+                                    df_m["ProductCode_norm"].map(m_sku_g)
+                                  ).fillna("")
+
+        # ---------------- 3) Assemble final + aggregate duplicates ----------------
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30030084",
+            "GroupName": "華恩",
+            "Customer Code": df_m["CustomerCode"],
+            "Customer Name": df_m["CustomerName"],
+            "Date": df_m["Date"],
+            "PRT Product Code": df_m["PRT_Product_Code"],
+            "Product Code": df_m["ProductCode_norm"],
+            "Product Name": df_m["ProductName"],
+            "Number of Bottles": df_m["Quantity"].astype(int),
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "Customer Code","Customer Name","Date",
+             "PRT Product Code","Product Code","Product Name"],
+            as_index=False
+        )["Number of Bottles"].sum().sort_values(["Date","Product Code","Customer Name"]).reset_index(drop=True)
+
+        # ---------------- UI ----------------
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        with st.expander("🔎 Parse & Mapping Summary"):
+            unmapped_cust = int((final["Customer Code"] == "").sum())
+            unmapped_sku  = int((final["PRT Product Code"] == "").sum())
+            st.write(f"Total rows: {len(final)} | Unmapped customers: {unmapped_cust} | Unmapped SKUs: {unmapped_sku}")
+            st.caption("Customers are paired to quantities in order within each product block (left list ↔ right ‘品名規格/銷量’ section).")
+
+        # ---------------- Download (no headers, no index) ----------------
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "Customer Code","Customer Name","Date",
+                       "PRT Product Code","Product Code","Product Name","Number of Bottles"]
+        out_name = "30030084_華恩_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
@@ -0,0 +1,97 @@
+"""30030088 九久."""
+import numpy as np
+import pandas as pd
+
+from t2ws.blocks import Cells
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import read_sheet
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xlsx"], key="jj_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xlsx"], key="jj_mapping")
+
+    if raw_data_file and mapping_file:
+        df_raw = read_sheet(raw_data_file, 0, header=None)
+        cells = Cells(df_raw)
+        n = len(df_raw)
+
+        # Product blocks: a "貨品編號:" row, four heading rows, then detail rows up to the next header
+        is_header = cells.text(0, strip=False).str.startswith("貨品編號:")
+        header_pos = np.flatnonzero(is_header.to_numpy(dtype=bool))
+        starts = header_pos + 5
+        next_header = np.searchsorted(header_pos, starts)
+        ends = np.append(header_pos, n)[next_header]
+        lengths = np.maximum(ends - starts, 0)
+
+        product_codes, product_names = [], []
+        for row in cells.value(0).iloc[header_pos]:
+            product_codes.append(row.replace("貨品編號:", "").split()[0].strip())
+            product_names.append(row.replace("貨品編號:", "").split(maxsplit=1)[1].strip() if len(row.split()) > 1 else "")
+
+        # Row positions of every block's detail rows, with the block each belongs to
+        block = np.repeat(np.arange(len(header_pos)), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        pos = np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+
+        # ✅ Skip inbound '進貨單' and rows without date / document / customer;
+        # ✅ returns '銷退單' are negated
+        doc_type = cells.text(4, na="nan").to_numpy(dtype=object)[pos]
+        keep = (
+            (doc_type != "進貨單")
+            & cells.value(0).notna().to_numpy()[pos]
+            & cells.value(1).notna().to_numpy()[pos]
+            & cells.value(2).notna().to_numpy()[pos]
+            & cells.is_number(6).to_numpy()[pos]
+        )
+        pos, block, doc_type = pos[keep], block[keep], doc_type[keep]
+
+        quantity = np.array([int(q) for q in cells.value(6).to_numpy(dtype=object)[pos]], dtype="int64")
+        quantity = np.where(doc_type == "銷退單", -np.abs(quantity), quantity)
+
+        df_transformed = pd.DataFrame({
+            "Customer Code": cells.text(2).iloc[pos].str.split(".").str[0].to_numpy(dtype=object),
+            "Customer Name": cells.text(3, na="nan").to_numpy(dtype=object)[pos],
+            "Date": cells.value(0).to_numpy(dtype=object)[pos],
+            "Product Code": np.array(product_codes, dtype=object)[block],
+            "Product Name": np.array(product_names, dtype=object)[block],
+            "Quantity": quantity,
+            "Document Number": cells.value(1).to_numpy(dtype=object)[pos],
+        }).infer_objects()
+        if df_transformed.empty:
+            st.warning("No valid rows found in the raw file.")
+            st.stop()
+
+        # Convert Minguo date to Gregorian YYYYMMDD
+        df_transformed["Date"] = roc_to_ymd(df_transformed["Date"])
+
+        # Add fixed columns
+        df_transformed.insert(0, "Column4", "九久")
+        df_transformed.insert(0, "Column3", "30030088")
+        df_transformed.insert(0, "Column2", "U")
+        df_transformed.insert(0, "Column1", "INV")
+
+        # Load mapping sheets
+        mapping_index = get_mapping_index(mapping_file)
+
+        # ✅ Customer mapping using Composite Key (Customer + Customer_No) - filter for 30030088 only
+        mapped_customer = mapping_index.map_customer(df_transformed['Customer Code'], '30030088')
+        df_transformed["Customer Code"] = mapped_customer.astype(str).str.replace(r"\.0$", "", regex=True)
+
+        # ✅ SKU mapping using Composite Key (Product + Customer_Code) - filter for 30030088 only
+        mapped_sku = mapping_index.map_sku(df_transformed['Product Code'], '30030088')
+
+        product_index = df_transformed.columns.get_loc("Product Code")
+        df_transformed.insert(product_index, "PRT Product Code", mapped_sku.astype(str).str.strip())
+
+        # Final column order
+        column_order = ["Column1", "Column2", "Column3", "Column4", "Customer Code", "Customer Name", "Date", "PRT Product Code", "Product Code", "Product Name", "Quantity", "Document Number"]
+        df_transformed = df_transformed[column_order]
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_transformed)
+
+        output_filename = "30030088_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_transformed), file_name=output_filename, mime=XLSX_MIME)
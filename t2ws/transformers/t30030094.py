@@ -0,0 +1,71 @@
+"""30030094 和易 ON."""
+import pandas as pd
+
+from t2ws.blocks import Cells
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import read_sheet
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xls", "xlsx"], key="heyi_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xls", "xlsx"], key="heyi_mapping")
+
+    if raw_data_file and mapping_file:
+        raw_df = read_sheet(raw_data_file, "Page 1", header=None)
+        cells = Cells(raw_df)
+
+        # Product context: "產品編號:" in column A, "品名規格:" in column D, carried down
+        col0 = cells.text(0, strip=False)
+        col3 = cells.text(3, strip=False)
+        product_code = col0[col0.str.startswith("產品編號:")].str.replace("產品編號:", "", regex=False).str.strip().reindex(raw_df.index).ffill()
+        product_name = col3[col3.str.startswith("品名規格:")].str.replace("品名規格:", "", regex=False).str.strip().reindex(raw_df.index).ffill()
+
+        # Depletion rows with date, document, customer, quantity and customer code
+        doc_type = col3.str.strip()
+        mask = doc_type.isin(["銷貨（庫存）"])
+        for column in (0, 1, 2, 5, 9):
+            mask &= cells.value(column).notna()
+
+        quantity = cells.value(5)[mask].map(int)
+
+        depletion_df = pd.DataFrame({
+            "Customer Code": cells.text(9)[mask],
+            "Customer Name": cells.text(2)[mask],
+            "Date": cells.value(0)[mask],
+            "Product Code": product_code[mask],
+            "Product Name": product_name[mask],
+            "Quantity": quantity,
+            "Document Number": cells.value(1)[mask],
+        }).reset_index(drop=True)
+        if depletion_df.empty:
+            st.warning("No valid rows found in the raw file.")
+            st.stop()
+
+        # Add fixed columns
+        depletion_df.insert(0, "INV", "INV")
+        depletion_df.insert(1, "U", "U")
+        depletion_df.insert(2, "Customer Group Code", "30030094")
+        depletion_df.insert(3, "Customer Group Name", "和易 ON")
+
+        # ✅ Mapping: Customer using Composite Key - filter for 30030094 only
+        mapping_index = get_mapping_index(mapping_file)
+
+        mapped_customer = mapping_index.map_customer(depletion_df['Customer Code'], '30030094')
+        depletion_df["Customer Code"] = mapped_customer.astype(str).str.replace(r"\\.0$", "", regex=True)
+
+        # ✅ Mapping: SKU using Composite Key - filter for 30030094 only
+        mapped_sku = mapping_index.map_sku(depletion_df['Product Code'], '30030094')
+
+        product_index = depletion_df.columns.get_loc("Product Code")
+        depletion_df.insert(product_index, "PRT Product Code", mapped_sku.astype(str).str.strip())
+
+        # Convert Minguo date to YYYYMMDD; anything else is left as is
+        depletion_df["Date"] = roc_to_ymd(depletion_df["Date"], keep=True)
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(depletion_df)
+
+        output_filename = "30030094_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(depletion_df), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,145 @@
+"""30030105 上景."""
+import re
+
+import pandas as pd
+
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls", "xlsx"], key="shangjing_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls", "xlsx"], key="shangjing_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        with open_workbook(raw_data_file) as xls:
+            sheet_name = None
+            for sn in xls.sheet_names:
+                if str(sn).strip().lower() == "rsmulia":
+                    sheet_name = sn
+                    break
+            if sheet_name is None:
+                sheet_name = xls.sheet_names[0]
+
+            df = xls.parse(sheet_name, header=None)
+
+        try:
+            banner = " ".join([str(x) for x in df.iloc[3, :].tolist() if pd.notna(x)])
+        except Exception:
+            banner = ""
+        m = re.search(r"產品條件[:：]\s*([A-Za-z0-9\-]+)", banner)
+        prod_code_all = m.group(1).strip().upper() if m else ""
+
+        records = []
+        current_cust_code = ""
+        current_cust_name = ""
+
+        for r in range(len(df)):
+            c0 = str(df.iat[r, 0]).strip() if pd.notna(df.iat[r, 0]) else ""
+            c1 = str(df.iat[r, 1]).strip() if pd.notna(df.iat[r, 1]) else ""
+            c2 = str(df.iat[r, 2]).strip() if (df.shape[1] > 2 and pd.notna(df.iat[r, 2])) else ""
+            c3 = str(df.iat[r, 3]).strip() if (df.shape[1] > 3 and pd.notna(df.iat[r, 3])) else ""
+            c4 = pd.to_numeric(df.iat[r, 4], errors="coerce") if (df.shape[1] > 4) else None
+
+            if c0.startswith("客戶編號:"):
+                mm = re.search(r"客戶編號:\s*([A-Za-z0-9\-]+)\s*\[(.+?)\s*\]", c0)
+                if mm:
+                    current_cust_code = mm.group(1).strip().upper()
+                    current_cust_name = mm.group(2).strip()
+                continue
+
+            if c0 in ("銷貨", "銷貨退回"):
+                qty = int(c4) if pd.notna(c4) else None
+                if qty is not None:
+                    if c0 == "銷貨退回":
+                        qty = -abs(qty)
+                    records.append({
+                        "Date": c1,
+                        "CustomerCode_ext": current_cust_code,
+                        "CustomerName": current_cust_name or c2,
+                        "ProductCode": prod_code_all,
+                        "ProductName": c3,
+                        "Quantity": qty
+                    })
+
+        raw_extracted = pd.DataFrame(records)
+        if raw_extracted.empty:
+            st.error("No transactional rows parsed from the raw file.")
+            st.stop()
+
+        # Minguo 114/07/31 -> 20250731 ('' if not a date), once per distinct value
+        raw_extracted["Date"] = roc_to_ymd(raw_extracted["Date"], strict=True, missing="")
+
+        mapping_index = get_mapping_index(mapping_file)
+
+        cust_map = mapping_index.customer.copy()
+
+        sku_map  = mapping_index.sku.copy()
+
+        cust_map.columns = cust_map.columns.map(str)
+        sku_map.columns  = sku_map.columns.map(str)
+        cust_map["ASI_CRM_Mapping_Cust_No__c"]   = cust_map["ASI_CRM_Mapping_Cust_No__c"].astype(str).str.replace(r"\.0$", "", regex=True)
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = sku_map["ASI_CRM_Mapping_Cust_Code__c"].astype(str).str.replace(r"\.0$", "", regex=True)
+
+        cust_f = cust_map[cust_map["ASI_CRM_Mapping_Cust_No__c"] == "30030105"].copy()
+        sku_f  = sku_map[ sku_map["ASI_CRM_Mapping_Cust_Code__c"] == "30030105"].copy()
+
+        def unique_only_map(dfm, key_col, val_col, normalize=lambda s: s):
+            tmp = dfm[[key_col, val_col]].dropna().copy()
+            tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            counts = tmp.groupby("key")["val"].nunique().reset_index(name="n")
+            uniq = set(counts[counts["n"] == 1]["key"])
+            tmp = tmp[tmp["key"].isin(uniq)].drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0", "")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        m_cust_f = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_cust_g = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_sku_f  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+        m_sku_g  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+
+        df_m = raw_extracted.copy()
+        df_m["CustomerCode_norm"] = df_m["CustomerCode_ext"].map(norm_code)
+        df_m["Customer Code"] = df_m["CustomerCode_norm"].map(m_cust_f).fillna(
+                                  df_m["CustomerCode_norm"].map(m_cust_g)
+                                ).fillna("")
+
+        df_m["ProductCode_norm"] = df_m["ProductCode"].map(norm_sku)
+        df_m["PRT Product Code"] = df_m["ProductCode_norm"].map(m_sku_f).fillna(
+                                     df_m["ProductCode_norm"].map(m_sku_g)
+                                   ).fillna("")
+
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30030105",
+            "GroupName": "上景",
+            "Customer Code": df_m["Customer Code"],
+            "Customer Name": df_m["CustomerName"],
+            "Date": df_m["Date"],
+            "PRT Product Code": df_m["PRT Product Code"],
+            "Product Code": df_m["ProductCode_norm"],
+            "Product Name": df_m["ProductName"],
+            "Number of Bottles": df_m["Quantity"].astype(int),
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "Customer Code","Customer Name","Date",
+             "PRT Product Code","Product Code","Product Name"],
+            as_index=False
+        )["Number of Bottles"].sum().sort_values(["Date","Product Code","Customer Name"]).reset_index(drop=True)
+
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "Customer Code","Customer Name","Date",
+                       "PRT Product Code","Product Code","Product Name","Number of Bottles"]
+        out_name = "30030105_上景_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
@@ -0,0 +1,134 @@
+"""30030106 明輝."""
+import re
+
+import pandas as pd
+
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.keys import normalize_key
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import open_workbook
+
+
+def render(st):
+    # ---- Uploaders (allow .xls / .xlsx)
+    raw_data_file = st.file_uploader("Upload Raw Sales Data (.xls/.xlsx)", type=["xls", "xlsx"], key="minghui_raw")
+    mapping_file  = st.file_uploader("Upload Mapping File (.xls/.xlsx)",  type=["xls", "xlsx"], key="minghui_map")
+
+    if raw_data_file is not None and mapping_file is not None:
+        # ---------------- Utilities ----------------
+        def unique_only_map(df, key_col, val_col, normalize=lambda s: s):
+            """Build key->val map taking the first value for each key."""
+            tmp = df[[key_col, val_col]].dropna().copy()
+            tmp["key"] = tmp[key_col].astype(str).map(normalize)
+            tmp["val"] = tmp[val_col].astype(str).str.strip()
+            tmp = tmp.drop_duplicates(subset="key", keep="first")
+            return dict(zip(tmp["key"], tmp["val"]))
+
+
+        norm_code = lambda s: str(s).strip().upper().replace(" ", "").replace(".0", "")
+        norm_sku  = lambda s: str(s).strip().upper()
+
+        # ---------------- 1) Parse raw (Sheet1) ----------------
+        # Sheet1 columns (observed):
+        # 0: 日期(民國) | 1: 客戶編號 | 2: 客戶簡稱 | 3: 單別 | 4: 產品編號 | 5: 名稱規格 | 6: 銷售數量 | 7: 贈送數量 | ...
+        with open_workbook(raw_data_file) as xls:
+            df = xls.parse("Sheet1", header=None)
+
+        records = []
+        for r in range(len(df)):
+            date_cell = df.iat[r, 0] if df.shape[1] > 0 else None
+            date_str = str(date_cell).strip() if pd.notna(date_cell) else ""
+            if re.match(r"^\d{3}/\d{2}/\d{2}$", date_str):
+                cust_ext = str(df.iat[r, 1]).strip() if pd.notna(df.iat[r, 1]) else ""
+                cust_nm  = str(df.iat[r, 2]).strip() if pd.notna(df.iat[r, 2]) else ""
+                prod_cd  = str(df.iat[r, 4]).strip().upper() if (df.shape[1] > 4 and pd.notna(df.iat[r, 4])) else ""
+                prod_nm  = str(df.iat[r, 5]).strip() if (df.shape[1] > 5 and pd.notna(df.iat[r, 5])) else ""
+                qty      = pd.to_numeric(df.iat[r, 6] if df.shape[1] > 6 else None, errors="coerce")
+
+                if cust_nm and prod_cd and pd.notna(qty) and qty != 0:
+                    records.append({
+                        "Date": date_str,
+                        "CustomerCode_ext": cust_ext,
+                        "CustomerName": cust_nm,
+                        "ProductCode": prod_cd,
+                        "ProductName": prod_nm,
+                        "Quantity": int(qty)
+                    })
+
+        raw_extracted = pd.DataFrame(records)
+        if raw_extracted.empty:
+            st.error("No valid rows parsed from the raw file.")
+            st.stop()
+
+        # Minguo 114/07/31 -> 20250731 ('' if not a date), once per distinct value
+        raw_extracted["Date"] = roc_to_ymd(raw_extracted["Date"], strict=True, missing="")
+
+        # ---------------- 2) Mappings (unique-only; prefer 30030106, then global; leave blank if unmapped) ----------------
+        mapping_index = get_mapping_index(mapping_file)
+        cust_map = mapping_index.customer.copy()
+        sku_map  = mapping_index.sku.copy()
+
+        # trim column labels
+        cust_map.columns = cust_map.columns.map(lambda x: str(x).strip())
+        sku_map.columns  = sku_map.columns.map(lambda x: str(x).strip())
+
+        cust_map["ASI_CRM_Mapping_Cust_No__c"] = normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"])
+        sku_map["ASI_CRM_Mapping_Cust_Code__c"] = normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"])
+
+        cust_f = cust_map[normalize_key(cust_map["ASI_CRM_Mapping_Cust_No__c"]) == "30030106"].copy()
+        sku_f  = sku_map[normalize_key(sku_map["ASI_CRM_Mapping_Cust_Code__c"]) == "30030106"].copy()
+
+        m_cust_f = unique_only_map(cust_f,  "ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_cust_g = unique_only_map(cust_map,"ASI_CRM_Offtake_Customer_No__c", "ASI_CRM_JDE_Cust_No_Formula__c", norm_code)
+        m_sku_f  = unique_only_map(sku_f,   "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+        m_sku_g  = unique_only_map(sku_map, "ASI_CRM_Offtake_Product__c",     "ASI_CRM_SKU_Code__c",            norm_sku)
+
+        df_m = raw_extracted.copy()
+        df_m["CustomerCode_norm"] = df_m["CustomerCode_ext"].map(norm_code)
+        df_m["CustomerCode"] = df_m["CustomerCode_norm"].map(m_cust_f).fillna(
+                                df_m["CustomerCode_norm"].map(m_cust_g)
+                              ).fillna("")  # leave blank if unmapped (non-forced)
+
+        df_m["ProductCode_norm"] = df_m["ProductCode"].map(norm_sku)
+        df_m["PRT_Product_Code"] = df_m["ProductCode_norm"].map(m_sku_f).fillna(
+                                    df_m["ProductCode_norm"].map(m_sku_g)
+                                  ).fillna("")
+
+        # ---------------- 3) Assemble final + aggregate duplicates ----------------
+        final = pd.DataFrame({
+            "Type": "INV",
+            "Action": "U",
+            "GroupCode": "30030106",
+            "GroupName": "明輝",
+            "Customer Code": df_m["CustomerCode"],
+            "Customer Name": df_m["CustomerName"],
+            "Date": df_m["Date"],
+            "PRT Product Code": df_m["PRT_Product_Code"],
+            "Product Code": df_m["ProductCode_norm"],
+            "Product Name": df_m["ProductName"],
+            "Number of Bottles": df_m["Quantity"].astype(int),
+        })
+
+        final = final.groupby(
+            ["Type","Action","GroupCode","GroupName",
+             "Customer Code","Customer Name","Date",
+             "PRT Product Code","Product Code","Product Name"],
+            as_index=False
+        )["Number of Bottles"].sum().sort_values(["Date","Product Code","Customer Name"]).reset_index(drop=True)
+
+        # ---------------- UI ----------------
+        st.write("✅ Processed Data Preview (first 20 rows):")
+        st.dataframe(final.head(20))
+
+        with st.expander("🔎 Parse & Mapping Summary"):
+            unmapped_cust = int((final["Customer Code"] == "").sum())
+            unmapped_sku  = int((final["PRT Product Code"] == "").sum())
+            st.write(f"Total rows: {len(final)} | Unmapped customers: {unmapped_cust} | Unmapped SKUs: {unmapped_sku}")
+
+        # ---------------- Download (no headers, no index) ----------------
+        export_cols = ["Type","Action","GroupCode","GroupName",
+                       "Customer Code","Customer Name","Date",
+                       "PRT Product Code","Product Code","Product Name","Number of Bottles"]
+        out_name = "30030106_明輝_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(final[export_cols]), file_name=out_name, mime=XLSX_MIME)
@@ -0,0 +1,72 @@
+"""33001422 和易 OFF."""
+import pandas as pd
+
+from t2ws.blocks import Cells
+from t2ws.dates import roc_to_ymd
+from t2ws.export import XLSX_MIME, xlsx_export
+from t2ws.mapping import get_mapping_index
+from t2ws.workbook import read_sheet
+
+
+def render(st):
+    raw_data_file = st.file_uploader("Upload Raw Sales Data", type=["xls", "xlsx"], key="heyi_off_raw")
+    mapping_file = st.file_uploader("Upload Mapping File", type=["xls", "xlsx"], key="heyi_off_mapping")
+
+    if raw_data_file and mapping_file:
+        raw_df = read_sheet(raw_data_file, "Page 1", header=None)
+        cells = Cells(raw_df)
+
+        # Product context: "產品編號:" in column A, "品名規格:" in column D, carried down
+        col0 = cells.text(0, strip=False)
+        col3 = cells.text(3, strip=False)
+        product_code = col0[col0.str.startswith("產品編號:")].str.replace("產品編號:", "", regex=False).str.strip().reindex(raw_df.index).ffill()
+        product_name = col3[col3.str.startswith("品名規格:")].str.replace("品名規格:", "", regex=False).str.strip().reindex(raw_df.index).ffill()
+
+        # Sales and sales returns with date, document, customer, quantity and customer code
+        doc_type = col3.str.strip()
+        mask = doc_type.isin(["銷貨（庫存）", "銷貨退回"])
+        for column in (0, 1, 2, 5, 9):
+            mask &= cells.value(column).notna()
+
+        quantity = cells.value(5)[mask].map(int)
+        quantity = quantity.where(doc_type[mask] != "銷貨退回", -quantity)
+
+        df_extracted = pd.DataFrame({
+            "Customer Code": cells.text(9)[mask],
+            "Customer Name": cells.text(2)[mask],
+            "Date": cells.value(0)[mask],
+            "Product Code": product_code[mask],
+            "Product Name": product_name[mask],
+            "Quantity": quantity,
+            "Document Number": cells.value(1)[mask],
+        }).reset_index(drop=True)
+        if df_extracted.empty:
+            st.warning("No valid rows found in the raw file.")
+            st.stop()
+
+        # Add 4 fixed metadata columns
+        df_extracted.insert(0, "INV", "INV")
+        df_extracted.insert(1, "U", "U")
+        df_extracted.insert(2, "Customer Group Code", "33001422")
+        df_extracted.insert(3, "Customer Group Name", "和易 OFF")
+
+        # Convert Minguo date to Gregorian; anything else is left as is
+        df_extracted["Date"] = roc_to_ymd(df_extracted["Date"], keep=True)
+
+        # ✅ Customer Mapping using Composite Key - filter for 33001422 only
+        mapping_index = get_mapping_index(mapping_file)
+
+        mapped_customer = mapping_index.map_customer(df_extracted['Customer Code'], '33001422')
+        df_extracted["Customer Code"] = mapped_customer.astype(str).str.replace(r"\.0$", "", regex=True)
+
+        # ✅ SKU Mapping using Composite Key - filter for 33001422 only
+        mapped_sku = mapping_index.map_sku(df_extracted['Product Code'], '33001422')
+
+        product_index = df_extracted.columns.get_loc("Product Code")
+        df_extracted.insert(product_index, "PRT Product Code", mapped_sku.astype(str).str.strip())
+
+        st.write("✅ Processed Data Preview:")
+        st.dataframe(df_extracted)
+
+        output_filename = "33001422_transformation.xlsx"
+        st.download_button(label="📥 Download Processed File", data=xlsx_export(df_extracted), file_name=output_filename, mime=XLSX_MIME)
@@ -0,0 +1,184 @@
+"""One immutable buffer per uploaded mapping, and zero-copy readers over it.
+
+The mapping uploader hands the branches a file-like object on every Streamlit rerun.
+Building a fresh ``io.BytesIO`` for that copied the whole workbook each time; an
+:class:`UploadBuffer` keeps the bytes and their hash once, and :meth:`UploadBuffer.reader`
+returns a :class:`BufferReader` that reads through a ``memoryview`` of them. The reader
+carries the buffer's ``digest``, so :func:`t2ws.mapping.get_mapping_index` and the result
+cache find the parsed mapping without reading or hashing the bytes again.
+
+Buffers live in a per-process store keyed by digest and shared by every session, which
+keeps only the digest: analysts uploading the same weekly Salesforce export hold one
+copy between them, as they already share one parsed index. The least recently used
+buffers are dropped once the store exceeds ``T2WS_MAPPING_STORE_MB`` (default 256 MiB);
+a session whose buffer was dropped falls back to the saved mapping or a new upload.
+"""
+import io
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from t2ws.mapping import mapping_digest, read_source_bytes
+
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+STORE_SETTING = "T2WS_MAPPING_STORE_MB"
+_MAX_STORE_BYTES = int(float(os.environ.get(STORE_SETTING, "256")) * 2**20)
+_STORE: "OrderedDict[str, UploadBuffer]" = OrderedDict()
+_STORE_LOCK = threading.Lock()
+# path -> (mtime_ns, size, digest), so a saved file is hashed once per change
+_FILE_DIGESTS: dict[str, tuple[int, int, str]] = {}
+
+
+@dataclass(frozen=True)
+class UploadBuffer:
+    """An upload's bytes, file name and content hash."""
+    data: bytes
+    name: str
+    digest: str
+
+    def reader(self, name: str | None = None, type_: str = XLSX_MIME) -> "BufferReader":
+        """A new reader at position 0, named ``name`` (default: the first uploader's file name)."""
+        return BufferReader(self, name, type_)
+
+
+class BufferReader(io.BufferedIOBase):
+    """Read-only, seekable view of an :class:`UploadBuffer`, shaped like an uploaded file.
+
+    ``getvalue()`` and a full ``read()`` return the buffer's own bytes object; partial
+    reads copy only the requested slice.
+    """
+
+    def __init__(self, buffer: UploadBuffer, name: str | None = None, type_: str = XLSX_MIME):
+        super().__init__()
+        self._buffer = buffer
+        self._view = memoryview(buffer.data)
+        self._pos = 0
+        self.name = name or buffer.name
+        self.type = type_
+        self.size = len(buffer.data)
+        self.digest = buffer.digest
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._check_open()
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check_open()
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self.size}[whence]
+        if base + offset < 0:
+            raise ValueError(f"negative seek position {base + offset}")
+        self._pos = base + offset
+        return self._pos
+
+    def read(self, size: int | None = -1) -> bytes:
+        self._check_open()
+        start = min(self._pos, self.size)
+        end = self.size if size is None or size < 0 else min(start + size, self.size)
+        self._pos = max(self._pos, end)
+        if start == 0 and end == self.size:
+            return self._buffer.data
+        return self._view[start:end].tobytes()
+
+    read1 = read
+
+    def readinto(self, b) -> int:
+        self._check_open()
+        target = memoryview(b).cast("B")
+        start = min(self._pos, self.size)
+        n = min(len(target), self.size - start)
+        target[:n] = self._view[start:start + n]
+        self._pos = start + n
+        return n
+
+    def getvalue(self) -> bytes:
+        self._check_open()
+        return self._buffer.data
+
+    def getbuffer(self) -> memoryview:
+        self._check_open()
+        return self._view
+
+
+def _evict() -> None:
+    # caller holds _STORE_LOCK; the newest buffer stays even if it alone exceeds the cap
+    total = sum(len(buffer.data) for buffer in _STORE.values())
+    while total > _MAX_STORE_BYTES and len(_STORE) > 1:
+        _, dropped = _STORE.popitem(last=False)
+        total -= len(dropped.data)
+
+
+def store_upload(data: bytes, name: str = "mapping.xlsx") -> UploadBuffer:
+    """The shared buffer for ``data``, added to the store if its content is new."""
+    digest = mapping_digest(data)
+    with _STORE_LOCK:
+        buffer = _STORE.get(digest)
+        if buffer is None:
+            buffer = _STORE[digest] = UploadBuffer(bytes(data), name, digest)
+        _STORE.move_to_end(digest)
+        _evict()
+    return buffer
+
+
+def stored_upload(digest: str) -> UploadBuffer | None:
+    """The shared buffer for ``digest``, or None if it was never stored or has been evicted."""
+    with _STORE_LOCK:
+        buffer = _STORE.get(digest)
+        if buffer is not None:
+            _STORE.move_to_end(digest)
+        return buffer
+
+
+def _known_file_digest(path: str, stat: os.stat_result) -> str | None:
+    with _STORE_LOCK:
+        known = _FILE_DIGESTS.get(path)
+    if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+        return known[2]
+    return None
+
+
+def _remember_file_digest(path: str, stat: os.stat_result, digest: str) -> None:
+    with _STORE_LOCK:
+        _FILE_DIGESTS[path] = (stat.st_mtime_ns, stat.st_size, digest)
+
+
+def file_digest(path: str) -> str | None:
+    """Digest of the file at ``path`` (None if missing), re-hashed only when it has changed."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    digest = _known_file_digest(path, stat)
+    if digest is None:
+        digest = mapping_digest(read_source_bytes(path))
+        _remember_file_digest(path, stat, digest)
+    return digest
+
+
+def store_file(path: str, name: str = "mapping.xlsx") -> UploadBuffer:
+    """The shared buffer for the file at ``path``, read from disk only if not stored yet."""
+    stat = os.stat(path)
+    digest = _known_file_digest(path, stat)
+    buffer = stored_upload(digest) if digest is not None else None
+    if buffer is None:
+        buffer = store_upload(read_source_bytes(path), name)
+        _remember_file_digest(path, stat, buffer.digest)
+    return buffer
+
+
+def clear_store() -> None:
+    with _STORE_LOCK:
+        _STORE.clear()
+        _FILE_DIGESTS.clear()
@@ -0,0 +1,98 @@
+"""One open handle per uploaded raw workbook.
+
+``pd.read_excel(file, sheet_name=...)`` re-opens and re-unzips the whole workbook on
+every call, so a loop over a 30-sheet 振泰 export pays for 30 full opens. A
+:class:`Workbook` reads the upload once and parses sheets from that handle on demand.
+
+The engine is picked from the file's magic bytes, not its name: exports named ``.xls``
+are often xlsx (zip) files, and the other way round. With ``T2WS_EXCEL_ENGINE=calamine``
+the native calamine reader (``pip install python-calamine``) is used instead where it is
+installed; a workbook it cannot open falls back to openpyxl/xlrd.
+"""
+import importlib.util
+import io
+import os
+from typing import Iterator
+
+import pandas as pd
+
+from t2ws.mapping import read_source_bytes
+from t2ws.timing import timed
+
+
+ZIP_MAGIC = b"PK\x03\x04"
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# "default" (openpyxl/xlrd by format) or "calamine"
+ENGINE_SETTING = "T2WS_EXCEL_ENGINE"
+
+
+def sniff_engine(data: bytes) -> str | None:
+    """``openpyxl`` for xlsx (zip), ``xlrd`` for legacy xls (OLE2), else None (pandas decides)."""
+    if data.startswith(ZIP_MAGIC):
+        return "openpyxl"
+    if data.startswith(OLE2_MAGIC):
+        return "xlrd"
+    return None
+
+
+def calamine_available() -> bool:
+    return importlib.util.find_spec("python_calamine") is not None
+
+
+def preferred_engine() -> str:
+    """The reader backend selected by ``T2WS_EXCEL_ENGINE``, if it can be used here."""
+    setting = os.environ.get(ENGINE_SETTING, "default").strip().lower()
+    if setting == "calamine" and calamine_available():
+        return "calamine"
+    return "default"
+
+
+class Workbook:
+    """Sheet names up front, sheets parsed lazily from a single ``pd.ExcelFile``."""
+
+    def __init__(self, source, engine: str | None = None):
+        data = read_source_bytes(source)
+        if engine is None and preferred_engine() == "calamine":
+            try:
+                self._xls = pd.ExcelFile(io.BytesIO(data), engine="calamine")
+                self.engine = "calamine"
+                return
+            except Exception:
+                pass
+        self.engine = engine or sniff_engine(data)
+        self._xls = pd.ExcelFile(io.BytesIO(data), engine=self.engine)
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return self._xls.sheet_names
+
+    @timed("read sheet")
+    def parse(self, sheet_name, **kwargs) -> pd.DataFrame:
+        """Same arguments as ``pd.read_excel`` minus the file and engine."""
+        return self._xls.parse(sheet_name, **kwargs)
+
+    def sheets(self, sheet_names=None, **kwargs) -> Iterator[tuple[str, pd.DataFrame]]:
+        """Yield ``(name, frame)`` for ``sheet_names`` (default: all), one sheet at a time."""
+        for name in self.sheet_names if sheet_names is None else sheet_names:
+            yield name, self.parse(name, **kwargs)
+
+    def close(self) -> None:
+        self._xls.close()
+
+    def __enter__(self) -> "Workbook":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@timed("open workbook")
+def open_workbook(source, engine: str | None = None) -> Workbook:
+    return Workbook(source, engine=engine)
+
+
+def read_sheet(source, sheet_name=0, **kwargs) -> pd.DataFrame:
+    """``pd.read_excel`` for a single sheet, through the configured engine."""
+    with open_workbook(source) as xls:
+        return xls.parse(sheet_name, **kwargs)